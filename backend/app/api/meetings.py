@@ -1,46 +1,454 @@
-from fastapi import APIRouter, UploadFile, File, BackgroundTasks, Depends
+from fastapi import APIRouter, UploadFile, File, Depends, HTTPException, Query, Request
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field
+from sqlalchemy import insert, select, update, and_, or_
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.core.database import get_db
-from app.models.meeting import Meeting, MeetingStatus
-from app.services.pipeline import run_pipeline
-import shutil
-import os
+from app.core.config import settings
+from app.core.database import get_db, SessionLocal
+from app.models.meeting import Meeting, MeetingSegment, MeetingStatus, PipelineStage, PublishStatus
+from app.services.events import event_broker
+from app.services.job_queue import enqueue_pipeline, enqueue_pipelines, enqueue_publish
+from app.services.search import search_index
+from app.services.storage import storage
+from app.services.upload_service import upload_service, UploadResult, UploadTooLargeError
+from datetime import datetime
+from typing import List, Optional
+import asyncio
+import base64
+import json
+import math
+import mimetypes
+import time
 import uuid
 
 router = APIRouter()
 
-UPLOAD_DIR = "uploads"
-os.makedirs(UPLOAD_DIR, exist_ok=True)
+# 목록/상태 조회에서 읽는 작은 컬럼들 (transcript, summary 같은 큰 Text 컬럼은 제외)
+LIGHT_COLUMNS = (
+    Meeting.id,
+    Meeting.title,
+    Meeting.status,
+    Meeting.stage,
+    Meeting.publish_status,
+    Meeting.notion_page_url,
+    Meeting.created_at,
+    Meeting.updated_at,
+)
+
+def _encode_cursor(created_at: datetime, meeting_id: uuid.UUID) -> str:
+    raw = f"{created_at.isoformat()}|{meeting_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+def _decode_cursor(cursor: str):
+    try:
+        created_at, meeting_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+        return datetime.fromisoformat(created_at), uuid.UUID(meeting_id)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
 
 @router.post("/meetings/upload")
 async def upload_meeting(
-    background_tasks: BackgroundTasks,
     file: UploadFile = File(...),
     db: AsyncSession = Depends(get_db)
 ):
-    file_ext = file.filename.split(".")[-1]
-    file_name = f"{uuid.uuid4()}.{file_ext}"
-    file_path = os.path.join(UPLOAD_DIR, file_name)
+    key = upload_service.new_key(file.filename)
 
-    with open(file_path, "wb") as buffer:
-        shutil.copyfileobj(file.file, buffer)
+    try:
+        upload = await upload_service.save(file, key)
+    except UploadTooLargeError as e:
+        raise HTTPException(status_code=413, detail=str(e))
 
     new_meeting = Meeting(
         title=file.filename,
-        file_path=file_path,
+        file_path=key,
+        file_size=upload.size,
+        file_sha256=upload.sha256,
         status=MeetingStatus.PENDING.value
     )
     db.add(new_meeting)
     await db.commit()
     await db.refresh(new_meeting)
 
-    # Trigger background processing
-    background_tasks.add_task(run_pipeline, new_meeting.id)
+    # 작업 큐에 등록 (워커가 처리)
+    await enqueue_pipeline(new_meeting.id)
     
-    return {"id": str(new_meeting.id), "status": new_meeting.status}
+    return {
+        "id": str(new_meeting.id),
+        "status": new_meeting.status,
+        "file_size": upload.size,
+        "sha256": upload.sha256,
+        "bytes_per_sec": round(upload.bytes_per_sec),
+    }
+
+@router.post("/meetings/upload/bulk")
+async def upload_meetings_bulk(
+    files: List[UploadFile] = File(...),
+    rate: Optional[float] = Query(None, ge=0, description="초당 파이프라인 시작 건수 (기본값 BULK_ADMISSION_RATE_PER_SECOND, 0 이면 한 번에)"),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    여러 오디오 파일 또는 zip/tar 아카이브를 한 번에 업로드합니다.
+
+    파일은 하나씩 청크 단위로 저장소에 저장하고(아카이브도 메모리에 풀지 않음), 회의 행은 INSERT 한 번으로 만든 뒤
+    파이프라인을 초당 rate 건씩 시작되도록 큐에 등록합니다.
+    오디오가 아니거나 너무 큰 파일은 건너뛰고 skipped 에 이유와 함께 돌려줍니다.
+    """
+    uploads: List[tuple] = []
+    skipped = []
+    for file in files:
+        remaining = settings.BULK_MAX_FILES - len(uploads)
+        if upload_service.is_archive(file.filename):
+            for title, result in await upload_service.extract_archive(file, remaining):
+                if isinstance(result, UploadResult):
+                    uploads.append((title, result))
+                else:
+                    skipped.append({"title": title, "reason": result})
+        elif not upload_service.is_audio(file.filename):
+            skipped.append({"title": file.filename, "reason": "Unsupported file type"})
+        elif remaining <= 0:
+            skipped.append({"title": file.filename, "reason": "Too many files in one bulk upload"})
+        else:
+            try:
+                upload = await upload_service.save(file, upload_service.new_key(file.filename))
+            except UploadTooLargeError as e:
+                skipped.append({"title": file.filename, "reason": str(e)})
+            else:
+                uploads.append((file.filename, upload))
+
+    rows = [
+        {
+            "id": uuid.uuid4(),
+            "title": title,
+            "file_path": upload.key,
+            "file_size": upload.size,
+            "file_sha256": upload.sha256,
+            "status": MeetingStatus.PENDING.value,
+        }
+        for title, upload in uploads
+    ]
+    if rows:
+        try:
+            await db.execute(insert(Meeting), rows)
+            await db.commit()
+        except BaseException:
+            # 행이 없으면 아무도 정리하지 않으므로 저장한 파일을 지움
+            for _, upload in uploads:
+                await upload_service.discard(upload.key)
+            raise
+
+    admission_rate = settings.BULK_ADMISSION_RATE_PER_SECOND if rate is None else rate
+    delays = await enqueue_pipelines([row["id"] for row in rows], admission_rate)
+
+    return {
+        "count": len(rows),
+        "admission_rate": admission_rate,
+        "items": [
+            {
+                "id": str(row["id"]),
+                "title": row["title"],
+                "status": row["status"],
+                "file_size": row["file_size"],
+                "sha256": row["file_sha256"],
+                "scheduled_in": round(delay, 3),
+            }
+            for row, delay in zip(rows, delays)
+        ],
+        "skipped": skipped,
+    }
+
+@router.get("/meetings")
+async def list_meetings(
+    status: Optional[MeetingStatus] = None,
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    회의 목록을 최신순으로 조회합니다 (keyset pagination).
+    다음 페이지는 응답의 next_cursor 를 cursor 로 넘겨 조회합니다.
+    """
+    query = select(*LIGHT_COLUMNS).order_by(Meeting.created_at.desc(), Meeting.id.desc()).limit(limit + 1)
+    if status:
+        query = query.where(Meeting.status == status.value)
+    if cursor:
+        created_at, meeting_id = _decode_cursor(cursor)
+        query = query.where(
+            or_(
+                Meeting.created_at < created_at,
+                and_(Meeting.created_at == created_at, Meeting.id < meeting_id),
+            )
+        )
+
+    rows = (await db.execute(query)).all()
+    items = [dict(row._mapping) for row in rows[:limit]]
+    next_cursor = None
+    if len(rows) > limit:
+        last = items[-1]
+        next_cursor = _encode_cursor(last["created_at"], last["id"])
+    return {"items": items, "next_cursor": next_cursor}
+
+# /meetings/{meeting_id} 보다 먼저 선언해야 "search" 가 회의 ID 로 해석되지 않음
+@router.get("/meetings/search")
+async def search_meetings(
+    q: str = Query(..., min_length=1, max_length=200),
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0, le=1000),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    제목, 요약, 회의록에서 q 의 모든 단어를 포함한 회의를 관련도순으로 찾습니다.
+    snippet 은 일치한 부분 주변의 본문이며, 일치 부분은 <mark> 로 감싸고 나머지는 HTML 이스케이프되어 있습니다.
+    """
+    started = time.perf_counter()
+    hits = await search_index.search(db, q, limit, offset)
+    rows = {}
+    if hits:
+        query = select(*LIGHT_COLUMNS).where(Meeting.id.in_([hit.meeting_id for hit in hits]))
+        rows = {row.id: dict(row._mapping) for row in (await db.execute(query)).all()}
+    items = [
+        {**rows[hit.meeting_id], "score": round(hit.score, 4), "snippet": hit.snippet}
+        for hit in hits
+        if hit.meeting_id in rows
+    ]
+    return {"query": q, "items": items, "took_ms": round((time.perf_counter() - started) * 1000, 1)}
+
+async def _load_status(db: AsyncSession, meeting_id: uuid.UUID) -> dict:
+    """큰 Text 컬럼은 읽지 않고 존재 여부만 포함한 상태를 조회합니다."""
+    query = select(
+        *LIGHT_COLUMNS,
+        Meeting.transcript.isnot(None).label("has_transcript"),
+        # 요약 스트리밍 중 부분 저장된 summary 는 완성된 요약으로 보지 않음
+        and_(Meeting.summary.isnot(None), Meeting.status == MeetingStatus.COMPLETED.value).label("has_summary"),
+    ).where(Meeting.id == meeting_id)
+    row = (await db.execute(query)).first()
+    if row is None:
+        raise HTTPException(status_code=404, detail="Meeting not found")
+    return dict(row._mapping)
+
+def _is_settled(state: dict) -> bool:
+    """더 이상 상태가 바뀌지 않는 경우 (실패, 또는 요약 완료 후 게시까지 끝남)"""
+    if state.get("status") == MeetingStatus.FAILED.value:
+        return True
+    return state.get("status") == MeetingStatus.COMPLETED.value and state.get("publish_status") in (
+        PublishStatus.PUBLISHED.value,
+        PublishStatus.FAILED.value,
+        PublishStatus.SKIPPED.value,
+    )
+
+def _sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(jsonable_encoder(data))}\n\n"
+
+@router.get("/meetings/{meeting_id}/status")
+async def get_meeting_status(meeting_id: uuid.UUID, db: AsyncSession = Depends(get_db)):
+    """폴링용 경량 조회. 큰 Text 컬럼은 읽지 않고 존재 여부만 반환합니다."""
+    return await _load_status(db, meeting_id)
+
+@router.get("/meetings/{meeting_id}/events")
+async def stream_meeting_events(meeting_id: uuid.UUID, request: Request):
+    """
+    진행 상황을 Server-Sent Events 로 전달합니다.
+
+    연결 직후 현재 상태(status 이벤트)를 한 번 보내고, 이후에는 파이프라인이 발행한 변경분(update 이벤트)과
+    스트리밍 중인 요약 조각(summary 이벤트)을 보냅니다.
+    DB 는 연결 시 한 번만 조회하며, 처리가 끝나면(_is_settled) 스트림을 닫습니다.
+    클라이언트가 너무 느려 구독 큐가 넘치면 resync 이벤트를 보내고 닫아 다시 연결하게 합니다.
+    """
+    meeting_key = str(meeting_id)
+
+    # 구독을 먼저 열어야 현재 상태 조회와 첫 이벤트 사이의 변경을 놓치지 않음
+    queue = await event_broker.subscribe(meeting_key)
+    try:
+        # 스트리밍 동안 커넥션을 잡지 않도록 Depends(get_db) 대신 짧은 세션 사용
+        async with SessionLocal() as db:
+            state = await _load_status(db, meeting_id)
+            if state["stage"] == PipelineStage.SUMMARIZE.value and state["status"] == MeetingStatus.PROCESSING.value:
+                # 요약 도중 연결한 경우 지금까지 저장된 부분 요약부터 보여줌 (최대 SUMMARY_FLUSH_SECONDS 만큼 늦을 수 있음)
+                state["summary"] = await db.scalar(select(Meeting.summary).where(Meeting.id == meeting_id))
+    except BaseException:
+        event_broker.unsubscribe(meeting_key, queue)
+        raise
+
+    async def events():
+        try:
+            yield _sse("status", state)
+            if _is_settled(state):
+                return
+            while not await request.is_disconnected():
+                try:
+                    event = await asyncio.wait_for(queue.get(), timeout=settings.SSE_HEARTBEAT_SECONDS)
+                except asyncio.TimeoutError:
+                    # 프록시가 유휴 연결을 끊지 않도록 주석 줄을 보냄
+                    yield ": keep-alive\n\n"
+                    continue
+                if event is None:
+                    # 클라이언트가 이벤트를 따라오지 못해 구독 큐가 넘침. 스트림을 닫으면
+                    # EventSource 가 다시 연결해 status 이벤트로 현재 상태(부분 요약 포함)를 새로 받음
+                    yield _sse("resync", {"id": meeting_key})
+                    return
+                if "summary_delta" in event:
+                    yield _sse("summary", {"delta": event["summary_delta"]})
+                    continue
+                state.update(event)
+                yield _sse("update", event)
+                if _is_settled(state):
+                    return
+        finally:
+            event_broker.unsubscribe(meeting_key, queue)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+def _parse_timestamp(value: Optional[str], name: str) -> Optional[int]:
+    """초("600", "600.5") 또는 "mm:ss" / "hh:mm:ss" 형식을 밀리초로 변환합니다."""
+    if value is None:
+        return None
+    try:
+        seconds = 0.0
+        for part in value.strip().split(":"):
+            seconds = seconds * 60 + float(part)
+    except ValueError:
+        raise HTTPException(status_code=400, detail=f"Invalid {name}: {value}")
+    # float() 는 "nan", "inf" 도 받아들이므로 유한한 값만 허용
+    if not math.isfinite(seconds) or seconds < 0:
+        raise HTTPException(status_code=400, detail=f"Invalid {name}: {value}")
+    return round(seconds * 1000)
+
+@router.get("/meetings/{meeting_id}/segments")
+async def get_meeting_segments(
+    meeting_id: uuid.UUID,
+    start: Optional[str] = Query(None, description="구간 시작 (초 또는 mm:ss)"),
+    end: Optional[str] = Query(None, description="구간 끝 (초 또는 mm:ss)"),
+    limit: int = Query(1000, ge=1, le=5000),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    [start, end) 구간과 겹치는 회의록 세그먼트를 시간순으로 조회합니다.
+    시각은 원본 오디오 기준(초)이며, 전체 회의록(transcript)은 읽지 않습니다.
+    """
+    start_ms = _parse_timestamp(start, "start")
+    end_ms = _parse_timestamp(end, "end")
+    query = (
+        select(MeetingSegment.start_ms, MeetingSegment.end_ms, MeetingSegment.speaker, MeetingSegment.text)
+        .where(MeetingSegment.meeting_id == meeting_id)
+        .order_by(MeetingSegment.start_ms, MeetingSegment.seq)
+        .limit(limit + 1)
+    )
+    if start_ms is not None:
+        query = query.where(MeetingSegment.end_ms > start_ms)
+    if end_ms is not None:
+        query = query.where(MeetingSegment.start_ms < end_ms)
+    rows = (await db.execute(query)).all()
+    if not rows and await db.scalar(select(Meeting.id).where(Meeting.id == meeting_id)) is None:
+        raise HTTPException(status_code=404, detail="Meeting not found")
+
+    segments = [
+        {"start": row.start_ms / 1000, "end": row.end_ms / 1000, "speaker": row.speaker, "text": row.text}
+        for row in rows[:limit]
+    ]
+    return {
+        "id": str(meeting_id),
+        "segments": segments,
+        "text": " ".join(segment["text"] for segment in segments if segment["text"]),
+        # 더 있으면 마지막 세그먼트의 end 를 다음 요청의 start 로 사용
+        "has_more": len(rows) > limit,
+    }
+
+def _parse_range(value: str, size: int) -> tuple:
+    """단일 "bytes=start-end" / "bytes=start-" / "bytes=-suffix" 를 [start, end) 로 변환합니다."""
+    try:
+        unit, spec = value.split("=", 1)
+        first, last = spec.strip().split("-", 1)
+        if unit.strip() != "bytes" or "," in spec:
+            raise ValueError(value)
+        if first:
+            start = int(first)
+            end = min(int(last) + 1, size) if last else size
+        else:
+            start, end = max(size - int(last), 0), size
+    except ValueError:
+        start, end = size, size
+    if start >= end:
+        raise HTTPException(status_code=416, detail="Invalid range", headers={"Content-Range": f"bytes */{size}"})
+    return start, end
+
+@router.get("/meetings/{meeting_id}/audio")
+async def get_meeting_audio(meeting_id: uuid.UUID, request: Request):
+    """
+    원본 오디오를 저장소에서 스트리밍합니다. Range 요청(단일 구간)을 지원하므로 플레이어에서 바로 탐색할 수 있습니다.
+    AUDIO_RETENTION=delete 로 이미 지운 오디오는 404 입니다.
+    """
+    # 스트리밍 동안 커넥션을 잡지 않도록 Depends(get_db) 대신 짧은 세션 사용
+    async with SessionLocal() as db:
+        row = (await db.execute(
+            select(Meeting.title, Meeting.file_path).where(Meeting.id == meeting_id)
+        )).first()
+    if row is None:
+        raise HTTPException(status_code=404, detail="Meeting not found")
+    size = await storage.stat(row.file_path)
+    if size is None:
+        raise HTTPException(status_code=404, detail="Audio is no longer stored")
+
+    start, end = 0, size
+    status_code = 200
+    headers = {"Accept-Ranges": "bytes"}
+    if request.headers.get("range"):
+        start, end = _parse_range(request.headers["range"], size)
+        status_code = 206
+        headers["Content-Range"] = f"bytes {start}-{end - 1}/{size}"
+    headers["Content-Length"] = str(end - start)
+
+    media_type = mimetypes.guess_type(row.file_path)[0] or "application/octet-stream"
+    return StreamingResponse(
+        storage.iter_range(row.file_path, start, end),
+        status_code=status_code,
+        media_type=media_type,
+        headers=headers,
+    )
+
+class SummaryUpdate(BaseModel):
+    summary: str = Field(..., min_length=1)
+
+@router.put("/meetings/{meeting_id}/summary")
+async def update_meeting_summary(meeting_id: uuid.UUID, body: SummaryUpdate, db: AsyncSession = Depends(get_db)):
+    """
+    완료된 회의의 요약을 고치고 Notion 에 다시 게시합니다.
+    이미 게시한 페이지는 새로 만들지 않고 바뀐 블록만 수정합니다. 게시 중이면 409 입니다.
+    """
+    row = (await db.execute(
+        select(Meeting.title, Meeting.transcript).where(Meeting.id == meeting_id)
+    )).first()
+    if row is None:
+        raise HTTPException(status_code=404, detail="Meeting not found")
+
+    result = await db.execute(
+        update(Meeting)
+        .where(
+            Meeting.id == meeting_id,
+            Meeting.status == MeetingStatus.COMPLETED.value,
+            or_(Meeting.publish_status.is_(None), Meeting.publish_status != PublishStatus.PUBLISHING.value),
+        )
+        .values(
+            summary=body.summary,
+            stage=PipelineStage.PUBLISH.value,
+            publish_status=PublishStatus.PENDING.value,
+            **search_index.column_values(row.title, row.transcript, body.summary),
+        )
+    )
+    if result.rowcount != 1:
+        await db.rollback()
+        raise HTTPException(status_code=409, detail="Meeting is not completed or is being published")
+    await db.commit()
+    await search_index.indexed(meeting_id, row.title, row.transcript, body.summary)
+    await enqueue_publish(meeting_id)
+    return {"id": str(meeting_id), "publish_status": PublishStatus.PENDING.value}
 
 @router.get("/meetings/{meeting_id}")
 async def get_meeting(meeting_id: uuid.UUID, db: AsyncSession = Depends(get_db)):
     meeting = await db.get(Meeting, meeting_id)
+    if meeting is None:
+        raise HTTPException(status_code=404, detail="Meeting not found")
     return meeting
-
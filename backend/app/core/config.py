@@ -5,15 +5,147 @@ class Settings(BaseSettings):
     PROJECT_NAME: str = "NoteSync AI"
     DATABASE_URL: str
     OPENAI_API_KEY: Optional[str] = None
+    OPENAI_BASE_URL: Optional[str] = None  # 로컬 fake 서버로 테스트할 때 지정
     GEMINI_API_KEY: Optional[str] = None
+    GEMINI_BASE_URL: Optional[str] = None  # 로컬 fake 서버로 테스트할 때 지정
     NOTION_API_KEY: Optional[str] = None
     NOTION_DATABASE_ID: Optional[str] = None
     TEAMS_WEBHOOK_URL: Optional[str] = None
+
+    # Database pool settings
+    DB_ECHO: bool = False
+    DB_POOL_SIZE: Optional[int] = None  # 미지정 시 WORKER_CONCURRENCY + 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30.0
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    DB_AUTO_MIGRATE: bool = True  # API 시작 시 마이그레이션 적용 (alembic upgrade head). 운영에서는 false 로 두고 python -m app.migrate 실행
+
+    # Upload settings
+    UPLOAD_DIR: str = "uploads"
+    MAX_UPLOAD_SIZE_MB: int = 500
+    UPLOAD_CHUNK_SIZE: int = 1024 * 1024
+    MAX_BULK_UPLOAD_SIZE_MB: int = 10240  # 일괄 업로드 요청 전체 크기 (파일 하나는 MAX_UPLOAD_SIZE_MB)
+    BULK_MAX_FILES: int = 500
+    BULK_ADMISSION_RATE_PER_SECOND: float = 1.0  # 일괄 업로드 파이프라인을 초당 몇 건씩 큐에 풀지 (0 이면 한 번에)
+
+    # Audio storage settings
+    STORAGE_BACKEND: str = "local"  # "local" (UPLOAD_DIR) 또는 "s3" (S3 호환 오브젝트 스토리지)
+    S3_BUCKET: Optional[str] = None
+    S3_ENDPOINT_URL: Optional[str] = None  # MinIO 등 S3 호환 서버 주소. 비우면 AWS S3
+    S3_REGION: Optional[str] = None
+    S3_ACCESS_KEY_ID: Optional[str] = None  # 비우면 boto3 기본 자격 증명 (IAM 역할 등)
+    S3_SECRET_ACCESS_KEY: Optional[str] = None
+    S3_PREFIX: str = "audio/"
+    S3_MAX_CONCURRENCY: int = 8  # 파일 하나를 올리고 내려받을 때 병렬 요청 수
+    S3_MULTIPART_CHUNK_SIZE: int = 16 * 1024 * 1024
+    AUDIO_RETENTION: str = "keep"  # 전사 완료 후 원본 오디오: "keep", "delete", "compress" (모노 opus 로 재인코딩)
+    AUDIO_COMPRESS_BITRATE: str = "24k"
+
+    # Job queue / worker settings
+    REDIS_URL: Optional[str] = None
+    QUEUE_BACKEND: str = "memory"  # "memory" (단일 프로세스) 또는 "redis"
+    RUN_EMBEDDED_WORKER: bool = True  # API 프로세스 안에서 워커 실행 여부
+    WORKER_CONCURRENCY: int = 4
+    STT_CONCURRENCY: int = 2
+    LLM_CONCURRENCY: int = 4
+    NOTION_CONCURRENCY: int = 2
+    JOB_MAX_RETRIES: int = 3
+    JOB_RETRY_BACKOFF_SECONDS: float = 5.0
+    JOB_RETRY_BACKOFF_MAX_SECONDS: float = 300.0
+    STALE_PROCESSING_SECONDS: int = 1800  # 이 시간 동안 heartbeat 가 없는 PROCESSING/PUBLISHING 회의를 되돌림
+    STALE_PENDING_SECONDS: int = 1800  # 이 시간 넘게 PENDING 인 회의는 큐에서 유실된 것으로 보고 다시 등록
+    STALE_SWEEP_INTERVAL_SECONDS: int = 60
+    JOB_HEARTBEAT_SECONDS: int = 60  # 작업 실행 중 updated_at 과 큐 임대를 갱신하는 간격
+    JOB_VISIBILITY_TIMEOUT_SECONDS: int = 300  # Redis 큐에서 꺼낸 작업이 이 시간 동안 갱신되지 않으면 다시 대기열로
+    WORKER_METRICS_PORT: Optional[int] = None  # 별도 워커 프로세스의 Prometheus 지표 포트
+
+    # Outbound API limits (RATE_LIMIT_BACKEND=redis 이면 모든 프로세스가 제한을 공유)
+    RATE_LIMIT_BACKEND: str = "memory"  # "memory" (프로세스별) 또는 "redis"
+    RATE_LIMIT_LEASE_SECONDS: float = 900.0  # 프로세스가 죽었을 때 Redis 동시 실행 슬롯이 풀리는 시간
+    OPENAI_MAX_CONCURRENCY: int = 4
+    OPENAI_RATE_LIMIT_PER_SECOND: float = 0.8  # Whisper 기본 한도 50 RPM
+    OPENAI_RATE_LIMIT_BURST: int = 4
+    OPENAI_MAX_RETRIES: int = 3
+    GEMINI_MAX_CONCURRENCY: int = 8
+    GEMINI_RATE_LIMIT_PER_SECOND: float = 5.0
+    GEMINI_RATE_LIMIT_BURST: int = 10
+    GEMINI_MAX_RETRIES: int = 3
+    API_RETRY_BACKOFF_SECONDS: float = 1.0
+    API_RETRY_BACKOFF_MAX_SECONDS: float = 30.0
+    CIRCUIT_FAILURE_THRESHOLD: int = 5  # 연속 실패 횟수 (429 제외)
+    CIRCUIT_RESET_SECONDS: float = 30.0
+
+    # Outbound HTTP connection settings (프로바이더별 커넥션 풀 크기는 *_MAX_CONCURRENCY)
+    HTTP2: bool = True  # h2 패키지가 설치되어 있을 때만 적용
+    HTTP_KEEPALIVE_EXPIRY_SECONDS: float = 60.0
+    HTTP_CONNECT_TIMEOUT_SECONDS: float = 10.0
+    OPENAI_TIMEOUT_SECONDS: float = 600.0  # 긴 오디오 업로드/전사
+    GEMINI_TIMEOUT_SECONDS: float = 300.0
+    NOTION_TIMEOUT_SECONDS: float = 60.0
+
+    # Progress events (SSE) settings
+    EVENTS_BACKEND: str = "memory"  # "memory" (단일 프로세스) 또는 "redis" (pub/sub)
+    SSE_HEARTBEAT_SECONDS: int = 15
+
+    # STT settings
+    STT_BACKEND: str = "openai"  # "openai" (Whisper API) 또는 "local" (faster-whisper)
+    STT_MODEL: str = "whisper-1"
+    STT_LANGUAGE: Optional[str] = None  # 예: "ko". 비워두면 자동 감지 (로컬 엔진)
+    STT_LOCAL_MODEL: str = "small"  # faster-whisper 모델 크기 또는 경로
+    STT_LOCAL_DEVICE: str = "cpu"
+    STT_LOCAL_COMPUTE_TYPE: str = "int8"
+    STT_LOCAL_WORKERS: int = 1  # 모델을 올린 프로세스 수
+    STT_LOCAL_CPU_THREADS: int = 4  # 프로세스당 추론 스레드 수
+    STT_LOCAL_BEAM_SIZE: int = 5
+    STT_CHUNKED: bool = True  # 긴 녹음은 구간을 나눠 병렬 전사
+    STT_CHUNK_SECONDS: int = 600
+    STT_CHUNK_OVERLAP_SECONDS: float = 2.0
+    STT_CHUNK_CONCURRENCY: int = 4
+    STT_SILENCE_DB: float = -35.0
+    STT_MIN_SILENCE_SECONDS: float = 0.5
+    STT_PREPROCESS: bool = True  # 전사 전에 모노 16kHz 로 변환하고 압축
+    STT_PREPROCESS_CODEC: str = "opus"  # "opus", "mp3", "flac"
+    STT_PREPROCESS_BITRATE: str = "32k"
+    STT_PREPROCESS_CONCURRENCY: int = 2  # 동시에 실행할 ffmpeg 변환 수
+    STT_TRIM_SILENCE: bool = True  # 긴 무음 구간을 줄임 (세그먼트 시각은 원본 오디오 기준으로 되돌려 저장)
+    STT_TRIM_SILENCE_SECONDS: float = 2.0  # 이보다 긴 무음만 줄임
+
+    # LLM settings
+    GEMINI_MODEL: str = "gemini-2.5-flash"
+    SUMMARY_MAP_REDUCE: bool = True  # 긴 회의록은 구간별 요약 후 병합
+    SUMMARY_CHUNK_TOKENS: int = 8000
+    SUMMARY_MAP_CONCURRENCY: int = 4
+    SUMMARY_REDUCE_FANIN: int = 8
+    SUMMARY_MAX_REDUCE_DEPTH: int = 3
+    SUMMARY_STREAMING: bool = True  # 요약을 스트리밍으로 받아 진행 중에도 보여줌
+    SUMMARY_FLUSH_SECONDS: float = 2.0  # 스트리밍 중 부분 요약을 DB 에 저장하는 간격
+
+    # Result cache settings
+    CACHE_BACKEND: str = "memory"  # "memory", "disk", "redis", "none"
+    CACHE_TTL_SECONDS: int = 7 * 24 * 3600
+    CACHE_MAX_ENTRIES: int = 1024
+    CACHE_DIR: str = ".cache"
+
+    # Search settings
+    SEARCH_BACKEND: Optional[str] = None  # "postgres" (tsvector + GIN) 또는 "memory" (프로세스 내 역색인). 비우면 DB 종류로 결정
+    SEARCH_RANK_CANDIDATES: int = 200  # 최신순으로 이만큼의 일치 회의만 관련도로 다시 정렬
+    SEARCH_SNIPPET_CHARS: int = 160
+
+    # Notion settings
+    NOTION_BASE_URL: Optional[str] = None  # 로컬 fake 서버로 테스트할 때 지정
+    NOTION_RATE_LIMIT_PER_SECOND: float = 3.0
+    NOTION_RATE_LIMIT_BURST: int = 3
+    NOTION_MAX_CONCURRENCY: int = 3
+    NOTION_BLOCKS_PER_REQUEST: int = 100
+    NOTION_MAX_RETRIES: int = 5
     
-    # Postgres variables (needed to avoid extra fields error)
+    # Postgres / MinIO variables (needed to avoid extra fields error)
     POSTGRES_USER: Optional[str] = None
     POSTGRES_PASSWORD: Optional[str] = None
     POSTGRES_DB: Optional[str] = None
+    MINIO_ROOT_USER: Optional[str] = None
+    MINIO_ROOT_PASSWORD: Optional[str] = None
 
     class Config:
         env_file = ".env"
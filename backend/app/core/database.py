@@ -1,9 +1,64 @@
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
 from sqlalchemy.orm import sessionmaker, declarative_base
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from sqlalchemy import exc
 from app.core.config import settings
-import sys
+import threading
+import time
 
-engine = create_async_engine(settings.DATABASE_URL, echo=True)
+class PoolMetrics:
+    """커넥션 풀 대기 시간/타임아웃 집계"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.waits = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+        self.timeouts = 0
+
+    def record_wait(self, seconds: float) -> None:
+        with self._lock:
+            self.waits += 1
+            self.wait_seconds_total += seconds
+            self.wait_seconds_max = max(self.wait_seconds_max, seconds)
+
+    def record_timeout(self) -> None:
+        with self._lock:
+            self.timeouts += 1
+
+pool_metrics = PoolMetrics()
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """커넥션을 얻기까지 기다린 시간을 기록하는 풀"""
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            pool_metrics.record_timeout()
+            raise
+        finally:
+            pool_metrics.record_wait(time.perf_counter() - started)
+
+def _engine_options() -> dict:
+    options = {"echo": settings.DB_ECHO}
+    if settings.DATABASE_URL.startswith("sqlite"):
+        # SQLite 는 드라이버 기본 풀을 그대로 사용
+        return options
+    # 워커 동시 실행 수 + API 요청용 여유분
+    pool_size = settings.DB_POOL_SIZE or settings.WORKER_CONCURRENCY + 5
+    options.update(
+        poolclass=InstrumentedQueuePool,
+        pool_size=pool_size,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+    )
+    return options
+
+engine = create_async_engine(settings.DATABASE_URL, **_engine_options())
 SessionLocal = sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
 
 Base = declarative_base()
@@ -11,3 +66,18 @@ Base = declarative_base()
 async def get_db():
     async with SessionLocal() as session:
         yield session
+
+def get_pool_stats() -> dict:
+    pool = engine.sync_engine.pool
+    stats = {"pool": type(pool).__name__}
+    for name in ("size", "checkedout", "checkedin", "overflow"):
+        method = getattr(pool, name, None)
+        if callable(method):
+            stats[name] = method()
+    stats.update(
+        waits=pool_metrics.waits,
+        wait_seconds_avg=pool_metrics.wait_seconds_total / pool_metrics.waits if pool_metrics.waits else 0.0,
+        wait_seconds_max=pool_metrics.wait_seconds_max,
+        timeouts=pool_metrics.timeouts,
+    )
+    return stats
@@ -0,0 +1,96 @@
+"""
+외부 API 용 HTTP 클라이언트
+
+OpenAI / Gemini / Notion SDK 에 여기서 만든 httpx 클라이언트를 넣어 사용합니다.
+프로바이더마다 프로세스에 클라이언트가 하나뿐이므로 모든 파이프라인이 같은 커넥션 풀을 쓰고,
+keep-alive 로 열어 둔 커넥션을 재사용해 작업마다 TCP/TLS 핸드셰이크를 하지 않습니다.
+
+    - 풀 크기: 프로바이더의 *_MAX_CONCURRENCY (요청 제한과 같아 풀에서 기다리지 않음)
+    - keep-alive: HTTP_KEEPALIVE_EXPIRY_SECONDS 동안 쉬는 커넥션을 유지
+    - HTTP/2: HTTP2=true 이고 h2 패키지가 설치되어 있으면 사용 (커넥션 하나로 여러 요청을 동시에 보냄)
+    - 타임아웃: 단계별로 다름 (OPENAI_/GEMINI_/NOTION_TIMEOUT_SECONDS, 연결은 HTTP_CONNECT_TIMEOUT_SECONDS)
+
+커넥션 재사용 현황은 GET /health/http 와 Prometheus 지표로 확인합니다.
+"""
+from app.core.config import settings
+from app.core import metrics
+from dataclasses import dataclass
+from typing import Dict
+import asyncio
+import httpx
+import importlib.util
+import sys
+
+@dataclass
+class ConnectionStats:
+    requests: int = 0
+    connections: int = 0
+    tls_handshakes: int = 0
+
+_stats: Dict[str, ConnectionStats] = {}
+_clients: Dict[str, object] = {}
+
+def http2_enabled() -> bool:
+    return settings.HTTP2 and importlib.util.find_spec("h2") is not None
+
+def _httpx_module(client_class):
+    """client_class 를 정의한 httpx 계열 모듈. openai 3.x 는 자체 포크(httpx2)를 쓰므로 Limits/Timeout 도 그 모듈 것을 써야 함"""
+    for cls in client_class.__mro__:
+        if cls.__name__ == "AsyncClient":
+            return sys.modules[cls.__module__.split(".")[0]]
+    return httpx
+
+def create_http_client(service: str, timeout: float, max_connections: int, client_class=None):
+    """
+    service 용 AsyncClient 를 만들고 종료 시 닫을 수 있도록 등록합니다.
+    client_class 는 SDK 가 요구하는 클라이언트 클래스입니다 (기본값 httpx.AsyncClient).
+    """
+    client_class = client_class or httpx.AsyncClient
+    module = _httpx_module(client_class)
+    stats = _stats.setdefault(service, ConnectionStats())
+
+    async def trace(event_name: str, info: dict) -> None:
+        # httpcore 가 새 커넥션을 열 때만 발생하는 이벤트 (재사용된 커넥션에서는 발생하지 않음)
+        if event_name.endswith("connect_tcp.complete"):
+            stats.connections += 1
+            metrics.HTTP_CONNECTIONS.labels(service).inc()
+        elif event_name.endswith("start_tls.complete"):
+            stats.tls_handshakes += 1
+
+    async def on_request(request) -> None:
+        stats.requests += 1
+        metrics.HTTP_REQUESTS.labels(service).inc()
+        request.extensions["trace"] = trace
+
+    client = client_class(
+        limits=module.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_connections,
+            keepalive_expiry=settings.HTTP_KEEPALIVE_EXPIRY_SECONDS,
+        ),
+        timeout=module.Timeout(timeout, connect=settings.HTTP_CONNECT_TIMEOUT_SECONDS),
+        http2=http2_enabled(),
+        event_hooks={"request": [on_request]},
+    )
+    _clients[service] = client
+    return client
+
+def get_http_stats() -> dict:
+    result = {"http2": http2_enabled()}
+    for service, stats in sorted(_stats.items()):
+        result[service] = {
+            "requests": stats.requests,
+            "connections": stats.connections,
+            "tls_handshakes": stats.tls_handshakes,
+            # 새 커넥션 없이 처리한 요청 비율
+            "reuse_ratio": round(1 - stats.connections / stats.requests, 3) if stats.requests else None,
+        }
+    return result
+
+async def close_http_clients() -> None:
+    clients = list(_clients.values())
+    _clients.clear()
+    results = await asyncio.gather(*(client.aclose() for client in clients), return_exceptions=True)
+    for result in results:
+        if isinstance(result, Exception):
+            print(f"Failed to close HTTP client: {result}")
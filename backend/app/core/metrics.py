@@ -0,0 +1,146 @@
+"""
+파이프라인 계측 (Prometheus 지표 + 회의별 지표)
+
+각 서비스는 여기의 record_* 함수로 측정값을 남깁니다. 값은 두 곳에 기록됩니다:
+    - Prometheus 지표: API 는 GET /metrics, 별도 워커는 WORKER_METRICS_PORT 로 노출
+    - 회의별 지표: 파이프라인이 track_meeting() 으로 연 수집기에 모아 Meeting.metrics 컬럼에 저장
+
+회의별 수집기는 ContextVar 로 전달하므로 서비스 함수 시그니처를 바꾸지 않아도 되고,
+asyncio.gather 로 나뉜 하위 작업(구간별 전사, map 요약 등)의 측정값도 같은 회의에 합산됩니다.
+"""
+from prometheus_client import Counter, Gauge, Histogram
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterator, Optional
+import time
+
+# 외부 API 가 수 분 걸릴 수 있으므로 버킷을 넓게 잡음
+_DURATION_BUCKETS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600, 1800)
+
+STAGE_DURATION = Histogram(
+    "notesync_stage_duration_seconds", "파이프라인 단계별 소요 시간",
+    ["stage", "outcome"], buckets=_DURATION_BUCKETS,
+)
+EXTERNAL_REQUEST_DURATION = Histogram(
+    "notesync_external_request_duration_seconds", "외부 API 요청 소요 시간",
+    ["service", "operation", "outcome"], buckets=_DURATION_BUCKETS,
+)
+EXTERNAL_WAIT = Histogram(
+    "notesync_external_wait_seconds", "외부 API 호출 전 동시 실행/속도 제한 대기 시간",
+    ["service"], buckets=_DURATION_BUCKETS,
+)
+HTTP_REQUESTS = Counter("notesync_http_requests_total", "외부 API HTTP 요청 수", ["service"])
+HTTP_CONNECTIONS = Counter("notesync_http_connections_total", "새로 연 외부 API 커넥션 수 (재사용 시 증가하지 않음)", ["service"])
+EXTERNAL_RETRIES = Counter("notesync_external_retries_total", "외부 API 재시도 횟수", ["service"])
+AUDIO_SECONDS = Counter("notesync_stt_audio_seconds_total", "전사한 원본 오디오 길이 (초, 무음 제거 전)", ["backend"])
+LLM_TOKENS = Counter("notesync_llm_tokens_total", "LLM 토큰 수", ["kind"])
+CACHE_REQUESTS = Counter("notesync_cache_requests_total", "결과 캐시 조회", ["namespace", "result"])
+JOB_RETRIES = Counter("notesync_job_retries_total", "작업 재시도 횟수", ["kind"])
+JOB_FAILURES = Counter("notesync_job_failures_total", "재시도 후에도 실패한 작업 수", ["kind"])
+JOB_DEFERRALS = Counter("notesync_job_deferrals_total", "프로바이더 사용 불가로 미뤄진 작업 수", ["kind"])
+CIRCUIT_OPEN = Gauge("notesync_circuit_open", "서킷 브레이커 열림 여부 (1 이면 요청 차단 중)", ["service"])
+QUEUE_DEPTH = Gauge("notesync_job_queue_depth", "대기 중인 작업 수 (재시도 대기 포함)")
+
+class MeetingMetrics:
+    """
+    회의 하나의 측정값. 단계 이름별 딕셔너리로 모으며 그대로 JSON 으로 저장됩니다.
+
+        {"transcribe": {"seconds": 12.3, "audio_seconds": 600.0, "cache_hit": false},
+         "summarize": {"seconds": 8.1, "prompt_tokens": 15000, "response_tokens": 900, "llm_calls": 1},
+         "publish": {"seconds": 1.2, "notion_requests": 2, "retries": 0}}
+    """
+
+    def __init__(self, data: Optional[dict] = None):
+        self.data: Dict[str, dict] = {key: dict(value) for key, value in (data or {}).items()}
+        self.stage_name: Optional[str] = None
+
+    def section(self, name: Optional[str] = None) -> dict:
+        return self.data.setdefault(name or self.stage_name or "other", {})
+
+    def add(self, key: str, value: float) -> None:
+        section = self.section()
+        section[key] = section.get(key, 0) + value
+
+    def set(self, key: str, value) -> None:
+        self.section()[key] = value
+
+_current: ContextVar[Optional[MeetingMetrics]] = ContextVar("meeting_metrics", default=None)
+
+@contextmanager
+def track_meeting(data: Optional[dict] = None) -> Iterator[MeetingMetrics]:
+    """이 블록 안에서 기록되는 측정값을 회의별 수집기에 모읍니다. data 는 이전 시도의 측정값입니다."""
+    collector = MeetingMetrics(data)
+    token = _current.set(collector)
+    try:
+        yield collector
+    finally:
+        _current.reset(token)
+
+@contextmanager
+def stage(name: str) -> Iterator[None]:
+    """단계 소요 시간을 히스토그램과 회의별 지표에 기록합니다. 재시도된 단계는 마지막 시도의 값으로 덮어씁니다."""
+    collector = _current.get()
+    if collector is not None:
+        collector.stage_name = name
+        collector.data[name] = {}
+    started = time.perf_counter()
+    outcome = "error"
+    try:
+        yield
+        outcome = "success"
+    finally:
+        elapsed = time.perf_counter() - started
+        STAGE_DURATION.labels(name, outcome).observe(elapsed)
+        if collector is not None:
+            collector.section(name)["seconds"] = round(elapsed, 3)
+            collector.section(name)["outcome"] = outcome
+            collector.stage_name = None
+
+@contextmanager
+def external_request(service: str, operation: str) -> Iterator[None]:
+    """외부 API 요청 하나의 소요 시간을 기록합니다."""
+    started = time.perf_counter()
+    outcome = "error"
+    try:
+        yield
+        outcome = "success"
+    finally:
+        elapsed = time.perf_counter() - started
+        EXTERNAL_REQUEST_DURATION.labels(service, operation, outcome).observe(elapsed)
+        collector = _current.get()
+        if collector is not None:
+            collector.add(f"{service}_requests", 1)
+            collector.add(f"{service}_seconds", round(elapsed, 3))
+
+def record_retry(service: str) -> None:
+    EXTERNAL_RETRIES.labels(service).inc()
+    collector = _current.get()
+    if collector is not None:
+        collector.add("retries", 1)
+
+def record_wait(service: str, seconds: float) -> None:
+    EXTERNAL_WAIT.labels(service).observe(seconds)
+    collector = _current.get()
+    if collector is not None:
+        collector.add(f"{service}_wait_seconds", round(seconds, 3))
+
+def record_audio_seconds(backend: str, seconds: float) -> None:
+    AUDIO_SECONDS.labels(backend).inc(seconds)
+    collector = _current.get()
+    if collector is not None:
+        collector.add("audio_seconds", round(seconds, 3))
+
+def record_llm_usage(prompt_tokens: Optional[int], response_tokens: Optional[int]) -> None:
+    LLM_TOKENS.labels("prompt").inc(prompt_tokens or 0)
+    LLM_TOKENS.labels("response").inc(response_tokens or 0)
+    collector = _current.get()
+    if collector is not None:
+        collector.add("llm_calls", 1)
+        collector.add("prompt_tokens", prompt_tokens or 0)
+        collector.add("response_tokens", response_tokens or 0)
+
+def record_cache(namespace: str, hit: bool) -> None:
+    CACHE_REQUESTS.labels(namespace, "hit" if hit else "miss").inc()
+    collector = _current.get()
+    if collector is not None:
+        collector.set(f"{namespace}_cache_hit", hit)
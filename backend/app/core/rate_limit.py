@@ -0,0 +1,356 @@
+"""
+외부 API 호출 제어 (OpenAI / Gemini / Notion)
+
+프로바이더마다 ProviderLimiter 하나를 두고 모든 호출을 limiter.call() 로 보냅니다. 호출마다:
+    1. 서킷 브레이커가 열려 있으면 요청을 보내지 않고 CircuitOpenError 를 던지고
+    2. 동시 실행 슬롯을 얻은 뒤 (*_MAX_CONCURRENCY)
+    3. 토큰 버킷에서 토큰을 하나 받아 (*_RATE_LIMIT_PER_SECOND / *_RATE_LIMIT_BURST)
+    4. 요청합니다. 429/5xx/연결 오류는 Retry-After (없으면 지터를 섞은 지수 백오프) 만큼 기다렸다가 재시도하고,
+       429 의 Retry-After 는 버킷에 반영해 같은 프로바이더를 쓰는 모든 호출을 함께 늦춥니다.
+
+RATE_LIMIT_BACKEND=redis 이면 슬롯과 버킷을 Redis 에 두어 API/워커 프로세스 전체의 합이 제한을 넘지 않습니다.
+서킷 브레이커는 프로세스마다 따로 동작합니다.
+
+재시도를 다 써도 429 가 계속되거나 서킷이 열려 있으면 ProviderUnavailable 을 던집니다.
+워커는 이를 작업 실패로 세지 않고 retry_after 뒤로 미뤄 다시 실행합니다.
+"""
+from app.core.config import settings
+from app.core.redis import get_redis
+from app.core import metrics
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Awaitable, Callable, Optional, Tuple, Type, TypeVar
+import asyncio
+import random
+import time
+import uuid
+
+T = TypeVar("T")
+
+# 재시도할 응답 코드 (요청 시간 초과, rate limit, 일시적 서버 오류)
+RETRYABLE_STATUS = {408, 429, 500, 502, 503, 504}
+
+# 일시적인 네트워크 오류로 보는 예외
+TRANSIENT_ERRORS: Tuple[Type[BaseException], ...] = (asyncio.TimeoutError, ConnectionError)
+
+def is_network_error(error: Optional[BaseException]) -> bool:
+    """
+    연결 실패/타임아웃 같은 전송 오류인지 확인합니다.
+    SDK 마다 포함한 httpx 가 다를 수 있고 SDK 예외 타입을 import 하지 않기 위해 httpx 계열 예외는 클래스 이름으로 판별합니다.
+    SDK 가 감싸서 던진 경우(openai APIConnectionError, notion RequestTimeoutError 등)는 원인 예외를 봅니다.
+    """
+    for candidate in (error, getattr(error, "__cause__", None) or getattr(error, "__context__", None)):
+        if candidate is None:
+            continue
+        if isinstance(candidate, TRANSIENT_ERRORS):
+            return True
+        if any(cls.__name__ == "TransportError" for cls in type(candidate).__mro__):
+            return True
+    return False
+
+class ProviderUnavailable(Exception):
+    """프로바이더가 당분간 요청을 받을 수 없는 상태. retry_after 초 뒤에 다시 시도하면 됩니다."""
+
+    def __init__(self, service: str, retry_after: float, message: str = "rate limited"):
+        super().__init__(f"{service} is unavailable ({message}), retry after {retry_after:.1f}s")
+        self.service = service
+        self.retry_after = retry_after
+
+class CircuitOpenError(ProviderUnavailable):
+    def __init__(self, service: str, retry_after: float):
+        super().__init__(service, retry_after, "circuit open")
+
+def error_status(error: BaseException) -> Optional[int]:
+    """SDK 예외에서 HTTP 상태 코드를 꺼냅니다 (openai: status_code, notion: status, genai: code)."""
+    for attr in ("status_code", "status", "code"):
+        value = getattr(error, attr, None)
+        if isinstance(value, int):
+            return value
+    return None
+
+def retry_after_seconds(error: BaseException) -> Optional[float]:
+    headers = getattr(error, "headers", None)
+    if headers is None:
+        headers = getattr(getattr(error, "response", None), "headers", None)
+    try:
+        return float(headers.get("retry-after"))
+    except (AttributeError, TypeError, ValueError):
+        return None
+
+class TokenBucket:
+    """
+    프로세스 내에서 공유하는 토큰 버킷.
+
+    초당 rate 개의 토큰이 최대 capacity 개까지 채워지고, 호출 전 acquire() 로 토큰을 하나씩 씁니다.
+    서버가 Retry-After 를 보내면 pause() 로 모든 호출자를 그 시간만큼 멈춥니다.
+    """
+
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = asyncio.Lock()
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self) -> None:
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                if now < self._paused_until:
+                    await asyncio.sleep(self._paused_until - now)
+                    continue
+                self._refill(now)
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+    async def pause(self, seconds: float) -> None:
+        self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+        self._tokens = 0.0
+
+# 토큰을 하나 쓰고 0 을, 부족하면 기다려야 할 시간(초)을 돌려줌. 시각은 Redis 서버 시계를 기준으로 함
+_BUCKET_ACQUIRE = """
+local t = redis.call('TIME')
+local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+local rate = tonumber(ARGV[1])
+local capacity = tonumber(ARGV[2])
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'updated', 'paused_until')
+local paused_until = tonumber(state[3]) or 0
+if now < paused_until then
+    return tostring(paused_until - now)
+end
+local tokens = tonumber(state[1]) or capacity
+local updated = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + (now - updated) * rate)
+local wait = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+else
+    wait = (1 - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'updated', tostring(now))
+redis.call('EXPIRE', KEYS[1], 3600)
+return tostring(wait)
+"""
+
+_BUCKET_PAUSE = """
+local t = redis.call('TIME')
+local until_ = tonumber(t[1]) + tonumber(t[2]) / 1000000 + tonumber(ARGV[1])
+local current = tonumber(redis.call('HGET', KEYS[1], 'paused_until')) or 0
+if until_ > current then
+    redis.call('HSET', KEYS[1], 'paused_until', tostring(until_), 'tokens', '0')
+    redis.call('EXPIRE', KEYS[1], 3600)
+end
+return 1
+"""
+
+class RedisTokenBucket:
+    """여러 프로세스가 공유하는 토큰 버킷. 상태는 Redis 해시 하나에 두고 Lua 스크립트로 원자적으로 갱신합니다."""
+
+    def __init__(self, redis, key: str, rate: float, capacity: int):
+        self.key = key
+        self.rate = rate
+        self.capacity = capacity
+        self._acquire = redis.register_script(_BUCKET_ACQUIRE)
+        self._pause = redis.register_script(_BUCKET_PAUSE)
+
+    async def acquire(self) -> None:
+        while True:
+            wait = float(await self._acquire(keys=[self.key], args=[self.rate, self.capacity]))
+            if wait <= 0:
+                return
+            # 여러 프로세스가 같은 순간에 다시 몰리지 않도록 약간 흔들어서 기다림
+            await asyncio.sleep(wait + random.uniform(0, 0.05))
+
+    async def pause(self, seconds: float) -> None:
+        await self._pause(keys=[self.key], args=[seconds])
+
+class LocalSemaphore:
+    def __init__(self, limit: int):
+        self._semaphore = asyncio.Semaphore(limit)
+
+    @asynccontextmanager
+    async def hold(self) -> AsyncIterator[None]:
+        async with self._semaphore:
+            yield
+
+# 만료된 슬롯을 정리한 뒤 빈 자리가 있으면 만료 시각과 함께 등록
+_SLOT_ACQUIRE = """
+local t = redis.call('TIME')
+local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', now)
+if redis.call('ZCARD', KEYS[1]) < tonumber(ARGV[1]) then
+    redis.call('ZADD', KEYS[1], now + tonumber(ARGV[2]), ARGV[3])
+    redis.call('EXPIRE', KEYS[1], math.ceil(tonumber(ARGV[2])))
+    return 1
+end
+return 0
+"""
+
+class RedisSemaphore:
+    """
+    여러 프로세스가 공유하는 동시 실행 제한. 슬롯은 정렬 집합에 만료 시각과 함께 등록되므로,
+    슬롯을 쥔 프로세스가 죽어도 lease 초 뒤에는 자리가 풀립니다.
+    """
+
+    def __init__(self, redis, key: str, limit: int, lease: float):
+        self.redis = redis
+        self.key = key
+        self.limit = limit
+        self.lease = lease
+        self._acquire = redis.register_script(_SLOT_ACQUIRE)
+
+    @asynccontextmanager
+    async def hold(self) -> AsyncIterator[None]:
+        token = uuid.uuid4().hex
+        while not await self._acquire(keys=[self.key], args=[self.limit, self.lease, token]):
+            await asyncio.sleep(random.uniform(0.05, 0.25))
+        try:
+            yield
+        finally:
+            await self.redis.zrem(self.key, token)
+
+class CircuitBreaker:
+    """
+    연속으로 threshold 번 실패하면 reset_seconds 동안 요청을 막습니다 (open).
+    시간이 지나면 요청 하나만 통과시켜 보고 (half-open), 성공하면 다시 닫고 실패하면 다시 엽니다.
+    """
+
+    def __init__(self, service: str, threshold: int, reset_seconds: float):
+        self.service = service
+        self.threshold = threshold
+        self.reset_seconds = reset_seconds
+        self.failures = 0
+        self.opened_until = 0.0
+        self._probing = False
+
+    def before_call(self) -> None:
+        if not self.opened_until:
+            return
+        now = time.monotonic()
+        if now < self.opened_until or self._probing:
+            raise CircuitOpenError(self.service, max(self.opened_until - now, 1.0))
+        self._probing = True
+
+    def record_success(self) -> None:
+        if self.opened_until:
+            print(f"Circuit for {self.service} closed")
+        self.failures = 0
+        self.opened_until = 0.0
+        self._probing = False
+        metrics.CIRCUIT_OPEN.labels(self.service).set(0)
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        self._probing = False
+        if self.failures >= self.threshold:
+            self.opened_until = time.monotonic() + self.reset_seconds
+            metrics.CIRCUIT_OPEN.labels(self.service).set(1)
+            print(f"Circuit for {self.service} opened for {self.reset_seconds:.0f}s after {self.failures} failures")
+
+    def release_probe(self) -> None:
+        """half-open 시험 요청이 결과 없이 취소된 경우 다음 요청이 시험할 수 있도록 풀어줍니다."""
+        self._probing = False
+
+class ProviderLimiter:
+    def __init__(
+        self,
+        service: str,
+        bucket,
+        slots,
+        breaker: CircuitBreaker,
+        max_retries: int,
+    ):
+        self.service = service
+        self.bucket = bucket
+        self.slots = slots
+        self.breaker = breaker
+        self.max_retries = max_retries
+
+    def retry_delay(self, attempt: int) -> float:
+        """지수 백오프 + 지터"""
+        base = settings.API_RETRY_BACKOFF_SECONDS * (2 ** attempt)
+        delay = min(base, settings.API_RETRY_BACKOFF_MAX_SECONDS)
+        return delay * random.uniform(0.5, 1.0)
+
+    def _is_transient(self, error: BaseException, status: Optional[int]) -> bool:
+        if status is not None:
+            return status in RETRYABLE_STATUS
+        return is_network_error(error)
+
+    async def call(
+        self,
+        request: Callable[[], Awaitable[T]],
+        operation: str,
+        retry_if: Optional[Callable[[BaseException], bool]] = None,
+    ) -> T:
+        """
+        request() 를 제한을 지키며 실행합니다. 재시도할 때마다 request() 를 새로 호출합니다.
+        retry_if 가 False 를 돌려주면 일시적인 오류여도 재시도하지 않습니다 (예: 스트리밍이 이미 시작된 경우).
+        """
+        attempt = 0
+        while True:
+            self.breaker.before_call()
+            started = time.perf_counter()
+            try:
+                async with self.slots.hold():
+                    await self.bucket.acquire()
+                    metrics.record_wait(self.service, time.perf_counter() - started)
+                    with metrics.external_request(self.service, operation):
+                        result = await request()
+            except Exception as e:
+                status = error_status(e)
+                if not self._is_transient(e, status):
+                    # 요청 자체의 문제(4xx 등)는 프로바이더가 정상이라는 뜻
+                    self.breaker.record_success()
+                    raise
+                if status == 429:
+                    # rate limit 은 버킷으로 늦추고 서킷 브레이커에는 세지 않음
+                    self.breaker.release_probe()
+                else:
+                    self.breaker.record_failure()
+                delay = retry_after_seconds(e) or self.retry_delay(attempt)
+                if status == 429:
+                    await self.bucket.pause(delay)
+                if attempt >= self.max_retries or (retry_if is not None and not retry_if(e)):
+                    if status == 429:
+                        raise ProviderUnavailable(self.service, delay) from e
+                    raise
+                print(f"{self.service} {operation} failed ({status or type(e).__name__}), retrying in {delay:.1f}s")
+                metrics.record_retry(self.service)
+                await asyncio.sleep(delay)
+                attempt += 1
+            except BaseException:
+                self.breaker.release_probe()
+                raise
+            else:
+                self.breaker.record_success()
+                return result
+
+def create_limiter(
+    service: str,
+    concurrency: int,
+    rate: float,
+    burst: int,
+    max_retries: int,
+) -> ProviderLimiter:
+    backend = settings.RATE_LIMIT_BACKEND
+    if backend == "redis":
+        redis = get_redis()
+        if redis is None:
+            raise ValueError("RATE_LIMIT_BACKEND=redis requires REDIS_URL to be set.")
+        prefix = f"notesync:ratelimit:{service}"
+        bucket = RedisTokenBucket(redis, f"{prefix}:bucket", rate, burst)
+        slots = RedisSemaphore(redis, f"{prefix}:slots", concurrency, settings.RATE_LIMIT_LEASE_SECONDS)
+    elif backend == "memory":
+        bucket = TokenBucket(rate, burst)
+        slots = LocalSemaphore(concurrency)
+    else:
+        raise ValueError(f"Unknown RATE_LIMIT_BACKEND: {backend}")
+    breaker = CircuitBreaker(service, settings.CIRCUIT_FAILURE_THRESHOLD, settings.CIRCUIT_RESET_SECONDS)
+    return ProviderLimiter(service, bucket, slots, breaker, max_retries)
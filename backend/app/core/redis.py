@@ -0,0 +1,20 @@
+from app.core.config import settings
+
+_client = None
+
+def get_redis():
+    """
+    공유 Redis 클라이언트를 반환합니다 (최초 호출 시 생성).
+    REDIS_URL 이 설정되지 않았으면 None 을 반환합니다.
+    """
+    global _client
+    if _client is None and settings.REDIS_URL:
+        import redis.asyncio as redis
+        _client = redis.from_url(settings.REDIS_URL)
+    return _client
+
+async def close_redis() -> None:
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
@@ -1,16 +1,55 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, Response
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
 from app.core.config import settings
-from app.core.database import engine, Base
+from app.core import metrics
+from app.core.database import get_pool_stats
+from app.core.http import close_http_clients, get_http_stats
+from app.core.redis import close_redis
 from app.api.meetings import router as meetings_router
+from app.services.upload_service import upload_service, UploadTooLargeError
+from app.services.job_queue import job_queue
+from app.services.events import event_broker
 
 app = FastAPI(title=settings.PROJECT_NAME)
 
 @app.on_event("startup")
 async def startup():
-    # In production, use Alembic for migrations. 
-    # For MVP simplicity, we can create tables here if they don't exist.
-    async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
+    # 운영에서는 배포 시 python -m app.migrate 를 한 번 실행하고 DB_AUTO_MIGRATE=false 로 둠
+    if settings.DB_AUTO_MIGRATE:
+        from app.migrate import migrate
+        await migrate()
+
+    # 별도 워커 프로세스(python -m app.worker)를 쓰지 않는 경우 API 프로세스에서 처리.
+    # 파이프라인/외부 SDK 는 워커를 띄울 때만 import 하므로 조회 전용 API 는 더 빨리 뜸
+    if settings.RUN_EMBEDDED_WORKER:
+        from app.worker import Worker
+        app.state.worker = Worker(job_queue)
+        app.state.worker.start()
+
+@app.on_event("shutdown")
+async def shutdown():
+    worker = getattr(app.state, "worker", None)
+    if worker:
+        from app.services.stt_service import stt_service
+        await worker.stop()
+        await stt_service.close()
+    await event_broker.close()
+    await close_http_clients()
+    await close_redis()
+
+@app.middleware("http")
+async def reject_oversized_uploads(request: Request, call_next):
+    # multipart 본문을 파싱하기 전에 Content-Length 로 먼저 거절
+    if request.method == "POST" and request.url.path.endswith(("/upload", "/upload/bulk")):
+        max_bytes = None
+        if request.url.path.endswith("/bulk"):
+            max_bytes = settings.MAX_BULK_UPLOAD_SIZE_MB * 1024 * 1024
+        try:
+            upload_service.check_content_length(request.headers.get("content-length"), max_bytes)
+        except UploadTooLargeError as e:
+            return JSONResponse(status_code=413, content={"detail": str(e)})
+    return await call_next(request)
 
 app.include_router(meetings_router, prefix="/api/v1")
 
@@ -22,3 +61,20 @@ def read_root():
 def health_check():
     return {"status": "ok"}
 
+@app.get("/health/db")
+def db_pool_stats():
+    return get_pool_stats()
+
+@app.get("/health/http")
+def http_connection_stats():
+    return get_http_stats()
+
+@app.get("/metrics")
+async def prometheus_metrics():
+    # 큐 길이는 조회 시점에 갱신
+    try:
+        metrics.QUEUE_DEPTH.set(await job_queue.depth())
+    except Exception as e:
+        print(f"Failed to read queue depth: {e}")
+    return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
+
@@ -0,0 +1,58 @@
+"""
+DB 스키마 마이그레이션
+
+API/워커 시작 경로에서 분리된 마이그레이션 단계입니다. 배포할 때 한 번 실행합니다.
+
+    python -m app.migrate
+
+Alembic revision (migrations/versions) 을 head 까지 적용합니다 (alembic upgrade head 와 같음).
+Alembic 도입 전에 만든 DB 는 최초 revision 으로 표시한 뒤 이후 revision 에서 없는 컬럼/인덱스/테이블만 추가합니다.
+이어서 아직 검색 인덱스에 들어가지 않은 회의를 색인하고 (Postgres), 오디오 저장소를 준비합니다 (S3 버킷 생성).
+"""
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import inspect
+from app.core.database import engine
+from app.services.search import search_index
+from app.services.storage import storage
+import asyncio
+import os
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BASELINE_REVISION = "0001"
+
+def _alembic_config() -> Config:
+    config = Config(os.path.join(BACKEND_DIR, "alembic.ini"))
+    # 작업 디렉토리와 관계없이 revision 을 찾도록 절대 경로로 지정
+    config.set_main_option("script_location", os.path.join(BACKEND_DIR, "migrations"))
+    return config
+
+def _upgrade(connection) -> None:
+    config = _alembic_config()
+    config.attributes["connection"] = connection
+    tables = inspect(connection).get_table_names()
+    if "meetings" in tables and "alembic_version" not in tables:
+        print(f"Existing schema without Alembic version, stamping {BASELINE_REVISION}")
+        command.stamp(config, BASELINE_REVISION)
+    command.upgrade(config, "head")
+
+async def migrate() -> None:
+    started = time.perf_counter()
+    async with engine.begin() as conn:
+        await conn.run_sync(_upgrade)
+    print(f"Database schema is up to date ({time.perf_counter() - started:.2f}s)")
+
+async def main() -> None:
+    try:
+        await migrate()
+        started = time.perf_counter()
+        indexed = await search_index.backfill()
+        if indexed:
+            print(f"Indexed {indexed} meetings for search ({time.perf_counter() - started:.2f}s)")
+        await storage.prepare()
+    finally:
+        await engine.dispose()
+
+if __name__ == "__main__":
+    asyncio.run(main())
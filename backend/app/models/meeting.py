@@ -1,7 +1,9 @@
 import uuid
-from sqlalchemy import Column, String, Text, DateTime, Enum
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import Column, String, Text, DateTime, Enum, BigInteger, Integer, Index, JSON, ForeignKey
+from sqlalchemy.dialects.postgresql import TSVECTOR, UUID
+from sqlalchemy.orm import deferred
 from sqlalchemy.sql import func
+from datetime import datetime, timezone
 import enum
 from app.core.database import Base
 
@@ -11,15 +13,69 @@ class MeetingStatus(str, enum.Enum):
     COMPLETED = "COMPLETED"
     FAILED = "FAILED"
 
+class PipelineStage(str, enum.Enum):
+    TRANSCRIBE = "TRANSCRIBE"
+    SUMMARIZE = "SUMMARIZE"
+    PUBLISH = "PUBLISH"
+    DONE = "DONE"
+
+class PublishStatus(str, enum.Enum):
+    PENDING = "PENDING"
+    PUBLISHING = "PUBLISHING"
+    PUBLISHED = "PUBLISHED"
+    FAILED = "FAILED"
+    SKIPPED = "SKIPPED"  # Notion 연동이 설정되지 않음
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
 class Meeting(Base):
     __tablename__ = "meetings"
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     title = Column(String, nullable=True)
     file_path = Column(String, nullable=False)
+    file_size = Column(BigInteger, nullable=True)
+    file_sha256 = Column(String(64), nullable=True, index=True)
     transcript = Column(Text, nullable=True)
     summary = Column(Text, nullable=True)
     status = Column(String, default=MeetingStatus.PENDING.value)
+    stage = Column(String, default=PipelineStage.TRANSCRIBE.value)
     notion_page_url = Column(String, nullable=True)
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    # 마지막으로 게시한 Notion 페이지 ID 와 블록별 ID/해시 (app.services.notion_service.PublishedPage). 게시할 때만 읽음
+    notion_state = deferred(Column(JSON, nullable=True))
+    publish_status = Column(String, nullable=True)
+    # 단계별 소요 시간, 오디오 길이, 토큰 수, 캐시 적중, 재시도 등 (app.core.metrics.MeetingMetrics)
+    metrics = Column(JSON, nullable=True)
+    # 검색용 토큰 (app.services.search). Postgres 에서만 사용하며 회의 조회 시에는 읽지 않음
+    search_vector = deferred(Column(Text().with_variant(TSVECTOR(), "postgresql"), nullable=True))
+    # keyset pagination 의 정렬 키로 쓰이므로 애플리케이션에서 마이크로초 단위로 채움
+    created_at = Column(DateTime(timezone=True), default=_utcnow, server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    __table_args__ = (
+        # 목록 조회(keyset pagination)와 상태별 필터, stale 작업 탐색용
+        Index("ix_meetings_created_at_id", "created_at", "id"),
+        Index("ix_meetings_status_created_at", "status", "created_at"),
+        Index("ix_meetings_status_updated_at", "status", "updated_at"),
+        Index("ix_meetings_search_vector", "search_vector", postgresql_using="gin").ddl_if(dialect="postgresql"),
+    )
+
+
+class MeetingSegment(Base):
+    """
+    회의록 세그먼트. 시각은 원본 오디오 기준 밀리초 정수로 저장합니다.
+    구간 조회(예: 10:00 ~ 15:00)를 Meeting.transcript 전체를 읽지 않고 (meeting_id, start_ms) 인덱스로 처리합니다.
+    """
+    __tablename__ = "meeting_segments"
+
+    meeting_id = Column(UUID(as_uuid=True), ForeignKey("meetings.id", ondelete="CASCADE"), primary_key=True)
+    seq = Column(Integer, primary_key=True, autoincrement=False)
+    start_ms = Column(Integer, nullable=False)
+    end_ms = Column(Integer, nullable=False)
+    speaker = Column(String, nullable=True)
+    text = Column(Text, nullable=False)
 
+    __table_args__ = (
+        Index("ix_meeting_segments_meeting_id_start_ms", "meeting_id", "start_ms"),
+    )
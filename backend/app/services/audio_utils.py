@@ -0,0 +1,188 @@
+"""
+ffmpeg 기반 오디오 유틸리티
+
+오디오를 메모리에 통째로 올리지 않도록 모든 처리는 ffmpeg/ffprobe 서브프로세스로 수행합니다.
+"""
+from typing import List, Tuple
+import asyncio
+import bisect
+import re
+
+_SILENCE_START = re.compile(r"silence_start:\s*(-?[\d.]+)")
+_SILENCE_END = re.compile(r"silence_end:\s*(-?[\d.]+)")
+
+class AudioProcessingError(Exception):
+    pass
+
+async def _run(*args: str) -> Tuple[bytes, bytes]:
+    try:
+        proc = await asyncio.create_subprocess_exec(
+            *args,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+        )
+    except FileNotFoundError as e:
+        raise AudioProcessingError(f"{args[0]} is not installed") from e
+    stdout, stderr = await proc.communicate()
+    if proc.returncode != 0:
+        raise AudioProcessingError(f"{args[0]} failed: {stderr.decode(errors='ignore')[-500:]}")
+    return stdout, stderr
+
+async def probe_duration(file_path: str) -> float:
+    """오디오 길이(초)"""
+    stdout, _ = await _run(
+        "ffprobe", "-v", "error",
+        "-show_entries", "format=duration",
+        "-of", "default=noprint_wrappers=1:nokey=1",
+        file_path,
+    )
+    return float(stdout.decode().strip())
+
+async def detect_silences(file_path: str, noise_db: float, min_silence: float) -> List[Tuple[float, float]]:
+    """silencedetect 필터로 무음 구간 [(start, end), ...] 을 찾습니다."""
+    _, stderr = await _run(
+        "ffmpeg", "-hide_banner", "-nostats", "-i", file_path,
+        "-af", f"silencedetect=noise={noise_db}dB:d={min_silence}",
+        "-f", "null", "-",
+    )
+    return parse_silences(stderr)
+
+def parse_silences(stderr: bytes) -> List[Tuple[float, float]]:
+    """silencedetect 로그에서 무음 구간 [(start, end), ...] 을 읽습니다."""
+    silences = []
+    start = None
+    for line in stderr.decode(errors="ignore").splitlines():
+        match = _SILENCE_START.search(line)
+        if match:
+            start = max(float(match.group(1)), 0.0)
+            continue
+        match = _SILENCE_END.search(line)
+        if match and start is not None:
+            silences.append((start, float(match.group(1))))
+            start = None
+    return silences
+
+def plan_chunks(
+    duration: float,
+    silences: List[Tuple[float, float]],
+    chunk_seconds: float,
+    overlap_seconds: float,
+) -> List[Tuple[float, float]]:
+    """
+    오디오를 chunk_seconds 이하의 구간으로 나눕니다.
+
+    목표 지점 직전(마지막 25% 구간)에 무음이 있으면 그 무음의 중간에서 자르고,
+    없으면 목표 지점에서 자릅니다. 다음 구간은 overlap_seconds 만큼 겹쳐서 시작해
+    경계에 걸친 발화가 잘리지 않도록 합니다.
+    """
+    if duration <= chunk_seconds:
+        return [(0.0, duration)]
+
+    midpoints = [(s + e) / 2 for s, e in silences]
+    chunks = []
+    start = 0.0
+    while start < duration:
+        target = start + chunk_seconds
+        if target >= duration:
+            chunks.append((start, duration))
+            break
+        window_start = start + chunk_seconds * 0.75
+        candidates = [m for m in midpoints if window_start <= m <= target]
+        cut = candidates[-1] if candidates else target
+        chunks.append((start, cut))
+        start = max(cut - overlap_seconds, start + 1.0)
+    return chunks
+
+# 전처리 출력 코덱: 이름 → (확장자, ffmpeg 인코더 옵션)
+PREPROCESS_CODECS = {
+    "opus": ("ogg", ["-c:a", "libopus", "-application", "voip"]),
+    "mp3": ("mp3", ["-c:a", "libmp3lame"]),
+    "flac": ("flac", ["-c:a", "flac"]),
+}
+
+# 긴 무음을 줄인 뒤 남기는 무음 길이
+KEEP_SILENCE_SECONDS = 0.3
+
+def silence_filter(noise_db: float, max_silence: float, keep_silence: float = KEEP_SILENCE_SECONDS) -> str:
+    """
+    max_silence 초보다 긴 무음을 keep_silence 초로 줄이는 silenceremove 필터.
+    앞쪽 무음은 모두 잘라내고, 중간 무음은 발화가 붙지 않도록 조금 남깁니다.
+    앞에 둔 silencedetect 가 줄이기 전(원본) 시각의 무음 구간을 로그로 남기므로 TrimmedTimeline 으로 시각을 되돌릴 수 있습니다.
+    """
+    return (
+        f"silencedetect=noise={noise_db}dB:d={keep_silence},"
+        f"silenceremove=start_periods=1:start_threshold={noise_db}dB"
+        f":stop_periods=-1:stop_duration={max_silence}:stop_threshold={noise_db}dB"
+        f":stop_silence={keep_silence}"
+    )
+
+class TrimmedTimeline:
+    """
+    silence_filter 로 무음을 줄인 오디오의 시각을 원본 오디오 시각으로 되돌립니다.
+
+    silences 는 원본 기준 무음 구간입니다. 앞쪽 무음은 모두, 중간의 max_silence 초 이상 무음은
+    keep_silence 초만 남기고 잘렸다고 보고, 잘린 지점(줄인 오디오 기준)마다 누적으로 잘린 길이를 기록합니다.
+    """
+
+    def __init__(
+        self, silences: List[Tuple[float, float]], max_silence: float, keep_silence: float = KEEP_SILENCE_SECONDS
+    ):
+        self._positions: List[float] = []
+        self._removed: List[float] = []
+        removed = 0.0
+        for start, end in silences:
+            if start <= 0.0:
+                cut_at, cut = start, end - start
+            elif end - start >= max_silence:
+                cut_at, cut = start + keep_silence, end - start - keep_silence
+            else:
+                continue
+            if cut <= 0:
+                continue
+            removed += cut
+            self._positions.append(cut_at - (removed - cut))
+            self._removed.append(removed)
+
+    @property
+    def removed_seconds(self) -> float:
+        return self._removed[-1] if self._removed else 0.0
+
+    def to_original(self, seconds: float) -> float:
+        index = bisect.bisect_right(self._positions, seconds) - 1
+        return seconds + self._removed[index] if index >= 0 else seconds
+
+async def preprocess(
+    file_path: str,
+    out_base: str,
+    codec: str = "opus",
+    bitrate: str = "32k",
+    silence: str = "",
+) -> Tuple[str, List[Tuple[float, float]]]:
+    """
+    STT 에 보내기 전 오디오를 모노 16kHz 로 변환하고 (silence 필터가 있으면 긴 무음을 줄여) 압축합니다.
+    out_base 에 코덱별 확장자를 붙인 경로와, 필터가 기록한 원본 기준 무음 구간을 반환합니다.
+    ffmpeg 가 파일을 스트리밍으로 처리하므로 원본 크기와 관계없이 메모리 사용량이 일정합니다.
+    """
+    if codec not in PREPROCESS_CODECS:
+        raise ValueError(f"Unknown preprocess codec: {codec}")
+    ext, codec_args = PREPROCESS_CODECS[codec]
+    out_path = f"{out_base}.{ext}"
+    args = ["ffmpeg", "-hide_banner", "-nostats", "-y", "-i", file_path, "-vn", "-map_metadata", "-1"]
+    if silence:
+        args += ["-af", silence]
+    args += ["-ac", "1", "-ar", "16000", *codec_args]
+    if codec != "flac":
+        args += ["-b:a", bitrate]
+    _, stderr = await _run(*args, out_path)
+    return out_path, parse_silences(stderr) if silence else []
+
+async def extract_segment(file_path: str, start: float, end: float, out_path: str) -> str:
+    """[start, end) 구간을 모노 16kHz mp3 로 잘라 out_path 에 저장합니다."""
+    await _run(
+        "ffmpeg", "-hide_banner", "-nostats", "-y",
+        "-ss", f"{start:.3f}", "-t", f"{end - start:.3f}",
+        "-i", file_path,
+        "-vn", "-ac", "1", "-ar", "16000", "-b:a", "48k",
+        out_path,
+    )
+    return out_path
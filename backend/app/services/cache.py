@@ -0,0 +1,191 @@
+"""
+내용 주소 기반(content-addressed) 결과 캐시
+
+같은 녹음/같은 회의록이 다시 들어오면 STT·LLM 호출 없이 이전 결과를 돌려줍니다.
+백엔드는 CACHE_BACKEND 로 선택합니다: memory(프로세스 내 LRU), disk, redis, none.
+"""
+from app.core.config import settings
+from app.core.redis import get_redis
+from app.core import metrics
+from collections import OrderedDict
+from typing import Awaitable, Callable, Dict, Optional
+import asyncio
+import hashlib
+import json
+import os
+import time
+
+def sha256_text(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+def sha256_file(file_path: str, chunk_size: int = 1024 * 1024) -> str:
+    hasher = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            hasher.update(chunk)
+    return hasher.hexdigest()
+
+class CacheBackend:
+    async def get(self, key: str) -> Optional[str]:
+        raise NotImplementedError
+
+    async def set(self, key: str, value: str, ttl: int) -> None:
+        raise NotImplementedError
+
+class NullCache(CacheBackend):
+    async def get(self, key: str) -> Optional[str]:
+        return None
+
+    async def set(self, key: str, value: str, ttl: int) -> None:
+        pass
+
+class MemoryCache(CacheBackend):
+    """프로세스 내 LRU 캐시 (TTL + 최대 항목 수)"""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._data: "OrderedDict[str, tuple]" = OrderedDict()
+
+    async def get(self, key: str) -> Optional[str]:
+        item = self._data.get(key)
+        if item is None:
+            return None
+        expires_at, value = item
+        if expires_at < time.time():
+            del self._data[key]
+            return None
+        self._data.move_to_end(key)
+        return value
+
+    async def set(self, key: str, value: str, ttl: int) -> None:
+        self._data[key] = (time.time() + ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_entries:
+            self._data.popitem(last=False)
+
+class DiskCache(CacheBackend):
+    """
+    디렉토리 기반 캐시. 키마다 JSON 파일 하나를 쓰고,
+    항목 수가 max_entries 를 넘으면 가장 오래 접근하지 않은 파일부터 지웁니다.
+    """
+
+    def __init__(self, directory: str, max_entries: int):
+        self.directory = directory
+        self.max_entries = max_entries
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, sha256_text(key) + ".json")
+
+    def _get(self, key: str) -> Optional[str]:
+        path = self._path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                item = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+        if item["expires_at"] < time.time():
+            os.remove(path)
+            return None
+        os.utime(path)
+        return item["value"]
+
+    def _set(self, key: str, value: str, ttl: int) -> None:
+        path = self._path(key)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"expires_at": time.time() + ttl, "value": value}, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+        self._evict()
+
+    def _evict(self) -> None:
+        entries = [e for e in os.scandir(self.directory) if e.name.endswith(".json")]
+        overflow = len(entries) - self.max_entries
+        if overflow <= 0:
+            return
+        entries.sort(key=lambda e: e.stat().st_mtime)
+        for entry in entries[:overflow]:
+            try:
+                os.remove(entry.path)
+            except FileNotFoundError:
+                pass
+
+    async def get(self, key: str) -> Optional[str]:
+        return await asyncio.to_thread(self._get, key)
+
+    async def set(self, key: str, value: str, ttl: int) -> None:
+        await asyncio.to_thread(self._set, key, value, ttl)
+
+class RedisCache(CacheBackend):
+    """Redis 캐시. 크기 제한은 Redis 의 maxmemory 정책에 맡깁니다."""
+
+    def __init__(self, redis, prefix: str = "notesync:cache"):
+        self.redis = redis
+        self.prefix = prefix
+
+    async def get(self, key: str) -> Optional[str]:
+        value = await self.redis.get(f"{self.prefix}:{key}")
+        if value is None:
+            return None
+        return value.decode() if isinstance(value, bytes) else value
+
+    async def set(self, key: str, value: str, ttl: int) -> None:
+        await self.redis.set(f"{self.prefix}:{key}", value, ex=ttl)
+
+class ResultCache:
+    """네임스페이스별 hit/miss 카운터를 가진 캐시 래퍼"""
+
+    def __init__(self, backend: CacheBackend, ttl: int):
+        self.backend = backend
+        self.ttl = ttl
+        self.hits: Dict[str, int] = {}
+        self.misses: Dict[str, int] = {}
+
+    async def get(self, namespace: str, key: str) -> Optional[str]:
+        try:
+            value = await self.backend.get(f"{namespace}:{key}")
+        except Exception as e:
+            print(f"Cache get failed ({namespace}): {e}")
+            value = None
+        counter = self.misses if value is None else self.hits
+        counter[namespace] = counter.get(namespace, 0) + 1
+        metrics.record_cache(namespace, value is not None)
+        return value
+
+    async def set(self, namespace: str, key: str, value: str) -> None:
+        try:
+            await self.backend.set(f"{namespace}:{key}", value, self.ttl)
+        except Exception as e:
+            print(f"Cache set failed ({namespace}): {e}")
+
+    async def get_or_compute(self, namespace: str, key: str, compute: Callable[[], Awaitable[str]]) -> str:
+        cached = await self.get(namespace, key)
+        if cached is not None:
+            return cached
+        value = await compute()
+        await self.set(namespace, key, value)
+        return value
+
+    def stats(self) -> dict:
+        namespaces = set(self.hits) | set(self.misses)
+        return {
+            ns: {"hits": self.hits.get(ns, 0), "misses": self.misses.get(ns, 0)}
+            for ns in sorted(namespaces)
+        }
+
+def create_cache() -> ResultCache:
+    backend_name = settings.CACHE_BACKEND
+    if backend_name == "redis":
+        redis = get_redis()
+        if redis is None:
+            raise ValueError("CACHE_BACKEND=redis requires REDIS_URL to be set.")
+        backend = RedisCache(redis)
+    elif backend_name == "disk":
+        backend = DiskCache(settings.CACHE_DIR, settings.CACHE_MAX_ENTRIES)
+    elif backend_name == "none":
+        backend = NullCache()
+    else:
+        backend = MemoryCache(settings.CACHE_MAX_ENTRIES)
+    return ResultCache(backend, settings.CACHE_TTL_SECONDS)
+
+result_cache = create_cache()
@@ -0,0 +1,168 @@
+"""
+회의 진행 상황 이벤트 브로커
+
+파이프라인이 상태를 바꿀 때마다 이벤트를 발행하고, SSE 엔드포인트가 이를 구독해 클라이언트로 전달합니다.
+클라이언트가 DB 를 주기적으로 조회하지 않아도 진행 상황을 받을 수 있습니다.
+
+백엔드는 EVENTS_BACKEND 로 선택합니다:
+    - memory: 같은 프로세스 안에서만 전달 (임베디드 워커 사용 시)
+    - redis: Redis pub/sub 으로 여러 API/워커 프로세스 간에 전달
+"""
+from app.core.config import settings
+from app.core.redis import get_redis
+from collections import deque
+from typing import Deque, Dict, Optional, Set
+import asyncio
+import json
+
+# 구독자별로 쌓아둘 최대 이벤트 수 (연속된 이벤트는 합쳐서 한 칸을 차지)
+SUBSCRIBER_QUEUE_SIZE = 100
+
+class Subscription:
+    """
+    구독자 한 명의 이벤트 큐. 이벤트를 버리지 않고, 아직 보내지 못한 연속된 이벤트를 합칩니다:
+        - 상태 이벤트는 바뀐 필드만 담고 있으므로 하나로 합치면 마지막 상태가 됩니다.
+        - summary_delta 는 이어 붙이면 되므로 하나의 조각으로 합칩니다.
+    상태 변경과 요약 조각의 순서는 유지합니다. 그래도 SUBSCRIBER_QUEUE_SIZE 를 넘으면 (느린 클라이언트)
+    overflowed 로 표시하고 get() 이 None 을 반환하므로, 스트림을 닫고 클라이언트가 다시 연결해 현재 상태를 받게 합니다.
+    """
+
+    def __init__(self, maxsize: int = SUBSCRIBER_QUEUE_SIZE):
+        self.maxsize = maxsize
+        self.overflowed = False
+        self._events: Deque[dict] = deque()
+        self._wakeup = asyncio.Event()
+
+    def put(self, event: dict) -> None:
+        if self.overflowed:
+            return
+        last = self._events[-1] if self._events else None
+        is_delta = "summary_delta" in event
+        if last is not None and ("summary_delta" in last) == is_delta:
+            if is_delta:
+                last["summary_delta"] += event["summary_delta"]
+            else:
+                last.update(event)
+        elif len(self._events) >= self.maxsize:
+            self.overflowed = True
+            self._events.clear()
+        else:
+            # 합칠 때 원본(다른 구독자와 공유)을 바꾸지 않도록 복사
+            self._events.append(dict(event))
+        self._wakeup.set()
+
+    async def get(self) -> Optional[dict]:
+        """다음 이벤트를 기다려 반환합니다. 넘쳐서 이벤트를 이어서 줄 수 없으면 None 을 반환합니다."""
+        while not self._events and not self.overflowed:
+            self._wakeup.clear()
+            await self._wakeup.wait()
+        if self.overflowed:
+            return None
+        return self._events.popleft()
+
+class EventBroker:
+    """구독은 프로세스 내 큐(Subscription)로 처리하고, 발행 경로만 백엔드별로 다릅니다."""
+
+    def __init__(self):
+        self._subscribers: Dict[str, Set[Subscription]] = {}
+
+    async def publish(self, meeting_id: str, event: dict) -> None:
+        raise NotImplementedError
+
+    async def _start(self) -> None:
+        """첫 구독 시 호출됩니다."""
+
+    async def close(self) -> None:
+        pass
+
+    def _deliver(self, meeting_id: str, event: dict) -> None:
+        for queue in self._subscribers.get(meeting_id, ()):
+            queue.put(event)
+
+    async def subscribe(self, meeting_id: str) -> Subscription:
+        """이벤트를 받을 큐를 반환합니다. 다 쓰면 unsubscribe() 로 반드시 해제해야 합니다."""
+        await self._start()
+        queue = Subscription()
+        self._subscribers.setdefault(meeting_id, set()).add(queue)
+        return queue
+
+    def unsubscribe(self, meeting_id: str, queue: Subscription) -> None:
+        subscribers = self._subscribers.get(meeting_id)
+        if subscribers is not None:
+            subscribers.discard(queue)
+            if not subscribers:
+                del self._subscribers[meeting_id]
+
+class InMemoryEventBroker(EventBroker):
+    async def publish(self, meeting_id: str, event: dict) -> None:
+        self._deliver(meeting_id, event)
+
+class RedisEventBroker(EventBroker):
+    """
+    Redis pub/sub 기반 브로커.
+
+    회의별 채널(events:meeting:<id>)로 발행하고, 각 API 프로세스는 패턴 구독 연결 하나로
+    모든 채널을 받아 로컬 구독자에게 나눠줍니다. SSE 연결 수와 무관하게 프로세스당 Redis 연결은 하나입니다.
+    발행만 하는 워커 프로세스는 구독 연결을 열지 않습니다.
+    """
+
+    CHANNEL_PREFIX = "events:meeting:"
+
+    def __init__(self, redis):
+        super().__init__()
+        self.redis = redis
+        self._listener: Optional[asyncio.Task] = None
+        self._ready: Optional[asyncio.Event] = None
+
+    async def publish(self, meeting_id: str, event: dict) -> None:
+        await self.redis.publish(f"{self.CHANNEL_PREFIX}{meeting_id}", json.dumps(event))
+
+    async def _start(self) -> None:
+        if self._listener is None or self._listener.done():
+            self._ready = asyncio.Event()
+            self._listener = asyncio.create_task(self._listen())
+        try:
+            await asyncio.wait_for(self._ready.wait(), timeout=5)
+        except asyncio.TimeoutError:
+            # 연결이 복구되면 이후 이벤트부터 전달됨
+            print("Event listener is not connected yet. Subscribing anyway.")
+
+    async def _listen(self) -> None:
+        while True:
+            pubsub = self.redis.pubsub(ignore_subscribe_messages=True)
+            try:
+                await pubsub.psubscribe(f"{self.CHANNEL_PREFIX}*")
+                self._ready.set()
+                async for message in pubsub.listen():
+                    channel = message["channel"]
+                    if isinstance(channel, bytes):
+                        channel = channel.decode()
+                    meeting_id = channel[len(self.CHANNEL_PREFIX):]
+                    if meeting_id in self._subscribers:
+                        self._deliver(meeting_id, json.loads(message["data"]))
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"Event listener error: {e}. Reconnecting...")
+                await asyncio.sleep(1)
+            finally:
+                await pubsub.aclose()
+
+    async def close(self) -> None:
+        if self._listener is not None:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except asyncio.CancelledError:
+                pass
+            self._listener = None
+
+def create_event_broker() -> EventBroker:
+    if settings.EVENTS_BACKEND == "redis":
+        redis = get_redis()
+        if redis is None:
+            raise ValueError("EVENTS_BACKEND=redis requires REDIS_URL to be set.")
+        return RedisEventBroker(redis)
+    return InMemoryEventBroker()
+
+event_broker = create_event_broker()
@@ -0,0 +1,255 @@
+from app.core.config import settings
+from app.core.redis import get_redis
+from dataclasses import dataclass, field, asdict
+from typing import List, Optional, Sequence, Tuple
+import asyncio
+import heapq
+import itertools
+import json
+import time
+import uuid
+
+@dataclass
+class Job:
+    """큐에 저장되는 작업 단위"""
+    kind: str
+    meeting_id: str
+    attempt: int = 0
+    id: str = field(default_factory=lambda: uuid.uuid4().hex)
+
+    def to_json(self) -> str:
+        return json.dumps(asdict(self))
+
+    @classmethod
+    def from_json(cls, raw) -> "Job":
+        if isinstance(raw, bytes):
+            raw = raw.decode()
+        return cls(**json.loads(raw))
+
+class JobQueue:
+    """작업 큐 인터페이스"""
+
+    async def enqueue(self, job: Job, delay: float = 0.0) -> None:
+        raise NotImplementedError
+
+    async def enqueue_many(self, jobs: Sequence[Tuple[Job, float]]) -> None:
+        """(작업, 지연) 목록을 한 번에 등록합니다."""
+        for job, delay in jobs:
+            await self.enqueue(job, delay)
+
+    async def dequeue(self, timeout: float = 1.0) -> Optional[Job]:
+        raise NotImplementedError
+
+    async def ack(self, job: Job) -> None:
+        raise NotImplementedError
+
+    async def touch(self, job: Job) -> None:
+        """처리 중인 작업의 가시성 제한 시간을 연장합니다 (작업 실행 중 주기적으로 호출)."""
+
+    async def requeue_expired(self) -> int:
+        """꺼낸 뒤 제한 시간 안에 ack/touch 되지 않은 작업을 다시 실행 대기로 돌리고 그 수를 반환합니다."""
+        return 0
+
+    async def depth(self) -> int:
+        raise NotImplementedError
+
+class InMemoryJobQueue(JobQueue):
+    """
+    단일 프로세스용 큐 (테스트 및 로컬 개발용).
+    프로세스가 재시작되면 큐에 있던 작업이 모두 유실됩니다.
+    DB 에는 PENDING 으로 남으므로, 워커의 stale sweep 이 STALE_PENDING_SECONDS 넘게 대기 중인 회의를 다시 등록합니다.
+    """
+
+    def __init__(self):
+        self._heap = []
+        self._counter = itertools.count()
+        self._cond = asyncio.Condition()
+
+    async def enqueue(self, job: Job, delay: float = 0.0) -> None:
+        async with self._cond:
+            heapq.heappush(self._heap, (time.monotonic() + delay, next(self._counter), job))
+            self._cond.notify()
+
+    async def dequeue(self, timeout: float = 1.0) -> Optional[Job]:
+        deadline = time.monotonic() + timeout
+        async with self._cond:
+            while True:
+                now = time.monotonic()
+                if self._heap and self._heap[0][0] <= now:
+                    return heapq.heappop(self._heap)[2]
+                if now >= deadline:
+                    return None
+                wait = deadline - now
+                if self._heap:
+                    wait = min(wait, self._heap[0][0] - now)
+                try:
+                    await asyncio.wait_for(self._cond.wait(), timeout=wait)
+                except asyncio.TimeoutError:
+                    pass
+
+    async def ack(self, job: Job) -> None:
+        pass
+
+    async def depth(self) -> int:
+        return len(self._heap)
+
+# 예약 시간이 지난 지연 작업을 ready 리스트로 원자적으로 옮기는 스크립트
+_PROMOTE_SCRIPT = """
+local due = redis.call('ZRANGEBYSCORE', KEYS[1], '-inf', ARGV[1], 'LIMIT', 0, 100)
+for _, raw in ipairs(due) do
+    redis.call('ZREM', KEYS[1], raw)
+    redis.call('LPUSH', KEYS[2], raw)
+end
+return #due
+"""
+
+# 처리 중 목록에서 가시성 제한 시간이 지난 작업을 ready 리스트 앞(다음 실행 위치)으로 되돌리는 스크립트.
+# BLMOVE 직후 임대 기록 전에 워커가 죽은 작업은 처음 발견한 시점부터 제한 시간을 잽니다.
+_REQUEUE_EXPIRED_SCRIPT = """
+local requeued = 0
+for _, raw in ipairs(redis.call('LRANGE', KEYS[1], 0, -1)) do
+    local deadline = redis.call('ZSCORE', KEYS[2], raw)
+    if not deadline then
+        redis.call('ZADD', KEYS[2], ARGV[1] + ARGV[2], raw)
+    elseif tonumber(deadline) < tonumber(ARGV[1]) then
+        redis.call('LREM', KEYS[1], 1, raw)
+        redis.call('ZREM', KEYS[2], raw)
+        redis.call('HDEL', KEYS[4], raw)
+        redis.call('RPUSH', KEYS[3], raw)
+        requeued = requeued + 1
+    end
+end
+return requeued
+"""
+
+# 아직 이 워커가 임대를 가진 경우에만 처리 중 목록과 임대를 지우는 스크립트.
+# 제한 시간이 지나 회수된 뒤 다른 워커가 다시 꺼낸 작업을 늦게 끝난 원래 워커가 지우지 않도록 토큰을 비교
+_ACK_SCRIPT = """
+if redis.call('HGET', KEYS[3], ARGV[1]) ~= ARGV[2] then
+    return 0
+end
+redis.call('LREM', KEYS[1], 1, ARGV[1])
+redis.call('ZREM', KEYS[2], ARGV[1])
+redis.call('HDEL', KEYS[3], ARGV[1])
+return 1
+"""
+
+# 이 워커가 임대를 가진 경우에만 가시성 제한 시각을 연장하는 스크립트
+_TOUCH_SCRIPT = """
+if redis.call('HGET', KEYS[2], ARGV[1]) ~= ARGV[2] then
+    return 0
+end
+return redis.call('ZADD', KEYS[1], 'XX', 'CH', ARGV[3], ARGV[1])
+"""
+
+class RedisJobQueue(JobQueue):
+    """
+    Redis 기반 영속 큐. 여러 워커 프로세스/머신이 같은 큐를 소비할 수 있습니다.
+
+    - ready: 즉시 실행 가능한 작업 리스트
+    - delayed: 재시도 백오프 중인 작업 (score = 실행 가능 시각)
+    - processing: 처리 중인 작업 (ack 시 제거)
+    - leases: 처리 중인 작업의 가시성 제한 시각 (score). 워커가 실행 중에 touch 로 연장하며,
+      워커가 죽어 연장되지 않은 작업은 requeue_expired 가 ready 로 되돌립니다.
+    - owners: 처리 중인 작업 → 꺼낼 때마다 새로 만드는 임대 토큰. ack/touch 는 토큰이 같을 때만 적용되므로
+      회수되어 다른 워커가 다시 꺼낸 작업을 원래 워커가 지우거나 연장하지 못합니다.
+    """
+
+    def __init__(self, redis, prefix: str = "notesync:jobs", visibility_timeout: float = None):
+        self.redis = redis
+        self.ready_key = f"{prefix}:ready"
+        self.delayed_key = f"{prefix}:delayed"
+        self.processing_key = f"{prefix}:processing"
+        self.leases_key = f"{prefix}:leases"
+        self.owners_key = f"{prefix}:owners"
+        self.visibility_timeout = visibility_timeout or settings.JOB_VISIBILITY_TIMEOUT_SECONDS
+        self._promote = redis.register_script(_PROMOTE_SCRIPT)
+        self._requeue_expired = redis.register_script(_REQUEUE_EXPIRED_SCRIPT)
+        self._ack = redis.register_script(_ACK_SCRIPT)
+        self._touch = redis.register_script(_TOUCH_SCRIPT)
+        # job.id → (원본 payload, 임대 토큰)
+        self._leases = {}
+
+    async def enqueue(self, job: Job, delay: float = 0.0) -> None:
+        if delay > 0:
+            await self.redis.zadd(self.delayed_key, {job.to_json(): time.time() + delay})
+        else:
+            await self.redis.lpush(self.ready_key, job.to_json())
+
+    async def enqueue_many(self, jobs: Sequence[Tuple[Job, float]]) -> None:
+        # 일괄 업로드의 작업 수백 개를 왕복 한 번에 등록
+        now = time.time()
+        pipe = self.redis.pipeline(transaction=False)
+        for job, delay in jobs:
+            if delay > 0:
+                pipe.zadd(self.delayed_key, {job.to_json(): now + delay})
+            else:
+                pipe.lpush(self.ready_key, job.to_json())
+        await pipe.execute()
+
+    async def dequeue(self, timeout: float = 1.0) -> Optional[Job]:
+        await self._promote(keys=[self.delayed_key, self.ready_key], args=[time.time()])
+        raw = await self.redis.blmove(self.ready_key, self.processing_key, timeout, "RIGHT", "LEFT")
+        if raw is None:
+            return None
+        job = Job.from_json(raw)
+        token = uuid.uuid4().hex
+        self._leases[job.id] = (raw, token)
+        pipe = self.redis.pipeline(transaction=True)
+        pipe.hset(self.owners_key, raw, token)
+        pipe.zadd(self.leases_key, {raw: time.time() + self.visibility_timeout})
+        await pipe.execute()
+        return job
+
+    async def ack(self, job: Job) -> None:
+        lease = self._leases.pop(job.id, None)
+        if lease is not None:
+            await self._ack(keys=[self.processing_key, self.leases_key, self.owners_key], args=list(lease))
+
+    async def touch(self, job: Job) -> None:
+        lease = self._leases.get(job.id)
+        if lease is not None:
+            # 이미 회수된 작업의 임대를 되살리지 않도록 기존 항목만 갱신 (XX)
+            await self._touch(
+                keys=[self.leases_key, self.owners_key],
+                args=[*lease, time.time() + self.visibility_timeout],
+            )
+
+    async def requeue_expired(self) -> int:
+        return await self._requeue_expired(
+            keys=[self.processing_key, self.leases_key, self.ready_key, self.owners_key],
+            args=[time.time(), self.visibility_timeout],
+        )
+
+    async def depth(self) -> int:
+        return await self.redis.llen(self.ready_key) + await self.redis.zcard(self.delayed_key)
+
+async def enqueue_pipeline(meeting_id: uuid.UUID, queue: Optional[JobQueue] = None) -> None:
+    await (queue or job_queue).enqueue(Job(kind="pipeline", meeting_id=str(meeting_id)))
+
+async def enqueue_publish(meeting_id: uuid.UUID, queue: Optional[JobQueue] = None) -> None:
+    await (queue or job_queue).enqueue(Job(kind="publish", meeting_id=str(meeting_id)))
+
+async def enqueue_pipelines(
+    meeting_ids: Sequence[uuid.UUID], rate: float, queue: Optional[JobQueue] = None
+) -> List[float]:
+    """
+    여러 회의의 파이프라인을 초당 rate 건씩 시작되도록 지연을 두고 등록합니다.
+    한꺼번에 수백 건이 풀려 워커와 외부 API 제한을 독점하지 않게, 단건 업로드가 사이사이 끼어들 수 있습니다.
+    rate 가 0 이면 모두 즉시 실행 가능 상태로 등록합니다. 각 회의의 지연(초)을 반환합니다.
+    """
+    delays = [index / rate if rate > 0 else 0.0 for index in range(len(meeting_ids))]
+    await (queue or job_queue).enqueue_many(
+        [(Job(kind="pipeline", meeting_id=str(meeting_id)), delay) for meeting_id, delay in zip(meeting_ids, delays)]
+    )
+    return delays
+
+def create_job_queue() -> JobQueue:
+    if settings.QUEUE_BACKEND == "redis":
+        redis = get_redis()
+        if redis is None:
+            raise ValueError("QUEUE_BACKEND=redis requires REDIS_URL to be set.")
+        return RedisJobQueue(redis)
+    return InMemoryJobQueue()
+
+job_queue = create_job_queue()
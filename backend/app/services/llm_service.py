@@ -1,17 +1,111 @@
-from google import genai
 from app.core.config import settings
+from app.core import metrics
+from app.core.http import create_http_client
+from app.core.rate_limit import create_limiter
 from app.mcp.notion_mcp_client import notion_mcp_client
-from typing import Optional, Tuple
-import json
+from app.services.cache import result_cache, sha256_text
+from app.services.text_chunker import chunk_text, estimate_tokens
+from typing import Awaitable, Callable, List, Optional
+import asyncio
+import time
+
+# 프롬프트 내용을 바꾸면 이 값을 올려 이전 프롬프트로 만든 캐시가 재사용되지 않도록 합니다.
+PROMPT_VERSION = "2"
+
+# 스트리밍 중 새로 받은 텍스트 조각을 전달받는 콜백
+DeltaCallback = Callable[[str], Awaitable[None]]
+
+# map/reduce 호출까지 포함해 모든 요약 요청이 공유하는 Gemini 요청 제한
+gemini_limiter = create_limiter(
+    "gemini",
+    settings.GEMINI_MAX_CONCURRENCY,
+    settings.GEMINI_RATE_LIMIT_PER_SECOND,
+    settings.GEMINI_RATE_LIMIT_BURST,
+    settings.GEMINI_MAX_RETRIES,
+)
 
 class LLMService:
     def __init__(self):
-        if settings.GEMINI_API_KEY:
-            # Initialize the client from google-genai SDK
-            self.client = genai.Client(api_key=settings.GEMINI_API_KEY)
-        else:
+        if not settings.GEMINI_API_KEY:
             print("Warning: GEMINI_API_KEY is not set.")
-            self.client = None
+        self._client = None
+        self.limiter = gemini_limiter
+
+    @property
+    def client(self):
+        """
+        처음 사용할 때 google-genai 를 import 해 클라이언트를 만듭니다. API 키가 없으면 None 입니다.
+        SDK import 가 무거우므로 요약을 만들지 않는 프로세스(조회 전용 API)는 이 비용을 내지 않습니다.
+        """
+        if self._client is None and settings.GEMINI_API_KEY:
+            from google import genai
+            from google.genai import types
+            http_options = types.HttpOptions(
+                base_url=settings.GEMINI_BASE_URL,
+                # HttpOptions.timeout 은 밀리초 단위
+                timeout=int(settings.GEMINI_TIMEOUT_SECONDS * 1000),
+                httpx_async_client=create_http_client(
+                    "gemini", settings.GEMINI_TIMEOUT_SECONDS, settings.GEMINI_MAX_CONCURRENCY
+                ),
+            )
+            self._client = genai.Client(api_key=settings.GEMINI_API_KEY, http_options=http_options)
+        return self._client
+
+    def _cache_key(self, prompt: str) -> str:
+        """
+        모델명 + 프롬프트 버전 + 프롬프트 해시로 캐시 키를 만듭니다.
+        회의록 외의 입력(회의 제목 등)이 들어가는 프롬프트는 원본 회의록으로 완성한 프롬프트를 넘겨야
+        같은 회의록을 다른 제목으로 올렸을 때 이전 제목으로 만든 요약을 재사용하지 않습니다.
+        """
+        return f"{settings.GEMINI_MODEL}:{PROMPT_VERSION}:{sha256_text(prompt)}"
+
+    async def _generate(self, prompt: str, on_delta: Optional[DeltaCallback] = None) -> str:
+        if on_delta is not None and settings.SUMMARY_STREAMING:
+            return await self._generate_stream(prompt, on_delta)
+        response = await self.limiter.call(
+            lambda: self.client.aio.models.generate_content(
+                model=settings.GEMINI_MODEL,
+                contents=prompt
+            ),
+            "generate_content",
+        )
+        self._record_usage(response)
+        text = response.text if hasattr(response, 'text') else ""
+        if not text:
+            raise ValueError("Gemini returned an empty response")
+        return text
+
+    async def _generate_stream(self, prompt: str, on_delta: DeltaCallback) -> str:
+        """응답을 스트리밍으로 받으면서 조각이 올 때마다 on_delta 를 호출하고, 전체 텍스트를 반환합니다."""
+        parts: List[str] = []
+
+        async def request():
+            last_chunk = None
+            stream = await self.client.aio.models.generate_content_stream(
+                model=settings.GEMINI_MODEL,
+                contents=prompt
+            )
+            async for chunk in stream:
+                last_chunk = chunk
+                delta = chunk.text
+                if delta:
+                    parts.append(delta)
+                    await on_delta(delta)
+            return last_chunk
+
+        # 조각을 이미 내보낸 뒤 끊기면 다시 요청할 때 내용이 중복되므로 재시도하지 않음
+        last_chunk = await self.limiter.call(request, "generate_content_stream", retry_if=lambda e: not parts)
+        # 스트리밍 응답은 마지막 조각에 전체 토큰 사용량이 담김
+        self._record_usage(last_chunk)
+        text = "".join(parts)
+        if not text:
+            raise ValueError("Gemini returned an empty response")
+        return text
+
+    def _record_usage(self, response) -> None:
+        usage = getattr(response, "usage_metadata", None)
+        if usage is not None:
+            metrics.record_llm_usage(usage.prompt_token_count, usage.candidates_token_count)
 
     def _get_notion_tools(self) -> list:
         """Gemini Function Calling을 위한 Notion 도구 정의"""
@@ -60,17 +154,8 @@ class LLMService:
         
         return f"Unknown function: {function_name}"
 
-    async def summarize_and_save_to_notion(self, transcript: str, meeting_title: str) -> Tuple[str, Optional[str]]:
-        """
-        회의록을 요약하고 자동으로 Notion에 저장합니다.
-        
-        Returns:
-            (summary_text, notion_url) 튜플
-        """
-        if not self.client:
-            return ("Error: Gemini API Key not configured.", None)
-
-        prompt = f"""
+    def _notion_summary_prompt(self, transcript: str, meeting_title: str) -> str:
+        return f"""
         You are a professional meeting secretary. 
         Analyze the following meeting transcript and extract the key information.
         
@@ -109,45 +194,9 @@ class LLMService:
         6. Use Korean language for all content
         7. Do not add extra blank lines or formatting
         """
-        
-        try:
-            # Gemini로 요약 생성
-            response = await self.client.aio.models.generate_content(
-                model='gemini-2.5-flash',
-                contents=prompt
-            )
-            
-            summary_text = response.text if hasattr(response, 'text') else ""
-            
-            # 요약 생성 후 자동으로 Notion에 저장
-            notion_url = None
-            if summary_text:
-                print(f"Summary generated. Now creating Notion page...")
-                try:
-                    notion_url = await notion_mcp_client.create_meeting_page(meeting_title, summary_text)
-                    if notion_url:
-                        print(f"Successfully created Notion page: {notion_url}")
-                    else:
-                        print("Warning: Failed to create Notion page. Check logs and configuration.")
-                except Exception as e:
-                    print(f"Error creating Notion page: {e}")
-                    import traceback
-                    traceback.print_exc()
-            
-            return (summary_text, notion_url)
-            
-        except Exception as e:
-            print(f"Error calling Gemini: {e}")
-            import traceback
-            traceback.print_exc()
-            return (f"Error generating summary: {e}", None)
 
-    async def summarize(self, transcript: str) -> str:
-        """기존 호환성을 위한 메서드 (Function Calling 없이)"""
-        if not self.client:
-            return "Error: Gemini API Key not configured."
-
-        prompt = f"""
+    def _plain_summary_prompt(self, transcript: str) -> str:
+        return f"""
         You are a professional meeting secretary. 
         Analyze the following meeting transcript and extract the key information.
         
@@ -168,13 +217,114 @@ class LLMService:
         ## 액션 아이템
         - [ ] (담당자) : (할 일)
         """
+
+    def _map_prompt(self, chunk: str, index: int, total: int) -> str:
+        return f"""
+        You are a professional meeting secretary.
+        The following is part {index + 1} of {total} of a long meeting transcript.
+        Extract concise notes in Korean for this part only, using these headings:
+
+        ### 논의 사항
+        - (논의된 주제)
+
+        ### 결정 사항
+        - (합의된 결정)
+
+        ### 액션 아이템
+        - (담당자) : (할 일)
+
+        Omit a heading if there is nothing for it. Do not invent information.
+
+        Transcript part:
+        {chunk}
+        """
+
+    def _reduce_prompt(self, notes: List[str]) -> str:
+        joined = "\n\n".join(notes)
+        return f"""
+        You are a professional meeting secretary.
+        Merge the following partial meeting notes (in chronological order) into a single set of notes
+        in Korean, using the same headings (### 논의 사항 / ### 결정 사항 / ### 액션 아이템).
+        Remove duplicates but keep every distinct decision and action item with its owner.
+
+        Notes:
+        {joined}
+        """
+
+    async def _condense_transcript(self, transcript: str) -> str:
+        """
+        모델 컨텍스트에 비해 긴 회의록을 map-reduce 방식으로 압축합니다.
+
+        1. 토큰 수 기준으로 회의록을 나누고 (SUMMARY_CHUNK_TOKENS)
+        2. 구간별 메모를 동시에 생성한 뒤 (SUMMARY_MAP_CONCURRENCY)
+        3. 메모가 여전히 길면 SUMMARY_REDUCE_FANIN 개씩 묶어 병합합니다 (최대 SUMMARY_MAX_REDUCE_DEPTH 단계).
+
+        반환된 메모가 최종 요약 프롬프트의 회의록 자리에 들어갑니다.
+        """
+        started = time.perf_counter()
+        chunks = chunk_text(transcript, settings.SUMMARY_CHUNK_TOKENS)
+        semaphore = asyncio.Semaphore(settings.SUMMARY_MAP_CONCURRENCY)
+
+        async def generate(prompt: str) -> str:
+            async with semaphore:
+                return await self._generate(prompt)
+
+        notes = list(await asyncio.gather(
+            *(generate(self._map_prompt(chunk, i, len(chunks))) for i, chunk in enumerate(chunks))
+        ))
+        map_seconds = time.perf_counter() - started
+
+        fanin = max(settings.SUMMARY_REDUCE_FANIN, 2)
+        depth = 0
+        while (
+            len(notes) > 1
+            and depth < settings.SUMMARY_MAX_REDUCE_DEPTH
+            and estimate_tokens("\n\n".join(notes)) > settings.SUMMARY_CHUNK_TOKENS
+        ):
+            groups = [notes[i:i + fanin] for i in range(0, len(notes), fanin)]
+            notes = list(await asyncio.gather(*(generate(self._reduce_prompt(group)) for group in groups)))
+            depth += 1
+
+        print(
+            f"Map-reduce condensed {estimate_tokens(transcript)} tokens into {len(chunks)} chunks "
+            f"-> {estimate_tokens(chr(10).join(notes))} tokens of notes "
+            f"(map {map_seconds:.1f}s, {depth} reduce levels, total {time.perf_counter() - started:.1f}s)"
+        )
+        return "(긴 회의록을 구간별로 정리한 메모입니다)\n\n" + "\n\n".join(notes)
+
+    async def _summarize(self, transcript: str, build_prompt, on_delta: Optional[DeltaCallback] = None) -> str:
+        if settings.SUMMARY_MAP_REDUCE and estimate_tokens(transcript) > settings.SUMMARY_CHUNK_TOKENS:
+            transcript = await self._condense_transcript(transcript)
+        # 중간 메모(map/reduce)는 사용자에게 보여줄 결과가 아니므로 최종 요약만 스트리밍
+        return await self._generate(build_prompt(transcript), on_delta)
+
+    async def generate_summary(
+        self, transcript: str, meeting_title: str, on_delta: Optional[DeltaCallback] = None
+    ) -> str:
+        """
+        Notion 형식의 회의 요약만 생성합니다 (Notion 저장은 파이프라인의 publish 단계에서 수행).
+        on_delta 를 넘기면 요약을 스트리밍으로 받아 조각마다 호출합니다 (캐시에 있으면 호출되지 않음).
+        실패 시 예외를 그대로 던져 호출자가 재시도할 수 있도록 합니다.
+        """
+        if not self.client:
+            raise ValueError("Gemini API Key is not configured.")
+        build_prompt = lambda text: self._notion_summary_prompt(text, meeting_title)
+        return await result_cache.get_or_compute(
+            "summary", self._cache_key(build_prompt(transcript)),
+            lambda: self._summarize(transcript, build_prompt, on_delta)
+        )
+
+    async def summarize(self, transcript: str) -> str:
+        """기존 호환성을 위한 메서드 (Function Calling 없이)"""
+        if not self.client:
+            return "Error: Gemini API Key not configured."
+
         
         try:
-            response = await self.client.aio.models.generate_content(
-                model='gemini-2.5-flash',
-                contents=prompt
+            return await result_cache.get_or_compute(
+                "summary_plain", self._cache_key(self._plain_summary_prompt(transcript)),
+                lambda: self._summarize(transcript, self._plain_summary_prompt)
             )
-            return response.text
         except Exception as e:
             print(f"Error calling Gemini: {e}")
             return f"Error generating summary: {e}"
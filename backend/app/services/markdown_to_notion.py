@@ -0,0 +1,261 @@
+"""
+Markdown → Notion 블록 컴파일러
+
+요약 마크다운을 한 번의 순회로 Notion 블록 목록으로 변환합니다.
+
+지원 문법:
+    - 헤더 (#, ##, ###)
+    - 글머리 목록 (-, *, +) 과 들여쓰기로 중첩된 목록
+    - 번호 목록 (1. 2. ...)
+    - 체크박스 (- [ ], - [x])
+    - 인용 (>), 구분선 (---), 코드 블록 (```)
+    - 인라인 **굵게**, *기울임*, ~~취소선~~, `코드`, [링크](url)
+
+Notion 의 텍스트 길이 제한(2000자)을 넘는 내용은 자르지 않고 여러 rich_text 항목으로 나눕니다.
+"""
+from typing import Dict, Iterator, List, Optional, Tuple
+import re
+
+MAX_TEXT_LENGTH = 2000
+MAX_RICH_TEXT_ITEMS = 100
+# Notion API 는 한 요청에서 최대 2단계까지 중첩된 children 을 허용
+MAX_NESTING_DEPTH = 2
+
+# 부정 문자 클래스만 사용해 닫히지 않은 마커가 있어도 역추적이 선형으로 유지되도록 함
+_INLINE = re.compile(
+    r"\*\*(?P<bold>[^*]+)\*\*"
+    r"|~~(?P<strike>[^~]+)~~"
+    r"|`(?P<code>[^`]+)`"
+    r"|\[(?P<link_text>[^\]]+)\]\((?P<link_url>[^)\s]+)\)"
+    r"|\*(?P<italic>[^*\s][^*]*)\*"
+)
+_NUMBERED = re.compile(r"^\d+[.)]\s+")
+_BULLET_MARKERS = ("- ", "* ", "+ ")
+_TODO_MARKERS = {"[ ] ": False, "[x] ": True, "[X] ": True}
+# Notion 코드 블록이 받는 언어 목록. 이 밖의 값을 보내면 요청 전체가 400 validation_error 로 거부됨
+_NOTION_LANGUAGES = frozenset({
+    "abap", "abc", "agda", "arduino", "ascii art", "assembly", "bash", "basic", "bnf", "c", "c#", "c++",
+    "clojure", "coffeescript", "coq", "css", "dart", "dhall", "diff", "docker", "ebnf", "elixir", "elm",
+    "erlang", "f#", "flow", "fortran", "gherkin", "glsl", "go", "graphql", "groovy", "haskell", "hcl", "html",
+    "idris", "java", "javascript", "json", "julia", "kotlin", "latex", "less", "lisp", "livescript", "llvm ir",
+    "lua", "makefile", "markdown", "markup", "matlab", "mathematica", "mermaid", "nix", "notion formula",
+    "objective-c", "ocaml", "pascal", "perl", "php", "plain text", "powershell", "prolog", "protobuf",
+    "purescript", "python", "r", "racket", "reason", "ruby", "rust", "sass", "scala", "scheme", "scss",
+    "shell", "smalltalk", "solidity", "sql", "swift", "toml", "typescript", "vb.net", "verilog", "vhdl",
+    "visual basic", "webassembly", "xml", "yaml", "java/c/c++/c#",
+})
+# 코드 펜스에 흔히 쓰는 이름 → Notion 언어
+_LANGUAGE_ALIASES = {
+    "py": "python", "python3": "python", "py3": "python",
+    "js": "javascript", "jsx": "javascript", "mjs": "javascript", "cjs": "javascript", "node": "javascript",
+    "ts": "typescript", "tsx": "typescript",
+    "sh": "shell", "zsh": "shell", "console": "shell", "shell-session": "shell", "shellsession": "shell",
+    "ps1": "powershell", "pwsh": "powershell",
+    "yml": "yaml", "md": "markdown", "jsonc": "json", "json5": "json",
+    "rb": "ruby", "rs": "rust", "kt": "kotlin", "kts": "kotlin", "golang": "go",
+    "cs": "c#", "csharp": "c#", "cpp": "c++", "cxx": "c++", "cc": "c++", "hpp": "c++", "h": "c",
+    "objc": "objective-c", "objectivec": "objective-c", "fs": "f#", "fsharp": "f#", "vb": "visual basic",
+    "dockerfile": "docker", "make": "makefile", "mk": "makefile", "tf": "hcl", "terraform": "hcl",
+    "proto": "protobuf", "tex": "latex", "htm": "html", "svg": "xml", "gql": "graphql",
+    "ex": "elixir", "exs": "elixir", "erl": "erlang", "hs": "haskell", "ml": "ocaml", "clj": "clojure",
+    "pl": "perl", "asm": "assembly", "wasm": "webassembly", "patch": "diff", "postgresql": "sql",
+    "txt": "plain text", "text": "plain text", "plaintext": "plain text",
+}
+
+def notion_language(info: str) -> str:
+    """
+    코드 펜스의 정보 문자열 (```tsx title="a.tsx" 의 tsx title="a.tsx") 을 Notion 언어로 바꿉니다.
+    알 수 없는 언어는 "plain text" 로 보냅니다.
+    """
+    name = info.split()[0].lower() if info.strip() else ""
+    name = _LANGUAGE_ALIASES.get(name, name)
+    return name if name in _NOTION_LANGUAGES else "plain text"
+
+def _text_items(content: str, annotations: Optional[Dict[str, bool]] = None, url: Optional[str] = None) -> Iterator[dict]:
+    for i in range(0, len(content), MAX_TEXT_LENGTH):
+        text = {"content": content[i:i + MAX_TEXT_LENGTH]}
+        if url:
+            text["link"] = {"url": url}
+        item = {"type": "text", "text": text}
+        if annotations:
+            item["annotations"] = annotations
+        yield item
+
+def parse_inline(text: str) -> List[dict]:
+    """인라인 마크다운을 Notion rich_text 항목 목록으로 변환합니다."""
+    items: List[dict] = []
+    pos = 0
+    for match in _INLINE.finditer(text):
+        if match.start() > pos:
+            items.extend(_text_items(text[pos:match.start()]))
+        if match.group("bold") is not None:
+            items.extend(_text_items(match.group("bold"), {"bold": True}))
+        elif match.group("strike") is not None:
+            items.extend(_text_items(match.group("strike"), {"strikethrough": True}))
+        elif match.group("code") is not None:
+            items.extend(_text_items(match.group("code"), {"code": True}))
+        elif match.group("link_text") is not None:
+            items.extend(_text_items(match.group("link_text"), url=match.group("link_url")))
+        else:
+            items.extend(_text_items(match.group("italic"), {"italic": True}))
+        pos = match.end()
+    if pos < len(text):
+        items.extend(_text_items(text[pos:]))
+    return items
+
+def _blocks(block_type: str, rich_text: List[dict], **extra) -> List[dict]:
+    """rich_text 항목이 100개를 넘으면 같은 종류의 블록 여러 개로 나눕니다."""
+    if not rich_text:
+        rich_text = [{"type": "text", "text": {"content": ""}}]
+    blocks = []
+    for i in range(0, len(rich_text), MAX_RICH_TEXT_ITEMS):
+        body = {"rich_text": rich_text[i:i + MAX_RICH_TEXT_ITEMS], **extra}
+        blocks.append({"object": "block", "type": block_type, block_type: body})
+    return blocks
+
+def _indent_width(line: str) -> int:
+    width = 0
+    for ch in line:
+        if ch == " ":
+            width += 1
+        elif ch == "\t":
+            width += 4
+        else:
+            break
+    return width
+
+def _parse_list_item(stripped: str) -> Optional[Tuple[str, str, dict]]:
+    """목록 항목이면 (블록 종류, 본문, 추가 속성) 을 반환합니다."""
+    for marker in _BULLET_MARKERS:
+        if stripped.startswith(marker):
+            body = stripped[len(marker):]
+            for todo, checked in _TODO_MARKERS.items():
+                if body.startswith(todo) or body == todo.rstrip():
+                    return ("to_do", body[len(todo):].strip(), {"checked": checked})
+            return ("bulleted_list_item", body.strip(), {})
+    match = _NUMBERED.match(stripped)
+    if match:
+        return ("numbered_list_item", stripped[match.end():].strip(), {})
+    return None
+
+class _Compiler:
+    def __init__(self):
+        self.blocks: List[dict] = []
+        self.paragraph: List[str] = []
+        # (들여쓰기, 중첩 깊이, 블록) 스택
+        self.list_stack: List[Tuple[int, int, dict]] = []
+        self.code_lines: Optional[List[str]] = None
+        self.code_language = ""
+
+    def flush_paragraph(self) -> None:
+        if self.paragraph:
+            text = " ".join(self.paragraph).strip()
+            self.paragraph = []
+            if text:
+                self.blocks.extend(_blocks("paragraph", parse_inline(text)))
+
+    def flush(self) -> None:
+        self.flush_paragraph()
+        self.list_stack = []
+
+    def add_list_item(self, indent: int, block_type: str, body: str, extra: dict) -> None:
+        self.flush_paragraph()
+        while self.list_stack and self.list_stack[-1][0] >= indent:
+            self.list_stack.pop()
+        new_blocks = _blocks(block_type, parse_inline(body), **extra)
+
+        if self.list_stack and self.list_stack[-1][1] < MAX_NESTING_DEPTH:
+            parent_depth = self.list_stack[-1][1]
+            parent = self.list_stack[-1][2]
+            parent[parent["type"]].setdefault("children", []).extend(new_blocks)
+            depth = parent_depth + 1
+        elif self.list_stack:
+            # 최대 깊이를 넘는 항목은 가장 깊은 단계의 형제로 붙임
+            grandparent_children = self._siblings_of(self.list_stack[-1])
+            grandparent_children.extend(new_blocks)
+            depth = self.list_stack[-1][1]
+        else:
+            self.blocks.extend(new_blocks)
+            depth = 0
+        self.list_stack.append((indent, depth, new_blocks[-1]))
+
+    def _siblings_of(self, entry: Tuple[int, int, dict]) -> List[dict]:
+        _, depth, block = entry
+        for candidate in reversed(self.list_stack):
+            if candidate[1] == depth - 1:
+                parent = candidate[2]
+                return parent[parent["type"]]["children"]
+        return self.blocks
+
+    def feed(self, line: str) -> None:
+        stripped = line.strip()
+
+        # 코드 블록 내부
+        if self.code_lines is not None:
+            if stripped.startswith("```"):
+                code = "\n".join(self.code_lines)
+                language = notion_language(self.code_language)
+                self.blocks.extend(_blocks("code", list(_text_items(code)), language=language))
+                self.code_lines = None
+            else:
+                self.code_lines.append(line)
+            return
+
+        if not stripped:
+            self.flush()
+            return
+
+        if stripped.startswith("```"):
+            self.flush()
+            self.code_lines = []
+            self.code_language = stripped[3:]
+            return
+
+        for prefix, heading_type in (("# ", "heading_1"), ("## ", "heading_2"), ("### ", "heading_3")):
+            if stripped.startswith(prefix):
+                self.flush()
+                self.blocks.extend(_blocks(heading_type, parse_inline(stripped[len(prefix):].strip())))
+                return
+
+        if stripped in ("---", "***", "___"):
+            self.flush()
+            self.blocks.append({"object": "block", "type": "divider", "divider": {}})
+            return
+
+        if stripped.startswith(">"):
+            self.flush()
+            self.blocks.extend(_blocks("quote", parse_inline(stripped[1:].strip())))
+            return
+
+        item = _parse_list_item(stripped)
+        if item:
+            self.add_list_item(_indent_width(line), *item)
+            return
+
+        # 일반 텍스트 (단락에 추가). 목록 바로 뒤의 텍스트는 새 단락으로 취급
+        self.list_stack = []
+        self.paragraph.append(stripped)
+
+    def finish(self) -> List[dict]:
+        if self.code_lines is not None:
+            # 닫히지 않은 코드 블록
+            self.feed("```")
+        self.flush()
+        return self.blocks
+
+def _iter_lines(text: str) -> Iterator[str]:
+    """큰 문자열을 복사 없이 줄 단위로 순회합니다."""
+    start = 0
+    length = len(text)
+    while start < length:
+        end = text.find("\n", start)
+        if end == -1:
+            end = length
+        yield text[start:end].rstrip("\r")
+        start = end + 1
+
+def markdown_to_blocks(markdown: str) -> List[dict]:
+    compiler = _Compiler()
+    for line in _iter_lines(markdown):
+        compiler.feed(line)
+    return compiler.finish()
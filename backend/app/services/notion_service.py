@@ -1,15 +1,152 @@
-from notion_client import AsyncClient
 from app.core.config import settings
+from app.core.http import create_http_client
+from app.core.rate_limit import ProviderUnavailable, create_limiter, error_status
+from app.services.markdown_to_notion import markdown_to_blocks
+from dataclasses import dataclass, field
 from datetime import datetime
+from typing import Awaitable, Callable, List, Optional
+import difflib
+import hashlib
+import json
+
+# 모든 파이프라인이 공유하는 Notion 요청 제한 (Notion 평균 허용치: 초당 3회)
+notion_limiter = create_limiter(
+    "notion",
+    settings.NOTION_MAX_CONCURRENCY,
+    settings.NOTION_RATE_LIMIT_PER_SECOND,
+    settings.NOTION_RATE_LIMIT_BURST,
+    settings.NOTION_MAX_RETRIES,
+)
+
+# 게시한 최상위 블록 상태: [블록 ID, 내용 해시, 제자리 수정 가능한 블록 종류 (children 이 있으면 None)]
+# 페이지 생성과 함께 보낸 블록은 ID 를 모르므로 None 이며, 처음 수정할 때 목록을 조회해 채웁니다.
+BlockState = list
+
+def _is_missing_or_archived(error: BaseException) -> bool:
+    """
+    페이지나 블록이 없거나 (object_not_found) 보관되어 수정할 수 없다는 (400 validation_error) Notion 오류인지 확인합니다.
+    권한, 요청 형식 등 다른 400/404 오류는 포함하지 않습니다.
+    """
+    code = getattr(error, "code", None)
+    if code == "object_not_found":
+        return True
+    return code == "validation_error" and "archived" in str(error).lower()
+
+def block_hash(block: dict) -> str:
+    raw = json.dumps(block, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(raw.encode()).hexdigest()[:16]
+
+def _patch_type(block: dict) -> Optional[str]:
+    """blocks.update 로 내용만 바꿀 수 있으면 블록 종류를, children 이 있어 교체해야 하면 None 을 반환합니다."""
+    return None if block[block["type"]].get("children") else block["type"]
+
+def plan_block_changes(old: List[BlockState], new_blocks: List[dict]) -> List[tuple]:
+    """
+    이전에 게시한 블록과 새 블록 목록을 비교해 페이지 순서대로 작업 목록을 만듭니다.
+        ("keep", state, index)     그대로 둠
+        ("update", state, index)   같은 종류의 블록은 내용만 수정 (요청 1회)
+        ("delete", state)          삭제 (요청 1회)
+        ("insert", index)          앞의 블록 뒤에 추가 (연속된 추가는 요청 1회로 묶음)
+
+    Notion API 는 "맨 앞에 추가" 를 지정할 수 없으므로, 남는 첫 블록보다 앞에 새 블록이 들어가야 하면
+    그 블록을 첫 새 블록으로 고치고 원래 내용은 뒤에 다시 추가합니다.
+    종류가 달라 고칠 수 없으면 기존 블록을 모두 지우고 새로 추가하는 계획을 반환합니다.
+    """
+    new_hashes = [block_hash(block) for block in new_blocks]
+    matcher = difflib.SequenceMatcher(None, [state[1] for state in old], new_hashes, autojunk=False)
+    plan: List[tuple] = []
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == "equal":
+            plan.extend(("keep", state, index) for state, index in zip(old[i1:i2], range(j1, j2)))
+            continue
+        olds, news = old[i1:i2], list(range(j1, j2))
+        for state, index in zip(olds, news):
+            if state[2] is not None and state[2] == _patch_type(new_blocks[index]):
+                plan.append(("update", state, index))
+            else:
+                plan.extend((("delete", state), ("insert", index)))
+        plan.extend(("delete", state) for state in olds[len(news):])
+        plan.extend(("insert", index) for index in news[len(olds):])
+
+    placed = [position for position, op in enumerate(plan) if op[0] != "delete"]
+    first_kept = next((position for position in placed if plan[position][0] != "insert"), None)
+    if first_kept is None or placed[0] == first_kept:
+        return plan
+
+    leading = [plan[position][1] for position in placed if position < first_kept]
+    _, state, own_index = plan[first_kept]
+    if state[2] is None or state[2] != _patch_type(new_blocks[leading[0]]):
+        return [("delete", state) for state in old] + [("insert", index) for index in range(len(new_blocks))]
+    deletes = [op for op in plan[:first_kept] if op[0] == "delete"]
+    moved = [("update", state, leading[0])] + [("insert", index) for index in leading[1:]] + [("insert", own_index)]
+    return deletes + moved + plan[first_kept + 1:]
+
+@dataclass
+class PublishedPage:
+    """게시한 페이지와 블록 상태. Meeting.notion_state 에 그대로 저장해 다음 게시 때 비교합니다."""
+    page_id: str
+    url: str
+    title: str
+    blocks: List[BlockState] = field(default_factory=list)
+    requests: int = 0
+
+    def to_state(self) -> dict:
+        return {"page_id": self.page_id, "url": self.url, "title": self.title, "blocks": self.blocks}
+
+    @classmethod
+    def from_state(cls, state: dict) -> "PublishedPage":
+        return cls(state["page_id"], state["url"], state["title"], state["blocks"])
 
 class NotionService:
     def __init__(self):
-        if settings.NOTION_API_KEY:
-            self.client = AsyncClient(auth=settings.NOTION_API_KEY)
-        else:
+        if not settings.NOTION_API_KEY:
             print("Warning: NOTION_API_KEY is not set.")
-            self.client = None
+        self._client = None
         self.database_id = settings.NOTION_DATABASE_ID
+        self.limiter = notion_limiter
+        self.blocks_per_request = settings.NOTION_BLOCKS_PER_REQUEST
+
+    @property
+    def client(self):
+        """처음 사용할 때 SDK 를 import 해 클라이언트를 만듭니다. API 키가 없으면 None 입니다."""
+        if self._client is None and settings.NOTION_API_KEY:
+            from notion_client import AsyncClient
+            # 재시도는 notion_limiter 가 담당하므로 SDK 자체 재시도는 끔.
+            # SDK 가 넘겨받은 클라이언트의 타임아웃을 timeout_ms 로 덮어쓰므로 같은 값을 지정
+            options = {
+                "auth": settings.NOTION_API_KEY,
+                "retry": False,
+                "timeout_ms": int(settings.NOTION_TIMEOUT_SECONDS * 1000),
+            }
+            if settings.NOTION_BASE_URL:
+                options["base_url"] = settings.NOTION_BASE_URL
+            http_client = create_http_client("notion", settings.NOTION_TIMEOUT_SECONDS, settings.NOTION_MAX_CONCURRENCY)
+            self._client = AsyncClient(options, client=http_client)
+        return self._client
+
+    async def _request(self, method, **kwargs):
+        """요청 제한/재시도/서킷 브레이커를 거쳐 Notion API 를 호출합니다."""
+        # 예: "PagesEndpoint.create" → "Pages.create"
+        operation = method.__qualname__.replace("Endpoint", "")
+        return await self.limiter.call(lambda: method(**kwargs), operation)
+
+    async def _append_children(self, block_id: str, children: List[dict], after: Optional[str] = None) -> List[str]:
+        """
+        블록을 요청당 최대 blocks_per_request 개씩 나눠 추가하고 (순서 유지), 추가된 최상위 블록 ID 를 반환합니다.
+        after 를 지정하면 그 블록 바로 뒤에, 없으면 맨 끝에 추가합니다.
+        """
+        ids: List[str] = []
+        for i in range(0, len(children), self.blocks_per_request):
+            options = {"after": after} if after else {}
+            response = await self._request(
+                self.client.blocks.children.append,
+                block_id=block_id,
+                children=children[i:i + self.blocks_per_request],
+                **options,
+            )
+            ids += [block["id"] for block in response["results"]]
+            after = ids[-1] if after else None
+        return ids
 
     async def create_meeting_page(self, title: str, summary_markdown: str) -> str:
         """
@@ -23,127 +160,171 @@ class NotionService:
             print("Notion Database ID not set.")
             return None
 
-        children = []
-        
-        # 개선된 마크다운 파싱
-        lines = summary_markdown.split("\n")
-        current_paragraph = []
-        
-        for line in lines:
-            line_stripped = line.strip()
-            
-            # 빈 줄 처리
-            if not line_stripped:
-                if current_paragraph:
-                    # 현재 단락을 블록으로 추가
-                    paragraph_text = " ".join(current_paragraph).strip()
-                    if paragraph_text:
-                        children.append(self._create_paragraph_block(paragraph_text))
-                    current_paragraph = []
-                continue
-            
-            # 헤더 처리
-            if line_stripped.startswith("# "):
-                if current_paragraph:
-                    paragraph_text = " ".join(current_paragraph).strip()
-                    if paragraph_text:
-                        children.append(self._create_paragraph_block(paragraph_text))
-                    current_paragraph = []
-                children.append(self._create_heading_block("heading_1", line_stripped[2:]))
-            elif line_stripped.startswith("## "):
-                if current_paragraph:
-                    paragraph_text = " ".join(current_paragraph).strip()
-                    if paragraph_text:
-                        children.append(self._create_paragraph_block(paragraph_text))
-                    current_paragraph = []
-                children.append(self._create_heading_block("heading_2", line_stripped[3:]))
-            elif line_stripped.startswith("### "):
-                if current_paragraph:
-                    paragraph_text = " ".join(current_paragraph).strip()
-                    if paragraph_text:
-                        children.append(self._create_paragraph_block(paragraph_text))
-                    current_paragraph = []
-                children.append(self._create_heading_block("heading_3", line_stripped[4:]))
-            # 불릿 포인트 처리
-            elif line_stripped.startswith("- "):
-                if current_paragraph:
-                    paragraph_text = " ".join(current_paragraph).strip()
-                    if paragraph_text:
-                        children.append(self._create_paragraph_block(paragraph_text))
-                    current_paragraph = []
-                # 체크박스 처리 ([ ] 또는 [x])
-                if line_stripped.startswith("- [ ]") or line_stripped.startswith("- [x]"):
-                    checkbox_text = line_stripped[5:].strip()
-                    is_checked = line_stripped.startswith("- [x]")
-                    children.append(self._create_checkbox_block(checkbox_text, is_checked))
-                else:
-                    # 일반 불릿 포인트
-                    bullet_text = line_stripped[2:].strip()
-                    children.append(self._create_bullet_block(bullet_text))
-            else:
-                # 일반 텍스트 (단락에 추가)
-                current_paragraph.append(line_stripped)
-        
-        # 마지막 단락 처리
-        if current_paragraph:
-            paragraph_text = " ".join(current_paragraph).strip()
-            if paragraph_text:
-                children.append(self._create_paragraph_block(paragraph_text))
-        
         try:
-            response = await self.client.pages.create(
-                parent={"database_id": self.database_id},
-                properties={
-                    "Name": {"title": [{"text": {"content": title}}]},
-                    "Date": {"date": {"start": datetime.now().isoformat()}}
-                },
-                children=children
-            )
-            return response["url"]
+            return (await self.publish_meeting_page(title, summary_markdown)).url
+        except ProviderUnavailable:
+            # 게시 실패로 처리하지 않고 작업을 미루도록 그대로 전달
+            raise
         except Exception as e:
             print(f"Notion API Error: {e}")
             return None
-    
-    def _create_paragraph_block(self, text: str) -> dict:
-        """단락 블록 생성"""
-        return {
-            "object": "block",
-            "type": "paragraph",
-            "paragraph": {
-                "rich_text": [{"type": "text", "text": {"content": text[:2000]}}]
-            }
-        }
-    
-    def _create_heading_block(self, heading_type: str, text: str) -> dict:
-        """헤더 블록 생성"""
-        return {
-            "object": "block",
-            "type": heading_type,
-            heading_type: {
-                "rich_text": [{"type": "text", "text": {"content": text[:2000]}}]
-            }
-        }
-    
-    def _create_bullet_block(self, text: str) -> dict:
-        """불릿 포인트 블록 생성"""
-        return {
-            "object": "block",
-            "type": "bulleted_list_item",
-            "bulleted_list_item": {
-                "rich_text": [{"type": "text", "text": {"content": text[:2000]}}]
-            }
-        }
-    
-    def _create_checkbox_block(self, text: str, checked: bool = False) -> dict:
-        """체크박스 블록 생성 (액션 아이템용)"""
-        return {
-            "object": "block",
-            "type": "to_do",
-            "to_do": {
-                "rich_text": [{"type": "text", "text": {"content": text[:2000]}}],
-                "checked": checked
-            }
-        }
 
-notion_service = NotionService()
+    async def publish_meeting_page(
+        self,
+        title: str,
+        summary_markdown: str,
+        previous: Optional[PublishedPage] = None,
+        on_created: Optional[Callable[[PublishedPage], Awaitable[None]]] = None,
+    ) -> PublishedPage:
+        """
+        요약을 Notion 페이지로 게시합니다.
+
+        previous (이전에 게시한 페이지 상태) 가 있으면 새 페이지를 만들지 않고 바뀐 블록만 수정/추가/삭제합니다.
+        내용이 같으면 요청을 보내지 않고, 할 일 하나를 고친 정도면 요청 1~2회로 끝납니다.
+        이전 페이지가 Notion 에서 삭제되었으면 새 페이지를 만듭니다.
+        on_created 는 새 페이지를 만든 직후 호출되므로, 블록을 추가하다 실패해도 재시도 때 페이지가 중복되지 않습니다.
+        """
+        children = markdown_to_blocks(summary_markdown)
+        if previous is not None:
+            try:
+                return await self._update_page(previous, title, children)
+            except ProviderUnavailable:
+                raise
+            except Exception as e:
+                # 그 밖의 오류는 그대로 던져 저장된 notion_state 로 다시 시도하게 함 (새 페이지를 만들면 중복됨)
+                if not _is_missing_or_archived(e):
+                    raise
+                if not await self._is_page_gone(previous.page_id):
+                    # 페이지는 그대로이고 블록만 Notion 에서 지워진 경우: 현재 블록을 모두 새 내용으로 교체
+                    print(f"Blocks of Notion page {previous.page_id} changed outside NoteSync ({e}). Rewriting the page.")
+                    unknown = PublishedPage(previous.page_id, previous.url, previous.title, [[None, "", None]])
+                    return await self._update_page(unknown, title, children)
+                print(f"Notion page {previous.page_id} was deleted or archived ({e}). Creating a new page.")
+        return await self._create_page(title, children, on_created)
+
+    async def _is_page_gone(self, page_id: str) -> bool:
+        """페이지가 삭제되었거나 보관(휴지통)된 경우 True"""
+        try:
+            response = await self._request(self.client.pages.retrieve, page_id=page_id)
+        except ProviderUnavailable:
+            raise
+        except Exception as e:
+            if getattr(e, "code", None) == "object_not_found":
+                return True
+            raise
+        return bool(response.get("archived") or response.get("in_trash"))
+
+    async def _create_page(
+        self, title: str, children: List[dict], on_created: Optional[Callable[[PublishedPage], Awaitable[None]]]
+    ) -> PublishedPage:
+        # 첫 배치는 페이지 생성과 함께 보내고, 나머지는 순서대로 append
+        first_batch = children[:self.blocks_per_request]
+        response = await self._request(
+            self.client.pages.create,
+            parent={"database_id": self.database_id},
+            properties={
+                "Name": {"title": [{"text": {"content": title}}]},
+                "Date": {"date": {"start": datetime.now().isoformat()}}
+            },
+            children=first_batch
+        )
+        # 페이지 생성 응답에는 블록 ID 가 없으므로 첫 배치의 ID 는 처음 수정할 때 조회
+        page = PublishedPage(response["id"], response["url"], title, requests=1)
+        page.blocks = [[None, block_hash(block), _patch_type(block)] for block in first_batch]
+        if on_created is not None:
+            await on_created(page)
+        rest = children[len(first_batch):]
+        ids = await self._append_children(page.page_id, rest)
+        page.requests += -(-len(rest) // self.blocks_per_request)
+        page.blocks += [[block_id, block_hash(block), _patch_type(block)] for block_id, block in zip(ids, rest)]
+        return page
+
+    async def _list_children_ids(self, block_id: str) -> List[str]:
+        ids: List[str] = []
+        cursor = None
+        while True:
+            options = {"page_size": 100}
+            if cursor:
+                options["start_cursor"] = cursor
+            response = await self._request(self.client.blocks.children.list, block_id=block_id, **options)
+            ids += [block["id"] for block in response["results"]]
+            if not response.get("has_more"):
+                return ids
+            cursor = response["next_cursor"]
+
+    async def _update_page(self, previous: PublishedPage, title: str, children: List[dict]) -> PublishedPage:
+        page = PublishedPage(previous.page_id, previous.url, title)
+        old = previous.blocks
+        if any(state[0] is None for state in old):
+            ids = await self._list_children_ids(page.page_id)
+            page.requests += max(1, -(-len(ids) // 100))
+            if len(ids) == len(old):
+                old = [[block_id, *state[1:]] for block_id, state in zip(ids, old)]
+            else:
+                # 페이지를 Notion 에서 직접 고친 경우: 현재 블록을 모두 새 내용으로 교체
+                old = [[block_id, "", None] for block_id in ids]
 
+        if title != previous.title:
+            await self._request(
+                self.client.pages.update,
+                page_id=page.page_id,
+                properties={"Name": {"title": [{"text": {"content": title}}]}},
+            )
+            page.requests += 1
+
+        counts = {"update": 0, "insert": 0, "delete": 0}
+        anchor: Optional[str] = None
+        pending: List[int] = []
+
+        async def flush() -> None:
+            nonlocal anchor
+            batch = [children[index] for index in pending]
+            ids = await self._append_children(page.page_id, batch, after=anchor)
+            page.requests += -(-len(batch) // self.blocks_per_request)
+            page.blocks += [[block_id, block_hash(block), _patch_type(block)] for block_id, block in zip(ids, batch)]
+            if ids:
+                anchor = ids[-1]
+            counts["insert"] += len(batch)
+            pending.clear()
+
+        for op in plan_block_changes(old, children):
+            kind = op[0]
+            if kind == "insert":
+                pending.append(op[1])
+                continue
+            if kind == "delete":
+                await self._delete_block(op[1][0])
+                page.requests += 1
+                counts["delete"] += 1
+                continue
+            await flush()
+            state = op[1]
+            if kind == "update":
+                block = children[op[2]]
+                await self._request(
+                    self.client.blocks.update, block_id=state[0], **{block["type"]: block[block["type"]]}
+                )
+                page.requests += 1
+                counts["update"] += 1
+                state = [state[0], block_hash(block), state[2]]
+            page.blocks.append(state)
+            anchor = state[0]
+        await flush()
+
+        print(
+            f"Updated Notion page {page.page_id} with {page.requests} requests "
+            f"({counts['update']} updated, {counts['insert']} inserted, {counts['delete']} deleted)"
+        )
+        return page
+
+    async def _delete_block(self, block_id: str) -> None:
+        try:
+            await self._request(self.client.blocks.delete, block_id=block_id)
+        except ProviderUnavailable:
+            raise
+        except Exception as e:
+            # Notion 에서 이미 지운 블록은 무시
+            if error_status(e) != 404:
+                raise
+
+notion_service = NotionService()
@@ -1,48 +1,393 @@
+from app.core.config import settings
+from app.core import metrics
 from app.core.database import SessionLocal
-from app.models.meeting import Meeting, MeetingStatus
-from app.services.stt_service import stt_service
+from app.core.rate_limit import ProviderUnavailable
+from app.models.meeting import Meeting, MeetingSegment, MeetingStatus, PipelineStage, PublishStatus
+from app.services.stt_service import Transcript, stt_service
 from app.services.llm_service import llm_service
+from app.services.notion_service import PublishedPage, notion_service
+from app.services.job_queue import Job, job_queue
+from app.services.events import event_broker
+from app.services.search import search_index
+from app.services.storage import storage
+from app.services import audio_utils
+from sqlalchemy import delete, func, insert, select, update
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional
+import asyncio
+import os
+import shutil
+import tempfile
+import time
 import uuid
 
-async def run_pipeline(meeting_id: uuid.UUID):
+# 프로세스 내 단계별 동시 실행 제한 (외부 API 별로 부하를 나눠서 제어)
+stage_limits = {
+    "transcribe": asyncio.Semaphore(settings.STT_CONCURRENCY),
+    "summarize": asyncio.Semaphore(settings.LLM_CONCURRENCY),
+    "publish": asyncio.Semaphore(settings.NOTION_CONCURRENCY),
+}
+
+class OwnershipLost(Exception):
+    """다른 워커가 회의를 가져갔거나 상태가 예상과 달라 갱신하지 못한 경우"""
+
+async def _notify(meeting_id: uuid.UUID, values: dict) -> None:
+    """
+    변경된 값을 진행 상황 이벤트로 발행합니다.
+    transcript/summary 본문 대신 has_transcript/has_summary 만 보냅니다.
+    이벤트 발행 실패가 파이프라인을 멈추지 않도록 예외는 기록만 합니다.
+    """
+    event = {"id": str(meeting_id)}
+    for key, value in values.items():
+        if key in ("metrics", "search_vector", "notion_state"):
+            continue
+        if key in ("transcript", "summary"):
+            event[f"has_{key}"] = bool(value)
+        else:
+            event[key] = value
+    try:
+        await event_broker.publish(str(meeting_id), event)
+    except Exception as e:
+        print(f"Failed to publish progress event for {meeting_id}: {e}")
+
+async def _transition(meeting_id: uuid.UUID, where, notify: bool = True, **values) -> bool:
+    """
+    짧은 세션에서 조건부 UPDATE (UPDATE ... WHERE id = ? AND <where>) 를 실행합니다.
+    조건에 맞는 행이 없으면 False 를 반환하고, 성공하면 (notify 가 True 일 때) 변경 내용을 이벤트로 발행합니다.
+    """
     async with SessionLocal() as db:
-        meeting = await db.get(Meeting, meeting_id)
-        if not meeting:
-            print(f"Meeting {meeting_id} not found in background task.")
-            return
+        result = await db.execute(
+            update(Meeting).where(Meeting.id == meeting_id, where).values(**values)
+        )
+        await db.commit()
+    if result.rowcount != 1:
+        return False
+    if notify:
+        await _notify(meeting_id, values)
+    return True
+
+async def _save(meeting_id: uuid.UUID, notify: bool = True, **values) -> None:
+    """PROCESSING 상태를 소유한 경우에만 값을 저장합니다."""
+    if not await _transition(meeting_id, Meeting.status == MeetingStatus.PROCESSING.value, notify, **values):
+        raise OwnershipLost(f"Meeting {meeting_id} is no longer owned by this worker")
 
-        meeting.status = MeetingStatus.PROCESSING.value
+async def _save_indexed(
+    meeting_id: uuid.UUID, title: Optional[str], transcript: str, summary: Optional[str], /, **values
+) -> None:
+    """values 를 저장하면서 같은 UPDATE 로 검색 인덱스도 갱신합니다 (title/transcript/summary 는 색인할 내용)."""
+    await _save(meeting_id, **values, **search_index.column_values(title, transcript, summary))
+    await search_index.indexed(meeting_id, title, transcript, summary)
+
+async def _save_transcript(meeting_id: uuid.UUID, title: Optional[str], transcript: Transcript) -> None:
+    """회의록 본문과 세그먼트를 한 트랜잭션으로 저장합니다 (PROCESSING 상태를 소유한 경우에만)."""
+    values = {"transcript": transcript.text, **search_index.column_values(title, transcript.text, None)}
+    rows = [
+        {
+            "meeting_id": meeting_id,
+            "seq": seq,
+            "start_ms": round(segment.start * 1000),
+            "end_ms": round(segment.end * 1000),
+            "speaker": segment.speaker,
+            "text": segment.text.strip(),
+        }
+        for seq, segment in enumerate(transcript.segments)
+    ]
+    async with SessionLocal() as db:
+        result = await db.execute(
+            update(Meeting)
+            .where(Meeting.id == meeting_id, Meeting.status == MeetingStatus.PROCESSING.value)
+            .values(**values)
+        )
+        if result.rowcount != 1:
+            await db.rollback()
+            raise OwnershipLost(f"Meeting {meeting_id} is no longer owned by this worker")
+        # 재전사한 경우 이전 세그먼트를 교체
+        await db.execute(delete(MeetingSegment).where(MeetingSegment.meeting_id == meeting_id))
+        if rows:
+            await db.execute(insert(MeetingSegment), rows)
         await db.commit()
+    await _notify(meeting_id, values)
+    await search_index.indexed(meeting_id, title, transcript.text, None)
+
+async def _compress_audio(meeting_id: uuid.UUID, key: str) -> None:
+    work_dir = tempfile.mkdtemp(prefix="retention-")
+    try:
+        async with storage.local_copy(key) as file_path:
+            out_path, _ = await audio_utils.preprocess(
+                file_path, os.path.join(work_dir, "audio"), "opus", settings.AUDIO_COMPRESS_BITRATE
+            )
+            original_size = os.path.getsize(file_path)
+        compressed_size = os.path.getsize(out_path)
+        if compressed_size >= original_size:
+            print(f"Kept original audio for {meeting_id}: compression would not save space")
+            return
+        new_key = os.path.splitext(key)[0] + os.path.splitext(out_path)[1]
+        if new_key == key:
+            new_key = os.path.splitext(key)[0] + ".compressed" + os.path.splitext(out_path)[1]
+        with open(out_path, "rb") as f:
+            await storage.put(new_key, f)
+    finally:
+        await asyncio.to_thread(shutil.rmtree, work_dir, True)
+
+    # 그 사이 다른 요청이 경로를 바꾸지 않은 경우에만 교체
+    if await _transition(meeting_id, Meeting.file_path == key, False, file_path=new_key, file_size=compressed_size):
+        await storage.delete(key)
+        print(f"Compressed audio for {meeting_id}: {original_size} -> {compressed_size} bytes")
+    else:
+        await storage.delete(new_key)
+
+async def _apply_retention(meeting_id: uuid.UUID, key: str) -> None:
+    """
+    전사가 저장된 뒤 AUDIO_RETENTION 에 따라 원본 오디오를 지우거나 압축합니다.
+    회의록이 이미 저장되어 있으므로 실패해도 파이프라인은 계속 진행합니다.
+    """
+    try:
+        if settings.AUDIO_RETENTION == "delete":
+            await storage.delete(key)
+            print(f"Deleted audio for {meeting_id}")
+        elif settings.AUDIO_RETENTION == "compress":
+            await _compress_audio(meeting_id, key)
+    except Exception as e:
+        print(f"Audio retention ({settings.AUDIO_RETENTION}) failed for {meeting_id}: {e}")
+
+class _SummaryStream:
+    """
+    스트리밍으로 받은 요약 조각을 바로 구독자에게 보내고, SUMMARY_FLUSH_SECONDS 마다 부분 요약을 DB 에 저장합니다.
+    부분 저장은 has_summary 이벤트를 내지 않으며, stage 가 SUMMARIZE 인 동안의 summary 는 미완성으로 취급합니다.
+    """
+
+    def __init__(self, meeting_id: uuid.UUID):
+        self.meeting_id = meeting_id
+        self.parts: List[str] = []
+        self.flushed_at = time.monotonic()
+
+    async def on_delta(self, delta: str) -> None:
+        self.parts.append(delta)
+        try:
+            await event_broker.publish(str(self.meeting_id), {"id": str(self.meeting_id), "summary_delta": delta})
+        except Exception as e:
+            print(f"Failed to publish summary delta for {self.meeting_id}: {e}")
+        if time.monotonic() - self.flushed_at >= settings.SUMMARY_FLUSH_SECONDS:
+            self.flushed_at = time.monotonic()
+            await _save(self.meeting_id, notify=False, summary="".join(self.parts))
+
+async def _load(meeting_id: uuid.UUID) -> Optional[Meeting]:
+    async with SessionLocal() as db:
+        return await db.get(Meeting, meeting_id)
+
+async def _load_notion_state(meeting_id: uuid.UUID) -> Optional[PublishedPage]:
+    async with SessionLocal() as db:
+        state = await db.scalar(select(Meeting.notion_state).where(Meeting.id == meeting_id))
+    return PublishedPage.from_state(state) if state else None
+
+async def run_pipeline(meeting_id: uuid.UUID, final_attempt: bool = True):
+    """
+    회의 처리 파이프라인 (STT → 요약). Notion 게시는 별도 publish 작업으로 넘깁니다.
+
+    요약이 저장되는 즉시 COMPLETED 로 표시하므로 Notion API 가 느리거나 rate limit 에 걸려도
+    사용자는 바로 요약을 볼 수 있습니다. 이미 끝난 단계(transcript/summary 존재)는 재시도 시 건너뜁니다.
+
+    DB 세션은 상태 전환과 결과 저장 순간에만 짧게 열고, 외부 API 호출 중에는 커넥션을 잡지 않습니다.
+    PENDING → PROCESSING 전환은 조건부 UPDATE 로 수행하므로 같은 회의를 두 워커가 동시에 처리하지 않습니다.
 
+    실패 시 final_attempt 가 False 이면 상태를 PENDING 으로 되돌리고 예외를 다시 던져
+    워커가 백오프 후 재시도하도록 하고, True 이면 FAILED 로 기록합니다.
+    ProviderUnavailable (rate limit, 서킷 열림) 은 회의 자체의 실패가 아니므로 항상 PENDING 으로 되돌립니다.
+    """
+    claimed = await _transition(
+        meeting_id,
+        Meeting.status == MeetingStatus.PENDING.value,
+        status=MeetingStatus.PROCESSING.value,
+    )
+    if not claimed:
+        print(f"Meeting {meeting_id} is missing or not pending. Skipping.")
+        return
+
+    meeting = await _load(meeting_id)
+    transcript = meeting.transcript
+    # 요약 단계에서 멈춘 경우 저장된 summary 는 스트리밍 중 부분 저장된 값이므로 다시 생성
+    summary = meeting.summary if meeting.stage != PipelineStage.SUMMARIZE.value else None
+
+    # 이전 시도에서 끝난 단계의 측정값은 유지하고 이번에 실행한 단계만 갱신
+    with metrics.track_meeting(meeting.metrics) as collector:
         try:
             # Step 1: STT
-            print(f"Starting transcription for meeting {meeting_id}...")
-            transcript = await stt_service.transcribe(meeting.file_path)
-            meeting.transcript = transcript
-            print(f"Transcription completed for meeting {meeting_id}.")
-            
-            # Save progress
-            await db.commit()
-            
-            # Step 2: LLM 요약 생성 및 자동 Notion 저장
-            print(f"Starting summarization and automatic Notion creation for meeting {meeting_id}...")
-            summary, notion_url = await llm_service.summarize_and_save_to_notion(transcript, meeting.title)
-            meeting.summary = summary
-            
-            if notion_url:
-                meeting.notion_page_url = notion_url
-                print(f"Notion page created automatically: {notion_url}")
-            else:
-                print("Warning: Notion page creation failed. Summary generated but Notion page was not created.")
-            
-            print(f"Summarization completed for meeting {meeting_id}.")
-            await db.commit()
-
-            meeting.status = MeetingStatus.COMPLETED.value
-            await db.commit()
-            
+            if not transcript:
+                await _save(meeting_id, stage=PipelineStage.TRANSCRIBE.value)
+                print(f"Starting transcription for meeting {meeting_id}...")
+                async with stage_limits["transcribe"]:
+                    with metrics.stage("transcribe"):
+                        result = await stt_service.transcribe_stored(meeting.file_path, meeting.file_sha256)
+                # Save progress
+                await _save_transcript(meeting_id, meeting.title, result)
+                await _apply_retention(meeting_id, meeting.file_path)
+                transcript = result.text
+                print(f"Transcription completed for meeting {meeting_id}.")
+
+            # Step 2: LLM 요약 생성
+            if not summary:
+                await _save(meeting_id, stage=PipelineStage.SUMMARIZE.value, summary=None)
+                print(f"Starting summarization for meeting {meeting_id}...")
+                stream = _SummaryStream(meeting_id)
+                async with stage_limits["summarize"]:
+                    with metrics.stage("summarize"):
+                        summary = await llm_service.generate_summary(
+                            transcript, meeting.title, on_delta=stream.on_delta
+                        )
+                print(f"Summarization completed for meeting {meeting_id}.")
+
+            # 요약이 저장되면 완료로 표시하고 Notion 게시는 비동기로 진행
+            await _save_indexed(
+                meeting_id,
+                meeting.title,
+                transcript,
+                summary,
+                summary=summary,
+                status=MeetingStatus.COMPLETED.value,
+                stage=PipelineStage.PUBLISH.value,
+                publish_status=PublishStatus.PENDING.value,
+                metrics=collector.data,
+            )
+
+        except OwnershipLost as e:
+            print(f"Pipeline aborted: {e}")
+            return
         except Exception as e:
             print(f"Pipeline failed for {meeting_id}: {e}")
-            meeting.status = MeetingStatus.FAILED.value
-            await db.commit()
+            failed = final_attempt and not isinstance(e, ProviderUnavailable)
+            status = MeetingStatus.FAILED if failed else MeetingStatus.PENDING
+            await _transition(
+                meeting_id,
+                Meeting.status == MeetingStatus.PROCESSING.value,
+                status=status.value,
+                metrics=collector.data,
+            )
+            raise
+
+    await job_queue.enqueue(Job(kind="publish", meeting_id=str(meeting_id)))
+
+async def run_publish(meeting_id: uuid.UUID, final_attempt: bool = True):
+    """
+    요약을 Notion 페이지로 게시합니다. 파이프라인과 독립적으로 재시도됩니다.
+    실패해도 회의 상태(COMPLETED)는 바뀌지 않고 publish_status 만 갱신됩니다.
+    publish_status 를 PENDING → PUBLISHING 으로 조건부 전환해 페이지가 중복 생성되지 않도록 합니다.
+    """
+    if not notion_service.client or not notion_service.database_id:
+        print("Notion is not configured. Skipping publish.")
+        await _transition(
+            meeting_id,
+            Meeting.publish_status == PublishStatus.PENDING.value,
+            publish_status=PublishStatus.SKIPPED.value,
+            stage=PipelineStage.DONE.value,
+        )
+        return
+
+    claimed = await _transition(
+        meeting_id,
+        Meeting.publish_status == PublishStatus.PENDING.value,
+        publish_status=PublishStatus.PUBLISHING.value,
+    )
+    if not claimed:
+        print(f"Meeting {meeting_id} is not waiting to be published. Skipping.")
+        return
+
+    meeting = await _load(meeting_id)
+    previous = await _load_notion_state(meeting_id)
+    publishing = Meeting.publish_status == PublishStatus.PUBLISHING.value
+
+    async def on_created(page: PublishedPage) -> None:
+        # 블록을 추가하다 실패해도 재시도 때 같은 페이지를 이어서 고치도록 페이지 ID 를 먼저 저장
+        await _transition(meeting_id, publishing, False, notion_page_url=page.url, notion_state=page.to_state())
+
+    with metrics.track_meeting(meeting.metrics) as collector:
+        try:
+            async with stage_limits["publish"]:
+                with metrics.stage("publish"):
+                    # 이미 게시한 페이지가 있으면 바뀐 블록만 수정
+                    print(f"Publishing meeting {meeting_id} to Notion...")
+                    page = await notion_service.publish_meeting_page(
+                        meeting.title, meeting.summary, previous, on_created=on_created
+                    )
+        except Exception as e:
+            failed = final_attempt and not isinstance(e, ProviderUnavailable)
+            status = PublishStatus.FAILED if failed else PublishStatus.PENDING
+            await _transition(meeting_id, publishing, publish_status=status.value, metrics=collector.data)
+            raise
+
+    await _transition(
+        meeting_id,
+        publishing,
+        notion_page_url=page.url,
+        notion_state=page.to_state(),
+        publish_status=PublishStatus.PUBLISHED.value,
+        stage=PipelineStage.DONE.value,
+        metrics=collector.data,
+    )
+    print(f"Notion page published: {page.url} ({page.requests} requests)")
+
+async def reset_stale_meetings(stale_seconds: int) -> List[uuid.UUID]:
+    """
+    PROCESSING 상태로 stale_seconds 이상 갱신되지 않은 회의(워커 비정상 종료 등)를
+    PENDING 으로 되돌리고 해당 ID 목록을 반환합니다.
+    조건부 UPDATE 이므로 여러 워커가 동시에 실행해도 한 번만 회수됩니다.
+    """
+    cutoff = datetime.now(timezone.utc) - timedelta(seconds=stale_seconds)
+    async with SessionLocal() as db:
+        result = await db.execute(
+            update(Meeting)
+            .where(Meeting.status == MeetingStatus.PROCESSING.value, Meeting.updated_at < cutoff)
+            .values(status=MeetingStatus.PENDING.value)
+            .returning(Meeting.id)
+        )
+        meeting_ids = [row[0] for row in result]
+        await db.commit()
+    return meeting_ids
 
+async def reset_stale_publishes(stale_seconds: int) -> List[uuid.UUID]:
+    """PUBLISHING 상태로 멈춘 회의를 다시 게시 대기(PENDING)로 되돌립니다."""
+    cutoff = datetime.now(timezone.utc) - timedelta(seconds=stale_seconds)
+    async with SessionLocal() as db:
+        result = await db.execute(
+            update(Meeting)
+            .where(Meeting.publish_status == PublishStatus.PUBLISHING.value, Meeting.updated_at < cutoff)
+            .values(publish_status=PublishStatus.PENDING.value)
+            .returning(Meeting.id)
+        )
+        meeting_ids = [row[0] for row in result]
+        await db.commit()
+    return meeting_ids
+
+async def heartbeat(meeting_id: uuid.UUID, kind: str) -> bool:
+    """
+    작업이 실행 중인 동안 updated_at 을 갱신해, 오래 걸리는 단계(긴 녹음의 STT 등)가
+    stale sweep 에 의해 PENDING 으로 되돌려지지 않게 합니다. 소유권을 잃었으면 False 를 반환합니다.
+    """
+    if kind == "publish":
+        owned = Meeting.publish_status == PublishStatus.PUBLISHING.value
+    else:
+        owned = Meeting.status == MeetingStatus.PROCESSING.value
+    return await _transition(meeting_id, owned, False, updated_at=func.now())
+
+async def requeue_stale_pending(stale_seconds: int) -> List[tuple]:
+    """
+    stale_seconds 넘게 PENDING 으로 남은 회의(파이프라인)와 게시 대기 회의를 찾아 (kind, meeting_id) 목록으로 반환합니다.
+    큐에서 작업이 유실된 경우(메모리 큐의 프로세스 재시작 등)를 복구하기 위한 것으로,
+    updated_at 을 갱신해 다음 sweep 에서 같은 회의를 바로 다시 등록하지 않습니다.
+    이미 큐에 작업이 남아 있어도 조건부 전환으로 한 번만 실행되므로 중복 등록은 무해합니다.
+    """
+    cutoff = datetime.now(timezone.utc) - timedelta(seconds=stale_seconds)
+    jobs = []
+    async with SessionLocal() as db:
+        for kind, waiting in (
+            ("pipeline", Meeting.status == MeetingStatus.PENDING.value),
+            ("publish", Meeting.publish_status == PublishStatus.PENDING.value),
+        ):
+            result = await db.execute(
+                update(Meeting)
+                .where(waiting, Meeting.updated_at < cutoff)
+                .values(updated_at=func.now())
+                .returning(Meeting.id)
+            )
+            jobs.extend((kind, row[0]) for row in result)
+        await db.commit()
+    return jobs
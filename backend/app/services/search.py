@@ -0,0 +1,321 @@
+"""
+회의 전문 검색 인덱스
+
+제목, 요약, 회의록(transcript)을 검색합니다. 한국어는 띄어쓰기 단위가 조사와 붙어 있어 단어 단위로는
+"회의록" 으로 "회의록을" 을 찾을 수 없으므로, 한글/한자/가나는 두 글자씩 겹쳐 자른 bigram 으로,
+그 밖의 문자는 단어 단위로 토큰을 만듭니다. 질의도 같은 방식으로 잘라 모든 토큰이 포함된 회의를 찾습니다.
+
+백엔드는 SEARCH_BACKEND 로 선택합니다 (비우면 DATABASE_URL 로 결정):
+    - postgres: 토큰을 tsvector 로 저장하고 GIN 인덱스로 조회. 파이프라인이 결과를 저장하는 UPDATE 에서 함께 갱신
+    - memory: 프로세스 내 역색인 (SQLite 테스트용). 첫 검색 때 DB 에서 만들고 이후 같은 프로세스의 파이프라인이 갱신
+
+가중치는 제목 > 요약 > 회의록 순이며 (Postgres ts_rank 기본값과 같은 1.0 / 0.4 / 0.2),
+일치하는 회의가 많을 때는 최신 SEARCH_RANK_CANDIDATES 건만 관련도로 정렬해 큰 tsvector 를 모두 읽지 않습니다.
+"""
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.models.meeting import Meeting
+from dataclasses import dataclass
+from sqlalchemy import Text, cast, func, literal, select, update
+from sqlalchemy.dialects.postgresql import TSQUERY, TSVECTOR
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+import asyncio
+import heapq
+import html
+import re
+import unicodedata
+import uuid
+
+# 한글 자모/음절, 가나, CJK 한자: bigram 으로 색인
+_CJK = "\u1100-\u11ff\u3040-\u30ff\u3130-\u318f\u3400-\u9fff\uac00-\ud7af\uf900-\ufaff"
+_RUN_RE = re.compile(rf"[{_CJK}]+|[^\W{_CJK}_]+")
+_CJK_RE = re.compile(rf"[{_CJK}]")
+
+MAX_TOKEN_LENGTH = 64
+# tsvector 는 1MB 를 넘을 수 없으므로 긴 회의록에서도 토큰당 위치는 몇 개만 저장 (빈도 점수에는 충분)
+MAX_POSITIONS_PER_TOKEN = 4
+MAX_POSITION = 16383
+
+TITLE, SUMMARY, TRANSCRIPT = "A", "B", "C"
+WEIGHTS = {TITLE: 1.0, SUMMARY: 0.4, TRANSCRIPT: 0.2}
+
+def _normalize(text: str) -> str:
+    return unicodedata.normalize("NFKC", text).lower()
+
+def tokenize(text: str) -> List[str]:
+    """색인/질의 토큰 (순서 유지, 중복 포함)"""
+    tokens = []
+    for run in _RUN_RE.findall(_normalize(text)):
+        if _CJK_RE.match(run):
+            if len(run) == 1:
+                tokens.append(run)
+            else:
+                tokens.extend(run[i:i + 2] for i in range(len(run) - 1))
+        elif len(run) <= MAX_TOKEN_LENGTH:
+            tokens.append(run)
+    return tokens
+
+def query_terms(query: str) -> List[str]:
+    """스니펫에서 강조할 질의 단어 (긴 것부터)"""
+    terms = sorted(set(_RUN_RE.findall(_normalize(query))))
+    return sorted(terms, key=len, reverse=True)
+
+def _fields(title: Optional[str], transcript: Optional[str], summary: Optional[str]) -> List[Tuple[str, str]]:
+    # 제목/요약을 앞에 두어 위치 상한(16383)에 걸리지 않게 함
+    return [(text, weight) for text, weight in ((title, TITLE), (summary, SUMMARY), (transcript, TRANSCRIPT)) if text]
+
+def make_snippet(text: Optional[str], terms: Sequence[str], width: Optional[int] = None) -> Optional[str]:
+    """
+    첫 번째로 일치한 질의 단어 주변 width 글자를 잘라 일치 부분을 <mark> 로 감쌉니다.
+    본문은 HTML 이스케이프하므로 그대로 innerHTML 로 넣어도 됩니다. 일치하는 단어가 없으면 None.
+    """
+    if not text or not terms:
+        return None
+    width = width or settings.SEARCH_SNIPPET_CHARS
+    pattern = re.compile("|".join(re.escape(term) for term in terms), re.IGNORECASE)
+    match = pattern.search(text)
+    if match is None:
+        return None
+    start = max(match.start() - width // 3, 0)
+    end = min(start + width, len(text))
+    window = text[start:end]
+
+    parts = ["…" if start > 0 else ""]
+    last = 0
+    for found in pattern.finditer(window):
+        parts.append(html.escape(window[last:found.start()]))
+        parts.append(f"<mark>{html.escape(found.group())}</mark>")
+        last = found.end()
+    parts.append(html.escape(window[last:]))
+    parts.append("…" if end < len(text) else "")
+    return "".join(parts)
+
+def _best_snippet(terms: Sequence[str], *texts: Optional[str]) -> Optional[str]:
+    # 질의 단어가 가장 많이 나오는 필드에서 스니펫을 만듦 (같으면 앞 필드 우선)
+    def matched_terms(text: Optional[str]) -> int:
+        lowered = _normalize(text or "")
+        return sum(term in lowered for term in terms)
+
+    best = max(texts, key=matched_terms)
+    if matched_terms(best):
+        return make_snippet(best, terms)
+    # bigram 만 일치한 경우 (질의 단어가 본문에서 띄어 쓰인 경우 등) 요약 앞부분을 보여줌
+    for text in texts[1:]:
+        if text:
+            return html.escape(text[:settings.SEARCH_SNIPPET_CHARS]) + ("…" if len(text) > settings.SEARCH_SNIPPET_CHARS else "")
+    return None
+
+@dataclass
+class SearchHit:
+    meeting_id: uuid.UUID
+    score: float
+    snippet: Optional[str]
+
+class SearchIndex:
+    """
+    검색 인덱스 인터페이스.
+    column_values() 는 회의 행과 같은 UPDATE 로 저장할 값이고, indexed() 는 커밋 후 호출됩니다.
+    """
+
+    def column_values(self, title: Optional[str], transcript: Optional[str], summary: Optional[str]) -> dict:
+        return {}
+
+    async def indexed(
+        self, meeting_id: uuid.UUID, title: Optional[str], transcript: Optional[str], summary: Optional[str]
+    ) -> None:
+        pass
+
+    async def search(self, db: AsyncSession, query: str, limit: int, offset: int = 0) -> List[SearchHit]:
+        raise NotImplementedError
+
+    async def backfill(self) -> int:
+        """기존 회의를 색인합니다. 색인한 회의 수를 반환합니다."""
+        return 0
+
+def tsvector_literal(title: Optional[str], transcript: Optional[str], summary: Optional[str]) -> str:
+    """
+    tsvector 입력 형식 ('토큰':위치가중치,...) 을 직접 만듭니다.
+    Postgres 파서를 거치지 않으므로 DB 로캘과 무관하게 bigram 토큰이 그대로 저장됩니다.
+    """
+    positions: Dict[str, List[str]] = {}
+    position = 0
+    for text, weight in _fields(title, transcript, summary):
+        for token in tokenize(text):
+            position += 1
+            entries = positions.setdefault(token, [])
+            if len(entries) < MAX_POSITIONS_PER_TOKEN:
+                entries.append(f"{min(position, MAX_POSITION)}{weight}")
+    # 토큰은 문자/숫자만으로 이루어져 있어 따옴표 이스케이프가 필요 없음
+    return " ".join(f"'{token}':{','.join(entries)}" for token, entries in positions.items())
+
+def tsquery_literal(query: str) -> Optional[str]:
+    tokens = list(dict.fromkeys(tokenize(query)))
+    if not tokens:
+        return None
+    return " & ".join(f"'{token}'" for token in tokens)
+
+def _window(column, term: str, width: int):
+    """일치 위치 주변만 DB 에서 잘라와 긴 회의록 전체를 전송하지 않음 (없으면 앞부분)"""
+    position = func.strpos(func.lower(column), term)
+    return func.substr(column, func.greatest(position - width, 1), width * 3)
+
+class PostgresSearchIndex(SearchIndex):
+    BACKFILL_BATCH = 200
+
+    def column_values(self, title: Optional[str], transcript: Optional[str], summary: Optional[str]) -> dict:
+        return {"search_vector": cast(literal(tsvector_literal(title, transcript, summary), Text()), TSVECTOR)}
+
+    async def search(self, db: AsyncSession, query: str, limit: int, offset: int = 0) -> List[SearchHit]:
+        text_query = tsquery_literal(query)
+        if text_query is None:
+            return []
+        tsquery = cast(literal(text_query, Text()), TSQUERY)
+        terms = query_terms(query)
+        width = settings.SEARCH_SNIPPET_CHARS
+
+        # GIN 인덱스로 찾은 일치 회의 중 최신 후보만 골라 ts_rank 계산
+        candidates = (
+            select(Meeting.id)
+            .where(Meeting.search_vector.op("@@")(tsquery))
+            .order_by(Meeting.created_at.desc())
+            .limit(max(settings.SEARCH_RANK_CANDIDATES, offset + limit))
+            .scalar_subquery()
+        )
+        score = func.ts_rank(Meeting.search_vector, tsquery)
+        statement = (
+            select(
+                Meeting.id,
+                Meeting.title,
+                score.label("score"),
+                _window(Meeting.summary, terms[0], width).label("summary"),
+                _window(Meeting.transcript, terms[0], width).label("transcript"),
+            )
+            .where(Meeting.id.in_(candidates))
+            .order_by(score.desc(), Meeting.created_at.desc())
+            .limit(limit)
+            .offset(offset)
+        )
+        rows = (await db.execute(statement)).all()
+        return [
+            SearchHit(row.id, float(row.score), _best_snippet(terms, row.title, row.summary, row.transcript))
+            for row in rows
+        ]
+
+    async def backfill(self) -> int:
+        count = 0
+        while True:
+            async with SessionLocal() as db:
+                rows = (await db.execute(
+                    select(Meeting.id, Meeting.title, Meeting.transcript, Meeting.summary)
+                    .where(Meeting.transcript.isnot(None), Meeting.search_vector.is_(None))
+                    .limit(self.BACKFILL_BATCH)
+                )).all()
+                if not rows:
+                    return count
+                for row in rows:
+                    await db.execute(
+                        update(Meeting)
+                        .where(Meeting.id == row.id)
+                        .values(**self.column_values(row.title, row.transcript, row.summary))
+                    )
+                await db.commit()
+            count += len(rows)
+
+@dataclass
+class _Document:
+    title: Optional[str]
+    transcript: Optional[str]
+    summary: Optional[str]
+    tokens: Set[str]
+
+class InMemorySearchIndex(SearchIndex):
+    """
+    토큰 → {회의 ID: 가중치 합} 역색인.
+    여러 프로세스가 공유하지 않으므로 API 와 워커를 분리하면 API 프로세스의 색인은 첫 검색 시점 이후 갱신되지 않습니다.
+    """
+
+    def __init__(self):
+        self._postings: Dict[str, Dict[uuid.UUID, float]] = {}
+        self._documents: Dict[uuid.UUID, _Document] = {}
+        self._built = False
+        self._lock = asyncio.Lock()
+
+    def _remove(self, meeting_id: uuid.UUID) -> None:
+        document = self._documents.pop(meeting_id, None)
+        if document is None:
+            return
+        for token in document.tokens:
+            postings = self._postings.get(token)
+            if postings is not None:
+                postings.pop(meeting_id, None)
+                if not postings:
+                    del self._postings[token]
+
+    def _add(self, meeting_id: uuid.UUID, title: Optional[str], transcript: Optional[str], summary: Optional[str]) -> None:
+        self._remove(meeting_id)
+        scores: Dict[str, float] = {}
+        counts: Dict[str, int] = {}
+        for text, weight in _fields(title, transcript, summary):
+            for token in tokenize(text):
+                if counts.get(token, 0) < MAX_POSITIONS_PER_TOKEN:
+                    counts[token] = counts.get(token, 0) + 1
+                    scores[token] = scores.get(token, 0.0) + WEIGHTS[weight]
+        for token, score in scores.items():
+            self._postings.setdefault(token, {})[meeting_id] = score
+        self._documents[meeting_id] = _Document(title, transcript, summary, set(scores))
+
+    async def _ensure_built(self) -> None:
+        async with self._lock:
+            if self._built:
+                return
+            async with SessionLocal() as db:
+                rows = (await db.execute(
+                    select(Meeting.id, Meeting.title, Meeting.transcript, Meeting.summary)
+                    .where(Meeting.transcript.isnot(None))
+                )).all()
+            for row in rows:
+                self._add(row.id, row.title, row.transcript, row.summary)
+            self._built = True
+            print(f"Built in-memory search index for {len(rows)} meetings")
+
+    async def indexed(
+        self, meeting_id: uuid.UUID, title: Optional[str], transcript: Optional[str], summary: Optional[str]
+    ) -> None:
+        # 아직 만들지 않았다면 첫 검색 때 DB 에서 함께 읽음
+        if self._built:
+            self._add(meeting_id, title, transcript, summary)
+
+    async def search(self, db: AsyncSession, query: str, limit: int, offset: int = 0) -> List[SearchHit]:
+        tokens = list(dict.fromkeys(tokenize(query)))
+        if not tokens:
+            return []
+        await self._ensure_built()
+
+        # 가장 짧은 posting 부터 교집합
+        postings = sorted((self._postings.get(token, {}) for token in tokens), key=len)
+        matched = postings[0].keys()
+        for posting in postings[1:]:
+            matched = matched & posting.keys()
+            if not matched:
+                return []
+        scores = ((meeting_id, sum(posting[meeting_id] for posting in postings)) for meeting_id in matched)
+        ranked = heapq.nlargest(offset + limit, scores, key=lambda item: item[1])[offset:]
+
+        terms = query_terms(query)
+        hits = []
+        for meeting_id, score in ranked:
+            document = self._documents[meeting_id]
+            snippet = _best_snippet(terms, document.title, document.summary, document.transcript)
+            hits.append(SearchHit(meeting_id, score, snippet))
+        return hits
+
+def create_search_index() -> SearchIndex:
+    backend = settings.SEARCH_BACKEND
+    if backend is None:
+        backend = "postgres" if settings.DATABASE_URL.startswith("postgresql") else "memory"
+    if backend == "postgres":
+        return PostgresSearchIndex()
+    return InMemorySearchIndex()
+
+search_index = create_search_index()
@@ -0,0 +1,292 @@
+"""
+업로드 오디오 저장소
+
+업로드한 오디오를 어디에 둘지 STORAGE_BACKEND 로 선택합니다:
+    - local: UPLOAD_DIR 디렉토리. API 와 워커가 같은 파일시스템을 공유해야 합니다.
+    - s3: S3 호환 오브젝트 스토리지 (AWS S3, MinIO 등). 워커를 API 와 다른 노드에서 실행할 수 있습니다.
+
+Meeting.file_path 에는 파일 경로 대신 저장소 키(예: 2026/10/18/<uuid>.m4a)를 저장합니다.
+쓰기와 읽기는 모두 청크 단위 스트리밍이라 파일 크기와 관계없이 메모리 사용량이 일정합니다.
+S3 는 큰 파일을 multipart 로 올리고, 내려받을 때는 여러 Range 요청을 병렬로 보냅니다.
+boto3 는 동기 라이브러리이므로 블로킹 I/O 는 모두 스레드에서 실행합니다.
+"""
+from app.core.config import settings
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, BinaryIO, Optional
+import asyncio
+import os
+import shutil
+import tempfile
+
+class BlobNotFound(FileNotFoundError):
+    pass
+
+class _LimitedReader:
+    """앞에서부터 length 바이트만 읽는 파일 래퍼 (로컬 파일의 범위 읽기용)"""
+
+    def __init__(self, source: BinaryIO, length: int):
+        self.source = source
+        self.remaining = length
+
+    def read(self, size: int = -1) -> bytes:
+        if self.remaining <= 0:
+            return b""
+        if size < 0 or size > self.remaining:
+            size = self.remaining
+        chunk = self.source.read(size)
+        self.remaining -= len(chunk)
+        return chunk
+
+    def close(self) -> None:
+        self.source.close()
+
+class BlobStorage:
+    """
+    저장소 인터페이스.
+    write / open_range / size / remove / download 는 블로킹 구현이며 (스레드에서 호출),
+    애플리케이션 코드는 put / delete / stat / iter_range / local_copy 를 사용합니다.
+    """
+    name: str = ""
+
+    def write(self, key: str, source: BinaryIO) -> None:
+        """source 를 끝까지 읽어 key 에 저장합니다. source 는 read() 만 있으면 됩니다."""
+        raise NotImplementedError
+
+    def open_range(self, key: str, start: int = 0, end: Optional[int] = None):
+        """[start, end) 바이트를 읽는 read()/close() 객체를 반환합니다. end 가 None 이면 끝까지."""
+        raise NotImplementedError
+
+    def size(self, key: str) -> int:
+        raise NotImplementedError
+
+    def remove(self, key: str) -> None:
+        """없는 키는 무시합니다."""
+        raise NotImplementedError
+
+    def download(self, key: str, path: str) -> None:
+        source = self.open_range(key)
+        try:
+            with open(path, "wb") as f:
+                shutil.copyfileobj(source, f, settings.UPLOAD_CHUNK_SIZE)
+        finally:
+            source.close()
+
+    def local_path(self, key: str) -> Optional[str]:
+        """내려받지 않고 바로 읽을 수 있는 로컬 경로 (없으면 None)"""
+        return None
+
+    async def prepare(self) -> None:
+        """배포 시 한 번 실행 (python -m app.migrate). 버킷 생성 등"""
+
+    async def put(self, key: str, source: BinaryIO) -> None:
+        await asyncio.to_thread(self.write, key, source)
+
+    async def delete(self, key: str) -> None:
+        await asyncio.to_thread(self.remove, key)
+
+    async def stat(self, key: str) -> Optional[int]:
+        """저장된 크기(바이트). 없으면 None"""
+        try:
+            return await asyncio.to_thread(self.size, key)
+        except BlobNotFound:
+            return None
+
+    async def iter_range(self, key: str, start: int = 0, end: Optional[int] = None) -> AsyncIterator[bytes]:
+        source = await asyncio.to_thread(self.open_range, key, start, end)
+        try:
+            while True:
+                chunk = await asyncio.to_thread(source.read, settings.UPLOAD_CHUNK_SIZE)
+                if not chunk:
+                    break
+                yield chunk
+        finally:
+            await asyncio.to_thread(source.close)
+
+    @asynccontextmanager
+    async def local_copy(self, key: str) -> AsyncIterator[str]:
+        """
+        ffmpeg 등 파일 경로가 필요한 작업을 위해 로컬 경로를 제공합니다.
+        로컬 저장소는 원본 경로를 그대로 쓰고, 그 외에는 임시 디렉토리로 내려받은 뒤 블록을 벗어나면 지웁니다.
+        """
+        path = self.local_path(key)
+        if path is not None:
+            if not os.path.exists(path):
+                raise BlobNotFound(key)
+            yield path
+            return
+
+        work_dir = tempfile.mkdtemp(prefix="blob-")
+        try:
+            # 확장자로 형식을 판단하는 도구를 위해 파일 이름은 유지
+            path = os.path.join(work_dir, os.path.basename(key))
+            await asyncio.to_thread(self.download, key, path)
+            yield path
+        finally:
+            await asyncio.to_thread(shutil.rmtree, work_dir, True)
+
+def _remove_quietly(path: str) -> None:
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+class LocalStorage(BlobStorage):
+    name = "local"
+
+    def __init__(self, root: str):
+        self.root = root
+
+    def _path(self, key: str) -> str:
+        # 이전 버전은 file_path 에 UPLOAD_DIR 를 포함한 경로를 저장했으므로 그대로도 찾음
+        if key.startswith(self.root.rstrip("/") + "/"):
+            return key
+        root = os.path.abspath(self.root)
+        path = os.path.abspath(os.path.join(root, key))
+        if not path.startswith(root + os.sep):
+            raise ValueError(f"Invalid storage key: {key}")
+        return path
+
+    def write(self, key: str, source: BinaryIO) -> None:
+        path = self._path(key)
+        # 디렉토리는 import 시점이 아니라 처음 저장할 때 만듦
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        try:
+            with open(path, "wb") as f:
+                shutil.copyfileobj(source, f, settings.UPLOAD_CHUNK_SIZE)
+        except BaseException:
+            _remove_quietly(path)
+            raise
+
+    def open_range(self, key: str, start: int = 0, end: Optional[int] = None):
+        try:
+            f = open(self._path(key), "rb")
+        except FileNotFoundError as e:
+            raise BlobNotFound(key) from e
+        f.seek(start)
+        return f if end is None else _LimitedReader(f, end - start)
+
+    def size(self, key: str) -> int:
+        try:
+            return os.path.getsize(self._path(key))
+        except FileNotFoundError as e:
+            raise BlobNotFound(key) from e
+
+    def remove(self, key: str) -> None:
+        _remove_quietly(self._path(key))
+
+    def local_path(self, key: str) -> Optional[str]:
+        return self._path(key)
+
+class S3Storage(BlobStorage):
+    """
+    S3 호환 저장소. boto3 가 필요합니다 (`pip install boto3`).
+    S3_ENDPOINT_URL 을 지정하면 MinIO 같은 호환 서버를 path-style 주소로 사용합니다.
+    """
+    name = "s3"
+
+    def __init__(self, bucket: str, prefix: str = ""):
+        self.bucket = bucket
+        self.prefix = prefix
+        self._client = None
+        self._transfer_config = None
+
+    @property
+    def client(self):
+        """처음 사용할 때 boto3 를 import 합니다. 클라이언트는 스레드 간에 공유해도 안전합니다."""
+        if self._client is None:
+            import boto3
+            from boto3.s3.transfer import TransferConfig
+            from botocore.config import Config
+
+            self._client = boto3.client(
+                "s3",
+                endpoint_url=settings.S3_ENDPOINT_URL,
+                region_name=settings.S3_REGION,
+                aws_access_key_id=settings.S3_ACCESS_KEY_ID,
+                aws_secret_access_key=settings.S3_SECRET_ACCESS_KEY,
+                config=Config(
+                    # 업로드/다운로드 스레드 수 + 동시에 처리하는 요청 여유분
+                    max_pool_connections=settings.S3_MAX_CONCURRENCY * 4,
+                    retries={"max_attempts": 5, "mode": "standard"},
+                    s3={"addressing_style": "path" if settings.S3_ENDPOINT_URL else "auto"},
+                ),
+            )
+            self._transfer_config = TransferConfig(
+                multipart_threshold=settings.S3_MULTIPART_CHUNK_SIZE,
+                multipart_chunksize=settings.S3_MULTIPART_CHUNK_SIZE,
+                max_concurrency=settings.S3_MAX_CONCURRENCY,
+            )
+        return self._client
+
+    def _key(self, key: str) -> str:
+        return f"{self.prefix}{key}"
+
+    @staticmethod
+    def _is_missing(error) -> bool:
+        code = getattr(error, "response", {}).get("Error", {}).get("Code")
+        return code in ("404", "NoSuchKey", "NotFound")
+
+    def write(self, key: str, source: BinaryIO) -> None:
+        # 읽기만 가능한 스트림은 청크 단위로 읽어 multipart 로 올림 (파일 전체를 메모리에 올리지 않음)
+        self.client.upload_fileobj(source, self.bucket, self._key(key), Config=self._transfer_config)
+
+    def open_range(self, key: str, start: int = 0, end: Optional[int] = None):
+        from botocore.exceptions import ClientError
+
+        options = {}
+        if start or end is not None:
+            options["Range"] = f"bytes={start}-{'' if end is None else end - 1}"
+        try:
+            return self.client.get_object(Bucket=self.bucket, Key=self._key(key), **options)["Body"]
+        except ClientError as e:
+            if self._is_missing(e):
+                raise BlobNotFound(key) from e
+            raise
+
+    def size(self, key: str) -> int:
+        from botocore.exceptions import ClientError
+
+        try:
+            return self.client.head_object(Bucket=self.bucket, Key=self._key(key))["ContentLength"]
+        except ClientError as e:
+            if self._is_missing(e):
+                raise BlobNotFound(key) from e
+            raise
+
+    def remove(self, key: str) -> None:
+        self.client.delete_object(Bucket=self.bucket, Key=self._key(key))
+
+    def download(self, key: str, path: str) -> None:
+        from botocore.exceptions import ClientError
+
+        try:
+            self.client.download_file(self.bucket, self._key(key), path, Config=self._transfer_config)
+        except ClientError as e:
+            if self._is_missing(e):
+                raise BlobNotFound(key) from e
+            raise
+
+    async def prepare(self) -> None:
+        from botocore.exceptions import ClientError
+
+        def ensure_bucket() -> None:
+            try:
+                self.client.head_bucket(Bucket=self.bucket)
+            except ClientError as e:
+                if not self._is_missing(e):
+                    raise
+                self.client.create_bucket(Bucket=self.bucket)
+                print(f"Created bucket {self.bucket}")
+
+        await asyncio.to_thread(ensure_bucket)
+
+def create_storage() -> BlobStorage:
+    if settings.STORAGE_BACKEND == "s3":
+        if not settings.S3_BUCKET:
+            raise ValueError("STORAGE_BACKEND=s3 requires S3_BUCKET to be set.")
+        return S3Storage(settings.S3_BUCKET, settings.S3_PREFIX)
+    if settings.STORAGE_BACKEND == "local":
+        return LocalStorage(settings.UPLOAD_DIR)
+    raise ValueError(f"Unknown STORAGE_BACKEND: {settings.STORAGE_BACKEND}")
+
+storage = create_storage()
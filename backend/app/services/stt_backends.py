@@ -0,0 +1,214 @@
+"""
+STT 엔진 백엔드
+
+STTService 는 파일 분할/캐시/이어 붙이기를 담당하고, 실제 음성 인식은 여기의 백엔드가 수행합니다.
+백엔드는 STT_BACKEND 로 선택합니다:
+    - openai: OpenAI Whisper API (기본값)
+    - local: faster-whisper (CTranslate2) 로 로컬 CPU/GPU 에서 전사.
+      모델 추론은 GIL 을 오래 잡고 CPU 를 많이 쓰므로 별도 프로세스 풀에서 실행해 이벤트 루프를 막지 않습니다.
+      `pip install faster-whisper` 가 필요합니다.
+"""
+from app.core.config import settings
+from app.core import metrics
+from app.core.http import create_http_client
+from app.core.rate_limit import create_limiter
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+import asyncio
+import importlib.util
+import multiprocessing
+
+# 모든 전사 요청이 공유하는 OpenAI 요청 제한
+openai_limiter = create_limiter(
+    "openai",
+    settings.OPENAI_MAX_CONCURRENCY,
+    settings.OPENAI_RATE_LIMIT_PER_SECOND,
+    settings.OPENAI_RATE_LIMIT_BURST,
+    settings.OPENAI_MAX_RETRIES,
+)
+
+@dataclass
+class TranscriptSegment:
+    start: float
+    end: float
+    text: str
+    speaker: Optional[str] = None  # 화자 분리를 지원하는 모델만 채움
+
+def join_segments(segments: List[TranscriptSegment]) -> str:
+    return " ".join(segment.text.strip() for segment in segments if segment.text.strip())
+
+class STTBackend:
+    # 캐시 키에 쓰이는 엔진/모델 이름. 엔진이 바뀌면 이전 결과를 재사용하지 않음
+    name: str = ""
+    # 한 번에 보낼 수 있는 최대 파일 크기 (None 이면 제한 없음)
+    max_file_bytes: Optional[int] = None
+
+    def check_available(self) -> None:
+        """사용할 수 없는 설정이면 ValueError 를 던집니다."""
+
+    async def transcribe(self, file_path: str) -> str:
+        raise NotImplementedError
+
+    async def transcribe_segments(self, file_path: str, duration: float) -> List[TranscriptSegment]:
+        """파일 시작 기준(0초) 시각의 세그먼트 목록을 반환합니다. duration 은 파일 길이(초)입니다."""
+        raise NotImplementedError
+
+    async def close(self) -> None:
+        pass
+
+class OpenAISTTBackend(STTBackend):
+    # Whisper API 업로드 한도(25MB)보다 약간 작게 잡은 값
+    max_file_bytes = 24 * 1024 * 1024
+
+    def __init__(self, client=None):
+        self.name = settings.STT_MODEL
+        self.limiter = openai_limiter
+        self._client = client
+        if client is None and not settings.OPENAI_API_KEY:
+            print("Warning: OPENAI_API_KEY is not set.")
+
+    @property
+    def client(self):
+        """처음 사용할 때 SDK 를 import 해 클라이언트를 만들고, 이후 요청은 이 클라이언트의 커넥션 풀을 재사용합니다."""
+        if self._client is None and settings.OPENAI_API_KEY:
+            from openai import AsyncOpenAI, DefaultAsyncHttpxClient
+            http_client = create_http_client(
+                "openai",
+                settings.OPENAI_TIMEOUT_SECONDS,
+                settings.OPENAI_MAX_CONCURRENCY,
+                client_class=DefaultAsyncHttpxClient,
+            )
+            # 재시도는 openai_limiter 가 담당하므로 SDK 자체 재시도는 끔
+            self._client = AsyncOpenAI(
+                api_key=settings.OPENAI_API_KEY,
+                base_url=settings.OPENAI_BASE_URL,
+                max_retries=0,
+                http_client=http_client,
+            )
+        return self._client
+
+    def check_available(self) -> None:
+        if not self.client:
+            raise ValueError("OpenAI API Key is not configured.")
+
+    async def _create_transcription(self, file_path: str, **options):
+        async def request():
+            # 재시도할 때마다 파일을 처음부터 다시 읽음
+            with open(file_path, "rb") as audio_file:
+                return await self.client.audio.transcriptions.create(
+                    model=settings.STT_MODEL,
+                    file=audio_file,
+                    **options
+                )
+        return await self.limiter.call(request, "transcription")
+
+    async def transcribe(self, file_path: str) -> str:
+        transcript = await self._create_transcription(file_path)
+        return transcript.text
+
+    async def transcribe_segments(self, file_path: str, duration: float) -> List[TranscriptSegment]:
+        transcript = await self._create_transcription(
+            file_path,
+            response_format="verbose_json",
+            timestamp_granularities=["segment"],
+        )
+        segments = getattr(transcript, "segments", None) or []
+        if not segments:
+            # 세그먼트 정보가 없으면 파일 전체를 하나의 세그먼트로 취급
+            return [TranscriptSegment(0.0, duration, transcript.text)]
+        return [
+            TranscriptSegment(segment.start, segment.end, segment.text, getattr(segment, "speaker", None))
+            for segment in segments
+        ]
+
+# --- 로컬 엔진 (프로세스 풀 워커에서 실행) ---
+
+# 워커 프로세스마다 한 번만 로드하는 모델
+_local_model = None
+
+def _load_local_model(model_size: str, device: str, compute_type: str, cpu_threads: int) -> None:
+    """프로세스 풀 initializer. 워커가 뜰 때 모델을 한 번 로드합니다."""
+    global _local_model
+    from faster_whisper import WhisperModel
+    _local_model = WhisperModel(model_size, device=device, compute_type=compute_type, cpu_threads=cpu_threads)
+
+def _local_transcribe(file_path: str, beam_size: int, language: Optional[str]) -> List[Tuple[float, float, str]]:
+    segments, _ = _local_model.transcribe(file_path, beam_size=beam_size, language=language, vad_filter=True)
+    # segments 는 지연 평가되는 제너레이터이므로 워커 안에서 끝까지 소비한 뒤 돌려줌
+    return [(segment.start, segment.end, segment.text) for segment in segments]
+
+class LocalWhisperBackend(STTBackend):
+    """
+    faster-whisper 로 로컬에서 전사합니다.
+
+    STT_LOCAL_WORKERS 개의 프로세스가 각자 모델을 메모리에 올려두고 요청을 나눠 처리합니다.
+    워커 수 × STT_LOCAL_CPU_THREADS 가 사용 가능한 코어 수를 넘지 않도록 설정하세요.
+    """
+
+    def __init__(self):
+        self.name = f"local:{settings.STT_LOCAL_MODEL}:{settings.STT_LOCAL_COMPUTE_TYPE}"
+        self._pool: Optional[ProcessPoolExecutor] = None
+
+    def check_available(self) -> None:
+        if importlib.util.find_spec("faster_whisper") is None:
+            raise ValueError("STT_BACKEND=local requires the faster-whisper package to be installed.")
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(
+                max_workers=settings.STT_LOCAL_WORKERS,
+                # fork 는 이벤트 루프/DB 커넥션 상태까지 복사하므로 spawn 으로 깨끗한 프로세스를 띄움
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_load_local_model,
+                initargs=(
+                    settings.STT_LOCAL_MODEL,
+                    settings.STT_LOCAL_DEVICE,
+                    settings.STT_LOCAL_COMPUTE_TYPE,
+                    settings.STT_LOCAL_CPU_THREADS,
+                ),
+            )
+        return self._pool
+
+    def _discard_pool(self, pool: ProcessPoolExecutor) -> None:
+        """
+        워커 프로세스가 죽어 (OOM 등) 망가진 풀을 버립니다. 다음 요청은 새 풀을 만듭니다.
+        동시에 실행 중이던 요청이 모두 같은 오류를 받으므로, 아직 그 풀을 쓰고 있을 때만 교체합니다.
+        """
+        if self._pool is pool:
+            self._pool = None
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    async def transcribe_segments(self, file_path: str, duration: float = 0.0) -> List[TranscriptSegment]:
+        loop = asyncio.get_running_loop()
+        for attempt in range(2):
+            pool = self._get_pool()
+            try:
+                with metrics.external_request("stt_local", "transcribe"):
+                    results = await loop.run_in_executor(
+                        pool, _local_transcribe, file_path, settings.STT_LOCAL_BEAM_SIZE, settings.STT_LANGUAGE
+                    )
+                break
+            except BrokenProcessPool:
+                self._discard_pool(pool)
+                if attempt:
+                    raise
+                print(f"Local STT worker process died. Restarting the pool and retrying {file_path}")
+        return [TranscriptSegment(start, end, text) for start, end, text in results]
+
+    async def transcribe(self, file_path: str) -> str:
+        return join_segments(await self.transcribe_segments(file_path))
+
+    async def close(self) -> None:
+        if self._pool is not None:
+            pool, self._pool = self._pool, None
+            await asyncio.to_thread(pool.shutdown, True, cancel_futures=True)
+
+def create_stt_backend(name: Optional[str] = None) -> STTBackend:
+    name = name or settings.STT_BACKEND
+    if name == "local":
+        return LocalWhisperBackend()
+    if name == "openai":
+        return OpenAISTTBackend()
+    raise ValueError(f"Unknown STT_BACKEND: {name}")
@@ -1,30 +1,236 @@
-from openai import AsyncOpenAI
 from app.core.config import settings
+from app.core import metrics
+from app.services import audio_utils
+from app.services.cache import result_cache, sha256_file
+from app.services.storage import storage
+from app.services.stt_backends import STTBackend, TranscriptSegment, create_stt_backend, join_segments
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+import asyncio
+import json
 import os
+import shutil
+import tempfile
+import time
+
+def stitch_segments(chunks: List[Tuple[float, float, List[TranscriptSegment]]]) -> List[TranscriptSegment]:
+    """
+    겹치게 잘린 구간들의 세그먼트를 하나로 이어 붙입니다.
+
+    chunks 는 (구간 시작, 구간 끝, 절대 시각으로 보정된 세그먼트) 목록입니다.
+    인접 구간이 겹치는 영역의 중간 지점을 경계로 삼아, 앞 구간에서는 경계 이전에 시작한
+    세그먼트만, 뒤 구간에서는 경계 이후에 시작한 세그먼트만 남깁니다.
+    경계 바로 양쪽에 같은 문장이 남으면 한 번만 사용합니다.
+    세그먼트가 하나뿐인 구간(STT 가 구간 전체를 한 세그먼트로 돌려준 경우)은 겹치는 영역에서 시작하더라도 버리지 않습니다.
+    """
+    stitched: List[TranscriptSegment] = []
+    for i, (start, end, segments) in enumerate(chunks):
+        lower = float("-inf")
+        upper = float("inf")
+        if i > 0:
+            prev_end = chunks[i - 1][1]
+            lower = (start + prev_end) / 2
+        if i + 1 < len(chunks):
+            next_start = chunks[i + 1][0]
+            upper = (next_start + end) / 2
+        if len(segments) == 1:
+            lower = float("-inf")
+        at_seam = i > 0
+        for segment in segments:
+            if not (lower <= segment.start < upper):
+                continue
+            if at_seam and stitched and segment.text.strip() == stitched[-1].text.strip():
+                at_seam = False
+                continue
+            at_seam = False
+            stitched.append(segment)
+    return stitched
+
+@dataclass
+class Transcript:
+    """전사 결과. 세그먼트 시각은 원본 오디오 기준(초)입니다."""
+    text: str
+    segments: List[TranscriptSegment]
+
+    def to_json(self) -> str:
+        segments = [[segment.start, segment.end, segment.text, segment.speaker] for segment in self.segments]
+        return json.dumps({"text": self.text, "segments": segments}, ensure_ascii=False)
+
+    @classmethod
+    def from_json(cls, raw: str) -> "Transcript":
+        data = json.loads(raw)
+        return cls(data["text"], [TranscriptSegment(*segment) for segment in data["segments"]])
 
 class STTService:
-    def __init__(self):
-        # Ensure API key is present
-        if settings.OPENAI_API_KEY:
-            self.client = AsyncOpenAI(api_key=settings.OPENAI_API_KEY)
-        else:
-            print("Warning: OPENAI_API_KEY is not set.")
-            self.client = None
+    def __init__(self, backend: Optional[STTBackend] = None):
+        # 엔진은 STT_BACKEND 로 선택 (openai / local)
+        self.backend = backend or create_stt_backend()
+        # ffmpeg 변환은 CPU 를 많이 쓰므로 동시에 실행되는 수를 제한
+        self._preprocess_limit = asyncio.Semaphore(settings.STT_PREPROCESS_CONCURRENCY)
+
+    async def transcribe(self, file_path: str, content_hash: Optional[str] = None) -> Transcript:
+        """
+        오디오를 전사해 전체 텍스트와 세그먼트를 반환합니다. 같은 내용(SHA-256)의 파일은 캐시된 결과를 재사용합니다.
+        content_hash 를 넘기지 않으면 파일을 읽어 계산합니다.
+        """
+        self.backend.check_available()
 
-    async def transcribe(self, file_path: str) -> str:
-        if not self.client:
-            raise ValueError("OpenAI API Key is not configured.")
-            
         if not os.path.exists(file_path):
             raise FileNotFoundError(f"File not found: {file_path}")
-            
-        with open(file_path, "rb") as audio_file:
-            # Using Whisper-1 model
-            transcript = await self.client.audio.transcriptions.create(
-                model="whisper-1",
-                file=audio_file
+
+        if content_hash is None:
+            content_hash = await asyncio.to_thread(sha256_file, file_path)
+
+        async def compute() -> str:
+            return (await self._transcribe(file_path)).to_json()
+
+        return Transcript.from_json(await result_cache.get_or_compute("stt", self._cache_key(content_hash), compute))
+
+    async def transcribe_stored(self, key: str, content_hash: Optional[str] = None) -> Transcript:
+        """
+        저장소에 있는 오디오를 전사합니다.
+        캐시를 먼저 확인하고, 실제로 전사할 때만 로컬 경로로 가져옵니다 (S3 는 병렬 Range 요청으로 내려받음).
+        """
+        self.backend.check_available()
+
+        if content_hash is None:
+            async with storage.local_copy(key) as file_path:
+                return await self.transcribe(file_path)
+
+        async def compute() -> str:
+            async with storage.local_copy(key) as file_path:
+                return (await self._transcribe(file_path)).to_json()
+
+        return Transcript.from_json(await result_cache.get_or_compute("stt", self._cache_key(content_hash), compute))
+
+    def _cache_key(self, content_hash: str) -> str:
+        # 세그먼트를 저장하기 전의 캐시 항목(텍스트만)과 섞이지 않도록 키를 구분
+        return f"{self.backend.name}:segments:{content_hash}"
+
+    async def _transcribe(self, file_path: str) -> Transcript:
+        # 전처리(무음 제거) 전 원본 길이를 기록해야 실제 회의 길이와 맞음
+        duration = await self._probe_duration(file_path)
+        if duration is not None:
+            metrics.record_audio_seconds(self.backend.name, duration)
+        if not settings.STT_PREPROCESS:
+            return await self._transcribe_file(file_path, duration)
+
+        work_dir = tempfile.mkdtemp(prefix="stt-pre-")
+        try:
+            processed = await self.preprocess(file_path, os.path.join(work_dir, "audio"))
+            if processed is None:
+                return await self._transcribe_file(file_path, duration)
+            processed_path, timeline = processed
+            transcript = await self._transcribe_file(processed_path)
+        finally:
+            await asyncio.to_thread(shutil.rmtree, work_dir, True)
+
+        if timeline is not None:
+            # 무음을 줄인 오디오 기준 시각을 원본 기준으로 되돌림
+            for segment in transcript.segments:
+                segment.start = timeline.to_original(segment.start)
+                segment.end = timeline.to_original(segment.end)
+        return transcript
+
+    async def _transcribe_file(self, file_path: str, duration: Optional[float] = None) -> Transcript:
+        """duration 을 모르면 (전처리한 파일 등) 파일에서 직접 길이를 읽습니다."""
+        if duration is None:
+            duration = await self._probe_duration(file_path)
+        if settings.STT_CHUNKED and self._should_chunk(file_path, duration):
+            segments = await self.transcribe_chunked(file_path, duration)
+        else:
+            segments = await self.backend.transcribe_segments(file_path, duration or 0.0)
+        return Transcript(join_segments(segments), segments)
+
+    async def preprocess(
+        self, file_path: str, out_base: str
+    ) -> Optional[Tuple[str, Optional[audio_utils.TrimmedTimeline]]]:
+        """
+        STT 전에 모노 16kHz 로 변환하고 긴 무음을 줄여 압축한 파일 경로와, 줄인 오디오의 시각을
+        원본 시각으로 되돌리는 TrimmedTimeline (무음을 줄이지 않으면 None) 을 반환합니다.
+        업로드 크기와 전사 시간이 줄어듭니다. ffmpeg 를 쓸 수 없으면 None 을 반환해 원본을 그대로 사용합니다.
+        """
+        silence = ""
+        if settings.STT_TRIM_SILENCE:
+            silence = audio_utils.silence_filter(settings.STT_SILENCE_DB, settings.STT_TRIM_SILENCE_SECONDS)
+        started = time.perf_counter()
+        try:
+            async with self._preprocess_limit:
+                out_path, silences = await audio_utils.preprocess(
+                    file_path, out_base, settings.STT_PREPROCESS_CODEC, settings.STT_PREPROCESS_BITRATE, silence
+                )
+        except audio_utils.AudioProcessingError as e:
+            print(f"Audio preprocessing failed, using original file: {e}")
+            return None
+        original_size = os.path.getsize(file_path)
+        processed_size = os.path.getsize(out_path)
+        print(
+            f"Preprocessed {file_path}: {original_size} -> {processed_size} bytes "
+            f"({processed_size / max(original_size, 1):.1%}, {time.perf_counter() - started:.1f}s)"
+        )
+        timeline = None
+        if settings.STT_TRIM_SILENCE:
+            timeline = audio_utils.TrimmedTimeline(silences, settings.STT_TRIM_SILENCE_SECONDS)
+        return out_path, timeline
+
+    async def _probe_duration(self, file_path: str) -> Optional[float]:
+        try:
+            return await audio_utils.probe_duration(file_path)
+        except (audio_utils.AudioProcessingError, ValueError) as e:
+            print(f"Could not probe audio duration: {e}")
+            return None
+
+    def _should_chunk(self, file_path: str, duration: Optional[float]) -> bool:
+        max_bytes = self.backend.max_file_bytes
+        if max_bytes is not None and os.path.getsize(file_path) > max_bytes:
+            return True
+        # 길이를 알 수 없으면 한 번에 전사
+        return duration is not None and duration > settings.STT_CHUNK_SECONDS
+
+    async def _transcribe_segments(self, file_path: str, offset: float, end: float) -> List[TranscriptSegment]:
+        """한 구간을 전사하고 세그먼트 시각을 원본 기준 절대 시각으로 보정합니다."""
+        segments = await self.backend.transcribe_segments(file_path, end - offset)
+        return [
+            TranscriptSegment(offset + segment.start, offset + segment.end, segment.text, segment.speaker)
+            for segment in segments
+        ]
+
+    async def transcribe_chunked(self, file_path: str, duration: Optional[float] = None) -> List[TranscriptSegment]:
+        """
+        긴 녹음을 무음 지점 기준으로 겹치게 나눈 뒤 병렬로 전사하고 세그먼트를 이어 붙입니다.
+        동시 요청 수는 STT_CHUNK_CONCURRENCY 로 제한합니다 (로컬 엔진은 프로세스 풀 크기로도 제한됨).
+        """
+        if duration is None:
+            duration = await audio_utils.probe_duration(file_path)
+        silences = await audio_utils.detect_silences(
+            file_path, settings.STT_SILENCE_DB, settings.STT_MIN_SILENCE_SECONDS
+        )
+        chunks = audio_utils.plan_chunks(
+            duration, silences, settings.STT_CHUNK_SECONDS, settings.STT_CHUNK_OVERLAP_SECONDS
+        )
+        print(f"Transcribing {file_path} in {len(chunks)} chunks ({duration:.0f}s total)")
+
+        semaphore = asyncio.Semaphore(settings.STT_CHUNK_CONCURRENCY)
+        work_dir = tempfile.mkdtemp(prefix="stt-")
+
+        async def transcribe_chunk(index: int, start: float, end: float):
+            async with semaphore:
+                chunk_path = os.path.join(work_dir, f"chunk_{index:04d}.mp3")
+                await audio_utils.extract_segment(file_path, start, end, chunk_path)
+                segments = await self._transcribe_segments(chunk_path, start, end)
+                os.remove(chunk_path)
+                return (start, end, segments)
+
+        try:
+            results = await asyncio.gather(
+                *(transcribe_chunk(i, start, end) for i, (start, end) in enumerate(chunks))
             )
-        return transcript.text
+        finally:
+            await asyncio.to_thread(shutil.rmtree, work_dir, True)
 
-stt_service = STTService()
+        return stitch_segments(list(results))
+
+    async def close(self) -> None:
+        await self.backend.close()
 
+stt_service = STTService()
@@ -0,0 +1,54 @@
+"""
+토큰 수 기준 텍스트 분할
+
+정확한 토크나이저 호출 없이 토큰 수를 보수적으로 추정합니다.
+한글/한자 등 비 ASCII 문자는 글자당 1토큰, ASCII 텍스트는 4글자당 1토큰으로 계산합니다.
+"""
+from typing import List
+import re
+
+_SENTENCE_END = re.compile(r"(?<=[.!?。？！])\s+|\n+")
+
+def estimate_tokens(text: str) -> int:
+    ascii_chars = 0
+    other_chars = 0
+    for ch in text:
+        if ch.isspace():
+            continue
+        if ord(ch) < 128:
+            ascii_chars += 1
+        else:
+            other_chars += 1
+    return other_chars + (ascii_chars + 3) // 4
+
+def split_sentences(text: str) -> List[str]:
+    return [s.strip() for s in _SENTENCE_END.split(text) if s and s.strip()]
+
+def chunk_text(text: str, max_tokens: int) -> List[str]:
+    """
+    문장 경계를 유지하면서 각 조각이 max_tokens 를 넘지 않도록 나눕니다.
+    한 문장이 max_tokens 보다 길면 글자 단위로 자릅니다.
+    """
+    chunks: List[str] = []
+    current: List[str] = []
+    current_tokens = 0
+
+    for sentence in split_sentences(text):
+        tokens = estimate_tokens(sentence)
+        if tokens > max_tokens:
+            if current:
+                chunks.append(" ".join(current))
+                current, current_tokens = [], 0
+            # 토큰당 최소 1글자이므로 max_tokens 글자 단위로 자르면 한도를 넘지 않음
+            for i in range(0, len(sentence), max_tokens):
+                chunks.append(sentence[i:i + max_tokens])
+            continue
+        if current and current_tokens + tokens > max_tokens:
+            chunks.append(" ".join(current))
+            current, current_tokens = [], 0
+        current.append(sentence)
+        current_tokens += tokens
+
+    if current:
+        chunks.append(" ".join(current))
+    return chunks
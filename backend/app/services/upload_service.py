@@ -0,0 +1,174 @@
+from fastapi import UploadFile
+from app.core.config import settings
+from app.services.storage import storage
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import BinaryIO, List, Optional, Tuple, Union
+import asyncio
+import hashlib
+import os
+import tarfile
+import time
+import uuid
+import zipfile
+
+# 일괄 업로드에서 회의로 등록하는 확장자 (Whisper API 지원 형식 + 녹음기에서 흔한 형식)
+AUDIO_EXTENSIONS = {"mp3", "mp4", "mpeg", "mpga", "m4a", "wav", "webm", "ogg", "opus", "flac", "aac"}
+ARCHIVE_SUFFIXES = (".zip", ".tar", ".tar.gz", ".tgz", ".tar.bz2", ".tar.xz")
+
+class UploadTooLargeError(Exception):
+    """업로드 크기가 MAX_UPLOAD_SIZE_MB 를 초과한 경우"""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        super().__init__(f"Upload exceeds maximum size of {max_bytes} bytes")
+
+@dataclass
+class UploadResult:
+    key: str
+    size: int
+    sha256: str
+    elapsed: float
+
+    @property
+    def bytes_per_sec(self) -> float:
+        return self.size / self.elapsed if self.elapsed > 0 else float(self.size)
+
+class _HashingReader:
+    """
+    저장소로 흘려보내는 스트림을 읽으면서 SHA-256 과 크기를 계산합니다.
+    최대 크기를 넘는 순간 UploadTooLargeError 를 던져 저장을 중단시킵니다.
+    """
+
+    def __init__(self, source: BinaryIO, max_bytes: int):
+        self.source = source
+        self.max_bytes = max_bytes
+        self.hasher = hashlib.sha256()
+        self.size = 0
+
+    def read(self, size: int = -1) -> bytes:
+        chunk = self.source.read(size)
+        self.size += len(chunk)
+        if self.size > self.max_bytes:
+            raise UploadTooLargeError(self.max_bytes)
+        # hashlib 은 큰 버퍼에서 GIL 을 놓으므로 저장 스레드에서 함께 계산
+        self.hasher.update(chunk)
+        return chunk
+
+# 아카이브 항목별 결과: 저장 결과 또는 건너뛴 이유
+ArchiveEntry = Tuple[str, Union[UploadResult, str]]
+
+class UploadService:
+    def __init__(self, max_bytes: int = None):
+        self.max_bytes = max_bytes or settings.MAX_UPLOAD_SIZE_MB * 1024 * 1024
+
+    def check_content_length(self, content_length: Optional[str], max_bytes: Optional[int] = None) -> None:
+        """
+        요청 헤더의 Content-Length 로 파일을 읽기 전에 크기 제한을 검사합니다.
+        multipart 오버헤드를 감안해 약간의 여유를 둡니다.
+        """
+        if not content_length:
+            return
+        try:
+            length = int(content_length)
+        except ValueError:
+            return
+        max_bytes = max_bytes or self.max_bytes
+        if length > max_bytes + 64 * 1024:
+            raise UploadTooLargeError(max_bytes)
+
+    def new_key(self, filename: str) -> str:
+        """
+        원본 파일명은 제목으로만 쓰고, 저장소 키는 날짜 + UUID 로 만듭니다 (확장자만 유지).
+        날짜별로 나눠 두면 한 디렉토리에 파일이 끝없이 쌓이지 않고, 기간별로 정리하기도 쉽습니다.
+        """
+        file_ext = filename.split(".")[-1]
+        return f"{datetime.now(timezone.utc):%Y/%m/%d}/{uuid.uuid4()}.{file_ext}"
+
+    @staticmethod
+    def is_audio(filename: str) -> bool:
+        return "." in filename and filename.rsplit(".", 1)[-1].lower() in AUDIO_EXTENSIONS
+
+    @staticmethod
+    def is_archive(filename: str) -> bool:
+        return filename.lower().endswith(ARCHIVE_SUFFIXES)
+
+    async def save(self, file: UploadFile, key: str) -> UploadResult:
+        """
+        업로드 파일을 청크 단위로 저장소에 저장합니다.
+
+        블로킹 I/O 는 스레드에서 수행하고, 저장과 동시에 SHA-256 해시를 계산하며,
+        최대 크기를 넘는 순간 중단하고 부분 저장된 객체를 삭제합니다.
+        """
+        if file.size is not None and file.size > self.max_bytes:
+            raise UploadTooLargeError(self.max_bytes)
+
+        result = await asyncio.to_thread(self._store_stream, file.file, key)
+        print(
+            f"Upload saved to {storage.name}:{key}: {result.size} bytes in {result.elapsed:.2f}s "
+            f"({result.bytes_per_sec / (1024 * 1024):.1f} MB/s)"
+        )
+        return result
+
+    async def discard(self, key: str) -> None:
+        await storage.delete(key)
+
+    def _store_stream(self, source: BinaryIO, key: str) -> UploadResult:
+        """source 를 끝까지 읽어 저장소의 key 에 저장합니다 (스레드에서 실행)."""
+        reader = _HashingReader(source, self.max_bytes)
+        started = time.perf_counter()
+        try:
+            storage.write(key, reader)
+        except BaseException:
+            storage.remove(key)
+            raise
+        return UploadResult(key, reader.size, reader.hasher.hexdigest(), time.perf_counter() - started)
+
+    def _extract_entry(self, name: str, open_member) -> ArchiveEntry:
+        title = os.path.basename(name)
+        try:
+            with open_member() as source:
+                return title, self._store_stream(source, self.new_key(title))
+        except UploadTooLargeError as e:
+            return title, str(e)
+
+    def _extract_archive(self, fileobj: BinaryIO, filename: str, limit: int) -> List[ArchiveEntry]:
+        entries: List[ArchiveEntry] = []
+
+        def wanted(name: str) -> bool:
+            # macOS 가 만드는 메타데이터/숨김 파일과 오디오가 아닌 파일은 조용히 건너뜀
+            title = os.path.basename(name)
+            return not name.startswith("__MACOSX/") and not title.startswith(".") and self.is_audio(title)
+
+        def add(name: str, open_member) -> None:
+            if len(entries) >= limit:
+                entries.append((os.path.basename(name), "Too many files in one bulk upload"))
+            else:
+                entries.append(self._extract_entry(name, open_member))
+
+        if filename.lower().endswith(".zip"):
+            # zip 은 목록이 파일 끝에 있어 seek 가 필요 (업로드 파일은 디스크에 임시 저장되어 있음)
+            with zipfile.ZipFile(fileobj) as archive:
+                for info in archive.infolist():
+                    if not info.is_dir() and wanted(info.filename):
+                        add(info.filename, lambda info=info: archive.open(info))
+        else:
+            # tar 는 스트림 모드로 앞에서부터 한 항목씩 읽음
+            with tarfile.open(fileobj=fileobj, mode="r|*") as archive:
+                for member in archive:
+                    if member.isfile() and wanted(member.name):
+                        add(member.name, lambda member=member: archive.extractfile(member))
+        return entries
+
+    async def extract_archive(self, file: UploadFile, limit: int) -> List[ArchiveEntry]:
+        """
+        zip/tar 아카이브의 오디오 파일을 하나씩 저장소로 복사합니다.
+        아카이브 전체를 메모리나 임시 디렉토리에 풀지 않고, 항목마다 청크 단위로 읽어 바로 저장합니다.
+        limit 를 넘는 항목과 최대 크기를 넘는 항목은 저장하지 않고 이유와 함께 돌려줍니다.
+        """
+        try:
+            return await asyncio.to_thread(self._extract_archive, file.file, file.filename, limit)
+        except (zipfile.BadZipFile, tarfile.TarError) as e:
+            return [(file.filename, f"Invalid archive: {e}")]
+
+upload_service = UploadService()
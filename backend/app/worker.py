@@ -0,0 +1,162 @@
+"""
+파이프라인 워커
+
+작업 큐에서 회의 처리 작업을 꺼내 실행합니다. 처리량은 워커 프로세스를 추가해 확장합니다.
+
+    python -m app.worker
+"""
+from app.core.config import settings
+from app.core import metrics
+from app.core.http import close_http_clients
+from app.core.rate_limit import ProviderUnavailable
+from app.core.redis import close_redis
+from app.services.job_queue import Job, JobQueue, job_queue
+from app.services.pipeline import (
+    heartbeat,
+    requeue_stale_pending,
+    reset_stale_meetings,
+    reset_stale_publishes,
+    run_pipeline,
+    run_publish,
+)
+from app.services.stt_service import stt_service
+from prometheus_client import start_http_server
+from typing import List
+import asyncio
+import random
+import signal
+import uuid
+
+class Worker:
+    def __init__(self, queue: JobQueue, concurrency: int = None):
+        self.queue = queue
+        self.concurrency = concurrency or settings.WORKER_CONCURRENCY
+        self.handlers = {
+            "pipeline": run_pipeline,
+            "publish": run_publish,
+        }
+        self._stopping = asyncio.Event()
+        self._tasks: List[asyncio.Task] = []
+
+    def retry_delay(self, attempt: int) -> float:
+        """지수 백오프 + 지터"""
+        base = settings.JOB_RETRY_BACKOFF_SECONDS * (2 ** attempt)
+        delay = min(base, settings.JOB_RETRY_BACKOFF_MAX_SECONDS)
+        return delay * random.uniform(0.5, 1.0)
+
+    async def handle(self, job: Job) -> None:
+        handler = self.handlers.get(job.kind)
+        if handler is None:
+            print(f"Unknown job kind: {job.kind}")
+            return
+
+        final_attempt = job.attempt >= settings.JOB_MAX_RETRIES
+        beat = asyncio.create_task(self._heartbeat(job))
+        try:
+            await handler(uuid.UUID(job.meeting_id), final_attempt=final_attempt)
+        except ProviderUnavailable as e:
+            # 프로바이더가 회복될 때까지 미루고 재시도 횟수는 쓰지 않음
+            delay = e.retry_after * random.uniform(1.0, 1.5)
+            metrics.JOB_DEFERRALS.labels(job.kind).inc()
+            print(f"Job {job.kind} for {job.meeting_id} deferred for {delay:.1f}s: {e}")
+            await self.queue.enqueue(Job(kind=job.kind, meeting_id=job.meeting_id, attempt=job.attempt), delay=delay)
+        except Exception as e:
+            if final_attempt:
+                metrics.JOB_FAILURES.labels(job.kind).inc()
+                print(f"Job {job.kind} for {job.meeting_id} failed permanently after {job.attempt + 1} attempts: {e}")
+                return
+            delay = self.retry_delay(job.attempt)
+            metrics.JOB_RETRIES.labels(job.kind).inc()
+            print(f"Job {job.kind} for {job.meeting_id} failed (attempt {job.attempt + 1}), retrying in {delay:.1f}s")
+            await self.queue.enqueue(Job(kind=job.kind, meeting_id=job.meeting_id, attempt=job.attempt + 1), delay=delay)
+        finally:
+            beat.cancel()
+
+    async def _heartbeat(self, job: Job) -> None:
+        """
+        작업이 끝날 때까지 JOB_HEARTBEAT_SECONDS 마다 회의의 updated_at 과 큐의 가시성 제한 시간을 갱신합니다.
+        워커가 살아 있는 동안에는 단계가 아무리 길어도 stale sweep 이나 큐 회수 대상이 되지 않습니다.
+        """
+        while True:
+            await asyncio.sleep(settings.JOB_HEARTBEAT_SECONDS)
+            try:
+                await self.queue.touch(job)
+                await heartbeat(uuid.UUID(job.meeting_id), job.kind)
+            except Exception as e:
+                print(f"Heartbeat failed for job {job.kind} {job.meeting_id}: {e}")
+
+    async def _consume(self) -> None:
+        while not self._stopping.is_set():
+            try:
+                job = await self.queue.dequeue(timeout=1.0)
+            except Exception as e:
+                print(f"Queue dequeue error: {e}")
+                await asyncio.sleep(1.0)
+                continue
+            if job is None:
+                continue
+            try:
+                await self.handle(job)
+            except Exception as e:
+                print(f"Unexpected error handling job {job.id}: {e}")
+            finally:
+                await self.queue.ack(job)
+
+    async def _sweep_stale(self) -> None:
+        while not self._stopping.is_set():
+            try:
+                for meeting_id in await reset_stale_meetings(settings.STALE_PROCESSING_SECONDS):
+                    print(f"Requeueing stale meeting {meeting_id}")
+                    await self.queue.enqueue(Job(kind="pipeline", meeting_id=str(meeting_id)))
+                for meeting_id in await reset_stale_publishes(settings.STALE_PROCESSING_SECONDS):
+                    print(f"Requeueing stale Notion publish for meeting {meeting_id}")
+                    await self.queue.enqueue(Job(kind="publish", meeting_id=str(meeting_id)))
+                for kind, meeting_id in await requeue_stale_pending(settings.STALE_PENDING_SECONDS):
+                    print(f"Requeueing {kind} job for meeting {meeting_id} left pending")
+                    await self.queue.enqueue(Job(kind=kind, meeting_id=str(meeting_id)))
+                requeued = await self.queue.requeue_expired()
+                if requeued:
+                    print(f"Requeued {requeued} jobs abandoned by dead workers")
+            except Exception as e:
+                print(f"Stale meeting sweep failed: {e}")
+            try:
+                await asyncio.wait_for(self._stopping.wait(), timeout=settings.STALE_SWEEP_INTERVAL_SECONDS)
+            except asyncio.TimeoutError:
+                pass
+
+    def request_stop(self) -> None:
+        self._stopping.set()
+
+    def start(self) -> None:
+        self._tasks = [asyncio.create_task(self._consume()) for _ in range(self.concurrency)]
+        self._tasks.append(asyncio.create_task(self._sweep_stale()))
+        print(f"Worker started with concurrency={self.concurrency}")
+
+    async def stop(self) -> None:
+        """진행 중인 작업이 끝날 때까지 기다린 뒤 종료합니다."""
+        self._stopping.set()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def run(self) -> None:
+        self.start()
+        await self._stopping.wait()
+        await self.stop()
+
+async def main() -> None:
+    worker = Worker(job_queue)
+    if settings.WORKER_METRICS_PORT:
+        # 별도 워커 프로세스의 지표는 API 의 /metrics 에 포함되지 않으므로 따로 노출
+        start_http_server(settings.WORKER_METRICS_PORT)
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, worker.request_stop)
+    try:
+        await worker.run()
+    finally:
+        await stt_service.close()
+        await close_http_clients()
+        await close_redis()
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,74 @@
+"""
+Markdown → Notion 블록 컴파일러 마이크로 벤치마크
+
+요약 크기를 두 배씩 늘려가며 변환 시간을 측정합니다.
+처리량(MB/s)이 크기와 관계없이 비슷하게 유지되면 선형 시간으로 동작하는 것입니다.
+
+    cd backend
+    python -m benchmarks.bench_markdown_to_notion --max-mb 8
+"""
+from app.services.markdown_to_notion import markdown_to_blocks
+import argparse
+import time
+
+SECTION = """# 회의 요약
+
+이번 회의에서는 **3분기 로드맵**과 *채용 계획*을 논의했습니다. 자세한 내용은 [위키](https://example.com/wiki)를 참고하세요.
+배포 일정은 `v2.3` 기준으로 ~~다음 주~~ 이번 주 금요일로 확정했습니다.
+
+## 주요 논의 사항
+
+- STT 처리 시간 단축 방안
+  - 긴 녹음 분할 전사
+    - 무음 구간 기준 분할
+- Notion 게시 지연 문제
+1. 첫 번째 안건
+2. 두 번째 안건
+
+## 결정된 사항
+
+> 다음 스프린트부터 워커를 분리 배포한다.
+
+---
+
+## 액션 아이템
+
+- [ ] 김철수 : 워커 배포 스크립트 작성
+- [x] 이영희 : 캐시 설정 검토
+
+```python
+print("hello")
+```
+
+"""
+
+def build_markdown(target_bytes: int) -> str:
+    section_bytes = len(SECTION.encode("utf-8"))
+    return SECTION * max(1, target_bytes // section_bytes)
+
+def measure(markdown: str, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        markdown_to_blocks(markdown)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--max-mb", type=float, default=8.0, help="가장 큰 입력 크기 (MB)")
+    parser.add_argument("--repeat", type=int, default=3, help="크기별 반복 횟수 (최솟값 사용)")
+    args = parser.parse_args()
+
+    print(f"{'size (MB)':>10} {'blocks':>9} {'time (s)':>10} {'MB/s':>8}")
+    size_mb = 0.125
+    while size_mb <= args.max_mb:
+        markdown = build_markdown(int(size_mb * 1024 * 1024))
+        actual_mb = len(markdown.encode("utf-8")) / (1024 * 1024)
+        blocks = len(markdown_to_blocks(markdown))
+        elapsed = measure(markdown, args.repeat)
+        print(f"{actual_mb:>10.2f} {blocks:>9} {elapsed:>10.3f} {actual_mb / elapsed:>8.1f}")
+        size_mb *= 2
+
+if __name__ == "__main__":
+    main()
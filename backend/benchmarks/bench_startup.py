@@ -0,0 +1,126 @@
+"""
+프로세스 시작 시간 벤치마크
+
+새 파이썬 프로세스를 반복해서 띄워 다음 시간을 측정합니다 (매번 새 프로세스라 import 캐시가 없음):
+    - api import: import app.main
+    - api ready: startup 이벤트를 실행하고 GET /health 가 응답할 때까지 (import 포함)
+    - worker import: import app.worker
+    - sdk clients: 외부 SDK 클라이언트(OpenAI/Gemini/Notion)를 처음 만드는 비용. 첫 작업을 처리할 때 내는 비용입니다.
+
+    cd backend
+    python -m benchmarks.bench_startup --runs 10 --top 15
+
+API 파드 오토스케일링 시 새 파드가 트래픽을 받기까지의 시간은 api ready 에 uvicorn 기동 시간을 더한 값입니다.
+DB_AUTO_MIGRATE / RUN_EMBEDDED_WORKER 등은 현재 환경 변수를 그대로 따르므로 운영 설정과 맞춰 실행하세요.
+"""
+from typing import Dict, List
+import argparse
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+
+# 자식 프로세스에서 실행할 측정 코드. 결과를 JSON 한 줄로 출력
+_PROBE = """
+import asyncio, json, sys, time
+mode = sys.argv[1]
+result = {}
+started = time.perf_counter()
+if mode == "api":
+    import app.main
+    result["api import"] = time.perf_counter() - started
+
+    async def ready():
+        import httpx
+        app_ = app.main.app
+        async with app_.router.lifespan_context(app_):
+            async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app_), base_url="http://bench") as client:
+                (await client.get("/health")).raise_for_status()
+                result["api ready"] = time.perf_counter() - started
+
+    asyncio.run(ready())
+elif mode == "worker":
+    import app.worker
+    result["worker import"] = time.perf_counter() - started
+    from app.services.llm_service import llm_service
+    from app.services.notion_service import notion_service
+    from app.services.stt_service import stt_service
+    started = time.perf_counter()
+    for service in (stt_service.backend, llm_service, notion_service):
+        getattr(service, "client", None)
+    result["sdk clients"] = time.perf_counter() - started
+print("BENCH " + json.dumps(result))
+"""
+
+def run_probe(mode: str, env: Dict[str, str]) -> Dict[str, float]:
+    proc = subprocess.run(
+        [sys.executable, "-c", _PROBE, mode], env=env, capture_output=True, text=True, check=True,
+    )
+    for line in proc.stdout.splitlines():
+        if line.startswith("BENCH "):
+            return json.loads(line[len("BENCH "):])
+    raise RuntimeError(f"Probe produced no result:\n{proc.stdout}\n{proc.stderr}")
+
+def heaviest_imports(module: str, env: Dict[str, str], top: int) -> List[tuple]:
+    """python -X importtime 결과에서 누적 시간이 큰 최상위 import 를 찾습니다."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"], env=env, capture_output=True, text=True,
+    )
+    entries = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        # 중첩 깊이만큼 두 칸씩 들여쓰기됨. 깊이 1 = module 이 직접 import 한 모듈
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        if depth != 1:
+            continue
+        entries.append((name.strip(), int(cumulative) / 1e6))
+    entries.sort(key=lambda entry: entry[1], reverse=True)
+    return entries[:top]
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5, help="측정 반복 횟수")
+    parser.add_argument("--top", type=int, default=10, help="app.main 이 직접 import 하는 모듈 중 무거운 순으로 출력할 개수 (0 이면 생략)")
+    parser.add_argument("--json", help="결과를 저장할 JSON 파일 경로")
+    args = parser.parse_args()
+
+    work_dir = tempfile.mkdtemp(prefix="bench-startup-")
+    env = dict(os.environ)
+    env.setdefault("DATABASE_URL", f"sqlite+aiosqlite:///{os.path.join(work_dir, 'bench.db')}")
+    env.setdefault("RUN_EMBEDDED_WORKER", "false")
+    # 클라이언트 생성 비용만 재므로 실제 요청은 보내지 않음
+    for key in ("OPENAI_API_KEY", "GEMINI_API_KEY", "NOTION_API_KEY"):
+        env.setdefault(key, "fake")
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [os.getcwd(), env.get("PYTHONPATH")]))
+
+    try:
+        samples: Dict[str, List[float]] = {}
+        for _ in range(args.runs):
+            for mode in ("api", "worker"):
+                for name, seconds in run_probe(mode, env).items():
+                    samples.setdefault(name, []).append(seconds)
+
+        print(f"{'phase':<15} {'min (s)':>8} {'median':>8} {'max':>8}")
+        for name, values in samples.items():
+            print(f"{name:<15} {min(values):>8.3f} {statistics.median(values):>8.3f} {max(values):>8.3f}")
+
+        heaviest = []
+        if args.top:
+            heaviest = heaviest_imports("app.main", env, args.top)
+            print("\nheaviest imports under app.main")
+            for name, seconds in heaviest:
+                print(f"  {name:<40} {seconds:>7.3f}s")
+
+        if args.json:
+            with open(args.json, "w") as f:
+                json.dump({"samples": samples, "heaviest_imports": heaviest}, f, indent=2)
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+if __name__ == "__main__":
+    main()
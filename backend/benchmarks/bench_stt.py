@@ -0,0 +1,76 @@
+"""
+STT 백엔드 비교 벤치마크
+
+같은 오디오 파일을 백엔드별로 전사하고 소요 시간과 실시간 배율(RTF, 처리 시간 / 오디오 길이)을 비교합니다.
+RTF 가 1 보다 작으면 녹음 길이보다 빨리 전사한 것입니다. 결과 캐시는 거치지 않습니다.
+
+    cd backend
+    python -m benchmarks.bench_stt samples/meeting.m4a --backends openai,local --concurrency 2
+
+openai 백엔드는 OPENAI_API_KEY, local 백엔드는 faster-whisper 설치가 필요합니다.
+"""
+from app.services import audio_utils
+from app.services.stt_backends import create_stt_backend
+from app.services.stt_service import STTService
+from typing import List, Optional
+import argparse
+import asyncio
+import time
+
+async def probe(file_path: str) -> Optional[float]:
+    try:
+        return await audio_utils.probe_duration(file_path)
+    except (audio_utils.AudioProcessingError, ValueError, FileNotFoundError):
+        return None
+
+async def run_backend(name: str, files: List[str], durations: List[Optional[float]], repeat: int, concurrency: int) -> None:
+    backend = create_stt_backend(name)
+    try:
+        backend.check_available()
+    except ValueError as e:
+        print(f"{name:>8}  skipped: {e}")
+        return
+
+    service = STTService(backend)
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def transcribe(file_path: str) -> float:
+        async with semaphore:
+            started = time.perf_counter()
+            await service._transcribe(file_path)
+            return time.perf_counter() - started
+
+    try:
+        # 첫 호출은 모델 로드/커넥션 생성 비용이 섞이므로 따로 측정
+        warmup = await transcribe(files[0])
+        print(f"{name:>8}  warm-up {warmup:.2f}s")
+        for _ in range(repeat):
+            started = time.perf_counter()
+            elapsed = await asyncio.gather(*(transcribe(path) for path in files))
+            wall = time.perf_counter() - started
+            for path, duration, seconds in zip(files, durations, elapsed):
+                rtf = f"{seconds / duration:.3f}" if duration else "-"
+                print(f"{name:>8}  {path:<40} {seconds:>9.2f} {rtf:>7}")
+            total_audio = sum(d for d in durations if d)
+            if total_audio:
+                print(f"{name:>8}  {'(all files)':<40} {wall:>9.2f} {wall / total_audio:>7.3f}")
+    finally:
+        await backend.close()
+
+async def run(args) -> None:
+    durations = [await probe(path) for path in args.files]
+    print(f"{'backend':>8}  {'file':<40} {'time (s)':>9} {'RTF':>7}")
+    for name in args.backends.split(","):
+        await run_backend(name.strip(), args.files, durations, args.repeat, args.concurrency)
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("files", nargs="+", help="전사할 오디오 파일")
+    parser.add_argument("--backends", default="openai,local", help="비교할 백엔드 (쉼표로 구분)")
+    parser.add_argument("--repeat", type=int, default=1, help="반복 횟수")
+    parser.add_argument("--concurrency", type=int, default=1, help="동시에 전사할 파일 수")
+    args = parser.parse_args()
+    asyncio.run(run(args))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,215 @@
+"""
+벤치마크용 fake 외부 서비스 (OpenAI Whisper, Gemini, Notion)
+
+실제 API 대신 지정한 지연 시간 후 고정된 응답을 돌려줍니다.
+OPENAI_BASE_URL / GEMINI_BASE_URL / NOTION_BASE_URL 을 이 서버 주소로 지정해 사용합니다.
+
+    cd backend
+    python -m benchmarks.fake_services --port 9100 --stt-latency 2 --llm-latency 3 --notion-latency 0.3
+
+지연 시간은 평균값이며 --jitter 비율만큼 무작위로 흔들립니다.
+"""
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+from typing import Dict, List, Set
+import argparse
+import asyncio
+import json
+import random
+import uuid
+
+SUMMARY = """# 회의 요약
+
+스프린트 진행 상황과 배포 일정을 논의했습니다.
+
+## 주요 논의 사항
+
+- 백엔드 API 개발 현황
+- STT 응답 속도
+
+## 결정된 사항
+
+- 이번 주 금요일 개발 서버 배포
+
+## 액션 아이템
+
+- [ ] 김철수 : 통합 테스트 일정 공유
+"""
+
+TRANSCRIPT = "이번 스프린트 진행 상황 공유 부탁드립니다. 네, 현재 백엔드 API 개발은 거의 완료되었습니다. " * 20
+
+def create_app(stt_latency: float, llm_latency: float, notion_latency: float, jitter: float, stream_chunks: int) -> FastAPI:
+    app = FastAPI(title="Fake external services")
+
+    async def delay(seconds: float) -> None:
+        if seconds > 0:
+            await asyncio.sleep(seconds * random.uniform(1 - jitter, 1 + jitter))
+
+    @app.post("/v1/audio/transcriptions")
+    async def transcribe(request: Request):
+        form = await request.form()
+        await delay(stt_latency)
+        if form.get("response_format") == "verbose_json":
+            sentences = [s for s in TRANSCRIPT.split(". ") if s]
+            segments = [
+                {"id": i, "start": i * 3.0, "end": i * 3.0 + 3.0, "text": sentence}
+                for i, sentence in enumerate(sentences)
+            ]
+            return {"text": TRANSCRIPT, "segments": segments, "language": "korean", "duration": len(segments) * 3.0}
+        return {"text": TRANSCRIPT}
+
+    def gemini_response(text: str, total_text: str = None) -> dict:
+        # 실제 API 처럼 스트리밍 시 usageMetadata 는 지금까지의 누적 값
+        return {
+            "candidates": [{"content": {"role": "model", "parts": [{"text": text}]}, "finishReason": "STOP", "index": 0}],
+            "usageMetadata": {"promptTokenCount": 1000, "candidatesTokenCount": len(total_text or text) // 2},
+        }
+
+    @app.post("/{version}/models/{model_action:path}")
+    async def gemini(version: str, model_action: str, request: Request):
+        await request.body()
+        if model_action.endswith(":streamGenerateContent"):
+            async def events():
+                # 전체 지연 시간을 조각 수로 나눠 토큰이 생성되는 것처럼 흘려보냄
+                size = max(1, len(SUMMARY) // stream_chunks)
+                for i in range(0, len(SUMMARY), size):
+                    await delay(llm_latency / stream_chunks)
+                    yield f"data: {json.dumps(gemini_response(SUMMARY[i:i + size], SUMMARY[:i + size]))}\r\n\r\n"
+            return StreamingResponse(events(), media_type="text/event-stream")
+        await delay(llm_latency)
+        return gemini_response(SUMMARY)
+
+    # 페이지별 최상위 블록 ID 목록 (증분 게시에서 블록 목록 조회/삽입 위치 확인용)
+    pages: Dict[str, List[str]] = {}
+    block_pages: Dict[str, str] = {}
+    archived: Set[str] = set()
+
+    def add_blocks(page_id: str, children: list, after: str = None) -> List[str]:
+        ids = [str(uuid.uuid4()) for _ in children]
+        blocks = pages[page_id]
+        position = blocks.index(after) + 1 if after in blocks else len(blocks)
+        blocks[position:position] = ids
+        block_pages.update((block_id, page_id) for block_id in ids)
+        return ids
+
+    def not_found_error(object_id: str) -> JSONResponse:
+        return JSONResponse(
+            status_code=404,
+            content={"object": "error", "status": 404, "code": "object_not_found", "message": f"Could not find {object_id}"},
+        )
+
+    def archived_error() -> JSONResponse:
+        return JSONResponse(
+            status_code=400,
+            content={
+                "object": "error",
+                "status": 400,
+                "code": "validation_error",
+                "message": "Can't edit block that is archived. You must unarchive the block before editing.",
+            },
+        )
+
+    @app.post("/v1/pages")
+    async def create_page(request: Request):
+        body = await request.json()
+        await delay(notion_latency)
+        page_id = str(uuid.uuid4())
+        pages[page_id] = []
+        add_blocks(page_id, body.get("children", []))
+        return {"object": "page", "id": page_id, "url": f"https://www.notion.so/{page_id.replace('-', '')}"}
+
+    @app.get("/v1/pages/{page_id}")
+    async def retrieve_page(page_id: str):
+        await delay(notion_latency)
+        if page_id not in pages:
+            return not_found_error(page_id)
+        return {"object": "page", "id": page_id, "archived": page_id in archived, "in_trash": page_id in archived}
+
+    @app.patch("/v1/pages/{page_id}")
+    async def update_page(page_id: str, request: Request):
+        body = await request.json()
+        await delay(notion_latency)
+        if page_id not in pages:
+            return not_found_error(page_id)
+        # 휴지통으로 보내거나 되살리는 요청 (그 밖의 수정은 보관된 페이지에서 거부)
+        trash = body.get("in_trash", body.get("archived"))
+        if trash is not None:
+            (archived.add if trash else archived.discard)(page_id)
+        elif page_id in archived:
+            return archived_error()
+        return {"object": "page", "id": page_id, "archived": page_id in archived, "in_trash": page_id in archived}
+
+    @app.patch("/v1/blocks/{block_id}/children")
+    async def append_children(block_id: str, request: Request):
+        body = await request.json()
+        await delay(notion_latency)
+        if block_id in archived:
+            return archived_error()
+        if block_id not in pages and block_id not in block_pages:
+            return not_found_error(block_id)
+        if block_id not in pages:
+            # 페이지가 아닌 블록 아래에 추가하는 경우는 ID 만 돌려줌
+            return {"object": "list", "results": [{"object": "block", "id": str(uuid.uuid4())} for _ in body.get("children", [])]}
+        ids = add_blocks(block_id, body.get("children", []), body.get("after"))
+        return {"object": "list", "results": [{"object": "block", "id": child_id} for child_id in ids]}
+
+    @app.get("/v1/blocks/{block_id}/children")
+    async def list_children(block_id: str, start_cursor: int = 0, page_size: int = 100):
+        await delay(notion_latency)
+        if block_id not in pages:
+            return not_found_error(block_id)
+        ids = pages[block_id][start_cursor:start_cursor + page_size]
+        has_more = start_cursor + page_size < len(pages[block_id])
+        return {
+            "object": "list",
+            "results": [{"object": "block", "id": child_id} for child_id in ids],
+            "has_more": has_more,
+            "next_cursor": str(start_cursor + page_size) if has_more else None,
+        }
+
+    @app.patch("/v1/blocks/{block_id}")
+    async def update_block(block_id: str, request: Request):
+        await request.body()
+        await delay(notion_latency)
+        if block_id not in block_pages:
+            return not_found_error(block_id)
+        if block_pages[block_id] in archived:
+            return archived_error()
+        return {"object": "block", "id": block_id}
+
+    @app.delete("/v1/blocks/{block_id}")
+    async def delete_block(block_id: str):
+        await delay(notion_latency)
+        page_id = block_pages.get(block_id)
+        if page_id is None:
+            return not_found_error(block_id)
+        if page_id in archived:
+            return archived_error()
+        del block_pages[block_id]
+        pages[page_id].remove(block_id)
+        return {"object": "block", "id": block_id, "in_trash": True}
+
+    @app.exception_handler(404)
+    async def not_found(request: Request, exc):
+        return JSONResponse(status_code=404, content={"detail": f"Not faked: {request.method} {request.url.path}"})
+
+    return app
+
+def main() -> None:
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9100)
+    parser.add_argument("--stt-latency", type=float, default=2.0, help="Whisper 응답 지연 (초)")
+    parser.add_argument("--llm-latency", type=float, default=3.0, help="Gemini 응답 지연 (초)")
+    parser.add_argument("--notion-latency", type=float, default=0.3, help="Notion 요청당 지연 (초)")
+    parser.add_argument("--jitter", type=float, default=0.2, help="지연 시간 흔들림 비율 (0~1)")
+    parser.add_argument("--stream-chunks", type=int, default=20, help="스트리밍 요약을 나눠 보낼 조각 수")
+    args = parser.parse_args()
+
+    app = create_app(args.stt_latency, args.llm_latency, args.notion_latency, args.jitter, args.stream_chunks)
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""
+Alembic 실행 환경
+
+app.migrate 에서 호출하면 이미 열린 커넥션(config.attributes["connection"])을 그대로 사용하고,
+alembic 명령으로 직접 실행하면 DATABASE_URL 로 비동기 엔진을 만들어 사용합니다.
+"""
+from alembic import context
+from logging.config import fileConfig
+from sqlalchemy import pool
+from sqlalchemy.ext.asyncio import create_async_engine
+from app.core.config import settings
+from app.core.database import Base
+from app.models.meeting import Meeting  # autogenerate 비교용으로 Base 에 모델을 등록
+import asyncio
+
+config = context.config
+target_metadata = Base.metadata
+
+def _configure(connection=None) -> None:
+    options = dict(
+        target_metadata=target_metadata,
+        # SQLite 는 ALTER TABLE 지원이 제한적이라 테이블을 다시 만드는 batch 모드로 변경
+        render_as_batch=settings.DATABASE_URL.startswith("sqlite"),
+    )
+    if connection is None:
+        context.configure(url=settings.DATABASE_URL, literal_binds=True, **options)
+    else:
+        context.configure(connection=connection, **options)
+
+def _run(connection) -> None:
+    _configure(connection)
+    with context.begin_transaction():
+        context.run_migrations()
+
+async def _run_async() -> None:
+    engine = create_async_engine(settings.DATABASE_URL, poolclass=pool.NullPool)
+    try:
+        async with engine.connect() as connection:
+            await connection.run_sync(_run)
+            await connection.commit()
+    finally:
+        await engine.dispose()
+
+if context.is_offline_mode():
+    # alembic upgrade head --sql: DB 에 접속하지 않고 SQL 만 출력
+    _configure()
+    with context.begin_transaction():
+        context.run_migrations()
+elif config.attributes.get("connection") is not None:
+    _run(config.attributes["connection"])
+else:
+    if config.config_file_name is not None:
+        fileConfig(config.config_file_name)
+    asyncio.run(_run_async())
@@ -0,0 +1,70 @@
+"""
+revision 에서 쓰는 보조 함수
+
+Alembic 도입 전에는 create_all 로 테이블을 만들었기 때문에, 기존 DB 에는 이후 revision 의 컬럼이나 인덱스가
+일부 이미 있을 수 있습니다 (app.migrate 가 그런 DB 를 최초 revision 으로 표시한 뒤 upgrade 합니다).
+그래서 추가하는 쪽은 없는 것만 만들고, 지우는 쪽은 있는 것만 지웁니다.
+"""
+from alembic import context, op
+from sqlalchemy.dialects.postgresql import UUID
+import sqlalchemy as sa
+
+def _reflect_args(table: str) -> list:
+    """
+    SQLite 에서 batch 모드로 테이블을 다시 만들 때 반영(reflection)으로는 타입을 알 수 없는 컬럼.
+    그대로 두면 NUMERIC 으로 다시 만들어져 UUID 문자열이 숫자로 바뀔 수 있음
+    """
+    if table == "meetings":
+        return [sa.Column("id", UUID(as_uuid=True), primary_key=True)]
+    return []
+
+def _batch(table: str, recreate: str = "auto"):
+    return op.batch_alter_table(table, recreate=recreate, reflect_args=_reflect_args(table))
+
+def _dialect() -> str:
+    return op.get_context().dialect.name
+
+def is_postgres() -> bool:
+    return _dialect() == "postgresql"
+
+# --sql (오프라인) 모드에서는 DB 를 조회할 수 없으므로 아무것도 없다고 보고 전체 SQL 을 출력
+def has_table(table: str) -> bool:
+    return not context.is_offline_mode() and sa.inspect(op.get_bind()).has_table(table)
+
+def has_column(table: str, column: str) -> bool:
+    if context.is_offline_mode():
+        return False
+    return any(c["name"] == column for c in sa.inspect(op.get_bind()).get_columns(table))
+
+def has_index(table: str, index: str) -> bool:
+    if context.is_offline_mode():
+        return False
+    return any(i["name"] == index for i in sa.inspect(op.get_bind()).get_indexes(table))
+
+def add_columns(table: str, *columns: sa.Column) -> None:
+    missing = [c for c in columns if not has_column(table, c.name)]
+    if not missing:
+        return
+    # SQLite 는 now() 같은 기본값을 가진 컬럼을 ALTER TABLE 로 추가할 수 없어 테이블을 다시 만듦
+    recreate = "always" if _dialect() == "sqlite" and any(
+        c.server_default is not None for c in missing
+    ) else "auto"
+    with _batch(table, recreate) as batch:
+        for column in missing:
+            batch.add_column(column)
+
+def drop_columns(table: str, *names: str) -> None:
+    existing = [name for name in names if has_column(table, name)]
+    if not existing:
+        return
+    with _batch(table) as batch:
+        for name in existing:
+            batch.drop_column(name)
+
+def create_index(name: str, table: str, columns: list, **kw) -> None:
+    if not has_index(table, name):
+        op.create_index(name, table, columns, **kw)
+
+def drop_index(name: str, table: str) -> None:
+    if has_index(table, name):
+        op.drop_index(name, table_name=table)
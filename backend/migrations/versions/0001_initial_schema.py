@@ -0,0 +1,30 @@
+"""최초 스키마 (meetings)
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18 09:00:00
+"""
+from alembic import op
+from sqlalchemy.dialects.postgresql import UUID
+import sqlalchemy as sa
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+def upgrade() -> None:
+    op.create_table(
+        "meetings",
+        sa.Column("id", UUID(as_uuid=True), primary_key=True),
+        sa.Column("title", sa.String(), nullable=True),
+        sa.Column("file_path", sa.String(), nullable=False),
+        sa.Column("transcript", sa.Text(), nullable=True),
+        sa.Column("summary", sa.Text(), nullable=True),
+        sa.Column("status", sa.String(), nullable=True),
+        sa.Column("notion_page_url", sa.String(), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    )
+
+def downgrade() -> None:
+    op.drop_table("meetings")
@@ -0,0 +1,39 @@
+"""파이프라인 단계/게시 상태, 업로드 크기/해시, 지표 컬럼
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18 09:10:00
+"""
+from alembic import op
+from migrations.helpers import add_columns, create_index, drop_columns, drop_index
+import sqlalchemy as sa
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+def upgrade() -> None:
+    add_columns(
+        "meetings",
+        sa.Column("file_size", sa.BigInteger(), nullable=True),
+        sa.Column("file_sha256", sa.String(64), nullable=True),
+        sa.Column("stage", sa.String(), nullable=True),
+        sa.Column("publish_status", sa.String(), nullable=True),
+        sa.Column("metrics", sa.JSON(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    )
+    create_index("ix_meetings_file_sha256", "meetings", ["file_sha256"])
+
+    # 기존 회의: 완료된 회의는 다시 처리되지 않도록 DONE 으로, 나머지는 처음 단계부터 다시 실행
+    op.execute(
+        "UPDATE meetings SET stage = 'DONE', "
+        "publish_status = CASE WHEN notion_page_url IS NULL THEN 'SKIPPED' ELSE 'PUBLISHED' END "
+        "WHERE status = 'COMPLETED' AND stage IS NULL"
+    )
+    op.execute("UPDATE meetings SET stage = 'TRANSCRIBE' WHERE stage IS NULL")
+    op.execute("UPDATE meetings SET updated_at = created_at WHERE updated_at IS NULL")
+
+def downgrade() -> None:
+    drop_index("ix_meetings_file_sha256", "meetings")
+    drop_columns("meetings", "file_size", "file_sha256", "stage", "publish_status", "metrics", "updated_at")
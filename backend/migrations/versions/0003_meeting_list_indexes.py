@@ -0,0 +1,26 @@
+"""목록 조회(keyset pagination), 상태별 필터, stale 작업 탐색용 인덱스
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18 09:20:00
+"""
+from migrations.helpers import create_index, drop_index
+
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+INDEXES = (
+    ("ix_meetings_created_at_id", ["created_at", "id"]),
+    ("ix_meetings_status_created_at", ["status", "created_at"]),
+    ("ix_meetings_status_updated_at", ["status", "updated_at"]),
+)
+
+def upgrade() -> None:
+    for name, columns in INDEXES:
+        create_index(name, "meetings", columns)
+
+def downgrade() -> None:
+    for name, _ in INDEXES:
+        drop_index(name, "meetings")
@@ -0,0 +1,25 @@
+"""전문 검색 컬럼 (Postgres 는 tsvector + GIN 인덱스)
+
+기존 회의는 python -m app.migrate 가 upgrade 뒤에 색인합니다.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18 09:30:00
+"""
+from migrations.helpers import add_columns, create_index, drop_columns, drop_index, is_postgres
+from sqlalchemy.dialects.postgresql import TSVECTOR
+import sqlalchemy as sa
+
+revision = "0004"
+down_revision = "0003"
+branch_labels = None
+depends_on = None
+
+def upgrade() -> None:
+    add_columns("meetings", sa.Column("search_vector", sa.Text().with_variant(TSVECTOR(), "postgresql"), nullable=True))
+    if is_postgres():
+        create_index("ix_meetings_search_vector", "meetings", ["search_vector"], postgresql_using="gin")
+
+def downgrade() -> None:
+    drop_index("ix_meetings_search_vector", "meetings")
+    drop_columns("meetings", "search_vector")
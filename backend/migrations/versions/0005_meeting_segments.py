@@ -0,0 +1,31 @@
+"""회의록 세그먼트 테이블 (구간 조회용)
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18 09:40:00
+"""
+from alembic import op
+from migrations.helpers import create_index, has_table
+from sqlalchemy.dialects.postgresql import UUID
+import sqlalchemy as sa
+
+revision = "0005"
+down_revision = "0004"
+branch_labels = None
+depends_on = None
+
+def upgrade() -> None:
+    if not has_table("meeting_segments"):
+        op.create_table(
+            "meeting_segments",
+            sa.Column("meeting_id", UUID(as_uuid=True), sa.ForeignKey("meetings.id", ondelete="CASCADE"), primary_key=True),
+            sa.Column("seq", sa.Integer(), primary_key=True, autoincrement=False),
+            sa.Column("start_ms", sa.Integer(), nullable=False),
+            sa.Column("end_ms", sa.Integer(), nullable=False),
+            sa.Column("speaker", sa.String(), nullable=True),
+            sa.Column("text", sa.Text(), nullable=False),
+        )
+    create_index("ix_meeting_segments_meeting_id_start_ms", "meeting_segments", ["meeting_id", "start_ms"])
+
+def downgrade() -> None:
+    op.drop_table("meeting_segments")
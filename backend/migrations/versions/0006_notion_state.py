@@ -0,0 +1,21 @@
+"""Notion 게시 상태 (페이지 ID, 블록별 ID/해시)
+
+이 컬럼이 비어 있는(이전에 게시된) 회의는 다음 게시 때 새 페이지를 만듭니다.
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-18 09:50:00
+"""
+from migrations.helpers import add_columns, drop_columns
+import sqlalchemy as sa
+
+revision = "0006"
+down_revision = "0005"
+branch_labels = None
+depends_on = None
+
+def upgrade() -> None:
+    add_columns("meetings", sa.Column("notion_state", sa.JSON(), nullable=True))
+
+def downgrade() -> None:
+    drop_columns("meetings", "notion_state")
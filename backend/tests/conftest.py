@@ -0,0 +1,9 @@
+"""
+단위 테스트 공통 설정
+
+테스트 대상 모듈은 import 시점에 Settings() 를 읽으므로, 외부 서비스 없이 import 되도록 기본 환경 변수를 먼저 채웁니다.
+이미 지정된 값은 덮어쓰지 않습니다.
+"""
+import os
+
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite:///:memory:")
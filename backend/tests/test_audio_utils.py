@@ -0,0 +1,81 @@
+from app.services.audio_utils import TrimmedTimeline, plan_chunks
+import pytest
+
+def assert_covers(chunks, duration, chunk_seconds):
+    assert chunks[0][0] == 0.0
+    assert chunks[-1][1] == duration
+    for start, end in chunks:
+        assert 0 < end - start <= chunk_seconds
+    for (_, prev_end), (start, _) in zip(chunks, chunks[1:]):
+        # 다음 구간은 앞 구간이 끝나기 전에 시작해야 빈틈이 없음
+        assert start < prev_end
+
+def test_short_audio_is_a_single_chunk():
+    assert plan_chunks(300.0, [], 600, 2.0) == [(0.0, 300.0)]
+    assert plan_chunks(600.0, [], 600, 2.0) == [(0.0, 600.0)]
+
+def test_without_silence_cuts_at_the_target_with_overlap():
+    chunks = plan_chunks(1500.0, [], 600, 2.0)
+    assert chunks == [(0.0, 600.0), (598.0, 1198.0), (1196.0, 1500.0)]
+    assert_covers(chunks, 1500.0, 600)
+
+def test_cuts_in_the_middle_of_the_last_silence_before_the_target():
+    silences = [(460.0, 462.0), (500.0, 504.0), (550.0, 552.0)]
+    chunks = plan_chunks(1000.0, silences, 600, 2.0)
+    assert chunks[0] == (0.0, 551.0)
+    assert chunks[1][0] == 549.0
+    assert_covers(chunks, 1000.0, 600)
+
+def test_ignores_silence_before_the_last_quarter_of_the_chunk():
+    # 450초(600 의 75%) 보다 앞의 무음에서 자르면 구간이 너무 짧아짐
+    chunks = plan_chunks(1000.0, [(100.0, 110.0), (400.0, 420.0)], 600, 2.0)
+    assert chunks[0] == (0.0, 600.0)
+
+def test_silence_after_the_target_is_not_used():
+    chunks = plan_chunks(1000.0, [(601.0, 603.0)], 600, 2.0)
+    assert chunks[0] == (0.0, 600.0)
+
+def test_always_moves_forward_even_if_overlap_exceeds_the_chunk():
+    chunks = plan_chunks(20.0, [], 5, 10.0)
+    starts = [start for start, _ in chunks]
+    assert starts == sorted(set(starts))
+    assert chunks[-1][1] == 20.0
+
+@pytest.mark.parametrize("duration", [601.0, 1234.5, 3600.0, 7200.0])
+def test_long_recordings_are_fully_covered(duration):
+    silences = [(t, t + 1.5) for t in range(30, int(duration), 97)]
+    assert_covers(plan_chunks(duration, silences, 600, 2.0), duration, 600)
+
+def test_timeline_without_silence_is_identity():
+    timeline = TrimmedTimeline([], 2.0)
+    assert timeline.removed_seconds == 0.0
+    assert timeline.to_original(12.5) == 12.5
+
+def test_leading_silence_is_removed_entirely():
+    timeline = TrimmedTimeline([(0.0, 2.0)], 2.0)
+    assert timeline.removed_seconds == 2.0
+    assert timeline.to_original(0.0) == 2.0
+    assert timeline.to_original(5.0) == 7.0
+
+def test_long_silence_keeps_a_short_gap():
+    timeline = TrimmedTimeline([(10.0, 15.0)], 2.0)
+    assert timeline.removed_seconds == pytest.approx(4.7)
+    assert timeline.to_original(10.2) == pytest.approx(10.2)
+    assert timeline.to_original(11.0) == pytest.approx(15.7)
+
+def test_silence_shorter_than_the_threshold_is_kept():
+    timeline = TrimmedTimeline([(10.0, 11.5)], 2.0)
+    assert timeline.removed_seconds == 0.0
+    assert timeline.to_original(20.0) == 20.0
+
+def test_cuts_accumulate_in_trimmed_time():
+    # 줄인 오디오 기준 잘린 지점: 0 (2초), 8.3 (4.7초)
+    timeline = TrimmedTimeline([(0.0, 2.0), (5.0, 6.0), (10.0, 15.0)], 2.0)
+    assert timeline.removed_seconds == pytest.approx(6.7)
+    assert timeline.to_original(8.2) == pytest.approx(10.2)
+    assert timeline.to_original(8.3) == pytest.approx(15.0)
+    assert timeline.to_original(20.0) == pytest.approx(26.7)
+
+def test_keep_silence_longer_than_the_silence_removes_nothing():
+    timeline = TrimmedTimeline([(10.0, 10.5)], 0.1, keep_silence=1.0)
+    assert timeline.removed_seconds == 0.0
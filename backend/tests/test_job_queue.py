@@ -0,0 +1,59 @@
+from app.services.job_queue import Job, RedisJobQueue
+import asyncio
+import pytest
+
+fakeredis = pytest.importorskip("fakeredis", reason="Redis 큐 테스트에는 fakeredis[lua] 가 필요합니다")
+
+def run(coro):
+    return asyncio.run(coro)
+
+async def expire_leases(queue: RedisJobQueue) -> int:
+    # 시각을 흉내 내는 대신 모든 임대를 이미 지난 시각으로 당김
+    for raw in await queue.redis.zrange(queue.leases_key, 0, -1):
+        await queue.redis.zadd(queue.leases_key, {raw: 0})
+    return await queue.requeue_expired()
+
+def make_queue() -> RedisJobQueue:
+    return RedisJobQueue(fakeredis.FakeAsyncRedis(), visibility_timeout=60)
+
+def test_ack_removes_the_processing_entry():
+    async def scenario():
+        queue = make_queue()
+        await queue.enqueue(Job(kind="pipeline", meeting_id="m1"))
+        job = await queue.dequeue(timeout=0.1)
+        await queue.ack(job)
+        assert await queue.redis.llen(queue.processing_key) == 0
+        assert await queue.redis.zcard(queue.leases_key) == 0
+        assert await queue.redis.hlen(queue.owners_key) == 0
+    run(scenario())
+
+def test_expired_job_is_requeued():
+    async def scenario():
+        queue = make_queue()
+        await queue.enqueue(Job(kind="pipeline", meeting_id="m1"))
+        job = await queue.dequeue(timeout=0.1)
+        assert await expire_leases(queue) == 1
+        again = await queue.dequeue(timeout=0.1)
+        assert again.id == job.id
+    run(scenario())
+
+def test_late_ack_does_not_release_another_workers_lease():
+    async def scenario():
+        redis = fakeredis.FakeAsyncRedis()
+        slow, fast = RedisJobQueue(redis, visibility_timeout=60), RedisJobQueue(redis, visibility_timeout=60)
+        await slow.enqueue(Job(kind="pipeline", meeting_id="m1"))
+        job = await slow.dequeue(timeout=0.1)
+        assert await expire_leases(slow) == 1
+        retried = await fast.dequeue(timeout=0.1)
+        assert retried.id == job.id
+
+        # 늦게 끝난 원래 워커의 ack/touch 는 다시 꺼낸 워커의 임대에 영향을 주지 않음
+        await slow.touch(job)
+        await slow.ack(job)
+        assert await redis.llen(fast.processing_key) == 1
+        assert await redis.zcard(fast.leases_key) == 1
+
+        # 다시 꺼낸 워커가 죽어도 작업을 회수할 수 있음
+        assert await expire_leases(fast) == 1
+        assert (await slow.dequeue(timeout=0.1)).id == job.id
+    run(scenario())
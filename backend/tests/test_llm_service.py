@@ -0,0 +1,11 @@
+from app.services.llm_service import llm_service
+
+def summary_key(transcript: str, title: str) -> str:
+    return llm_service._cache_key(llm_service._notion_summary_prompt(transcript, title))
+
+def test_summary_cache_key_depends_on_the_meeting_title():
+    assert summary_key("회의록", "주간 회의") != summary_key("회의록", "월간 회의")
+
+def test_summary_cache_key_is_stable():
+    assert summary_key("회의록", "주간 회의") == summary_key("회의록", "주간 회의")
+    assert summary_key("회의록", "주간 회의") != summary_key("다른 회의록", "주간 회의")
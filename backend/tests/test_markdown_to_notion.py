@@ -0,0 +1,108 @@
+from app.services.markdown_to_notion import (
+    MAX_RICH_TEXT_ITEMS,
+    MAX_TEXT_LENGTH,
+    markdown_to_blocks,
+    notion_language,
+)
+import pytest
+
+def plain(block: dict) -> str:
+    return "".join(item["text"]["content"] for item in block[block["type"]]["rich_text"])
+
+def children(block: dict) -> list:
+    return block[block["type"]].get("children", [])
+
+def test_headings_paragraphs_quote_and_divider():
+    blocks = markdown_to_blocks("# 회의\n## 안건\n### 세부\n\n첫 줄\n이어지는 줄\n\n> 인용\n---\n")
+    assert [b["type"] for b in blocks] == [
+        "heading_1", "heading_2", "heading_3", "paragraph", "quote", "divider",
+    ]
+    assert plain(blocks[0]) == "회의"
+    assert plain(blocks[3]) == "첫 줄 이어지는 줄"
+    assert plain(blocks[4]) == "인용"
+
+def test_list_items_and_checkboxes():
+    blocks = markdown_to_blocks("- a\n* b\n+ c\n1. one\n2) two\n- [ ] todo\n- [x] done\n- [X] done too")
+    assert [b["type"] for b in blocks] == ["bulleted_list_item"] * 3 + ["numbered_list_item"] * 2 + ["to_do"] * 3
+    assert [plain(b) for b in blocks[5:]] == ["todo", "done", "done too"]
+    assert [b["to_do"]["checked"] for b in blocks[5:]] == [False, True, True]
+
+def test_inline_annotations_and_links():
+    [block] = markdown_to_blocks("**굵게** *기울임* ~~취소~~ `code` [링크](https://example.com)")
+    items = block["paragraph"]["rich_text"]
+    annotated = {item["text"]["content"]: item.get("annotations") for item in items}
+    assert annotated["굵게"] == {"bold": True}
+    assert annotated["기울임"] == {"italic": True}
+    assert annotated["취소"] == {"strikethrough": True}
+    assert annotated["code"] == {"code": True}
+    link = next(item for item in items if item["text"]["content"] == "링크")
+    assert link["text"]["link"] == {"url": "https://example.com"}
+
+def test_unclosed_markers_are_plain_text():
+    [block] = markdown_to_blocks("**열림 `코드 [링크](")
+    assert plain(block) == "**열림 `코드 [링크]("
+    assert all("annotations" not in item for item in block["paragraph"]["rich_text"])
+
+def test_long_text_is_split_without_truncation():
+    text = "가" * (MAX_TEXT_LENGTH * 2 + 10)
+    [block] = markdown_to_blocks(text)
+    items = block["paragraph"]["rich_text"]
+    assert [len(item["text"]["content"]) for item in items] == [MAX_TEXT_LENGTH, MAX_TEXT_LENGTH, 10]
+    assert plain(block) == text
+
+def test_too_many_rich_text_items_are_split_into_blocks():
+    # 굵게 항목 사이의 공백도 각각 하나의 항목이 되므로 모두 2 * 120 - 1 = 239개
+    text = " ".join(f"**{i}**" for i in range(120))
+    blocks = markdown_to_blocks(f"- {text}")
+    assert [b["type"] for b in blocks] == ["bulleted_list_item"] * 3
+    assert all(len(b["bulleted_list_item"]["rich_text"]) <= MAX_RICH_TEXT_ITEMS for b in blocks)
+    assert "".join(plain(b) for b in blocks) == text.replace("**", "")
+
+def test_empty_item_gets_an_empty_text():
+    [block] = markdown_to_blocks("- [ ]")
+    assert block["type"] == "to_do"
+    assert block["to_do"]["rich_text"] == [{"type": "text", "text": {"content": ""}}]
+
+def test_nested_lists_deeper_than_two_levels_become_siblings():
+    blocks = markdown_to_blocks("- a\n  - b\n    - c\n      - d\n  - e\n- f")
+    assert [plain(b) for b in blocks] == ["a", "f"]
+    [b, e] = children(blocks[0])
+    assert (plain(b), plain(e)) == ("b", "e")
+    assert [plain(x) for x in children(b)] == ["c", "d"]
+    assert all(not children(x) for x in children(b))
+
+def test_text_after_a_list_starts_a_new_paragraph():
+    blocks = markdown_to_blocks("- a\n본문")
+    assert [b["type"] for b in blocks] == ["bulleted_list_item", "paragraph"]
+
+def test_code_block_keeps_lines_and_maps_language():
+    blocks = markdown_to_blocks("```tsx title=\"a.tsx\"\n  const a = 1;\n\n# not a heading\n```\n")
+    [block] = blocks
+    assert block["type"] == "code"
+    assert block["code"]["language"] == "typescript"
+    assert plain(block) == "  const a = 1;\n\n# not a heading"
+
+def test_unclosed_code_block_is_closed_at_the_end():
+    [block] = markdown_to_blocks("```\nprint(1)")
+    assert block["code"]["language"] == "plain text"
+    assert plain(block) == "print(1)"
+
+@pytest.mark.parametrize("info, language", [
+    ("python", "python"),
+    ("Python", "python"),
+    ("py", "python"),
+    ("sh", "shell"),
+    ("yml", "yaml"),
+    ("c++", "c++"),
+    ("cs", "c#"),
+    ("ts {1,3}", "typescript"),
+    ("", "plain text"),
+    ("   ", "plain text"),
+    ("brainfuck", "plain text"),
+])
+def test_notion_language(info, language):
+    assert notion_language(info) == language
+
+def test_crlf_line_endings():
+    blocks = markdown_to_blocks("# 제목\r\n- 항목\r\n")
+    assert [plain(b) for b in blocks] == ["제목", "항목"]
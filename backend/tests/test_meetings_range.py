@@ -0,0 +1,57 @@
+from fastapi import HTTPException
+from app.api.meetings import _parse_range, _parse_timestamp
+import pytest
+
+@pytest.mark.parametrize("value, expected", [
+    ("bytes=0-99", (0, 100)),
+    ("bytes=100-199", (100, 200)),
+    ("bytes=0-0", (0, 1)),
+    ("bytes=900-", (900, 1000)),
+    ("bytes=-100", (900, 1000)),
+    ("bytes=-5000", (0, 1000)),
+    ("bytes=900-5000", (900, 1000)),
+    (" bytes = 10-19", (10, 20)),
+])
+def test_valid_ranges(value, expected):
+    assert _parse_range(value, 1000) == expected
+
+@pytest.mark.parametrize("value", [
+    "bytes=1000-",
+    "bytes=5000-6000",
+    "bytes=20-10",
+    "bytes=-0",
+    "bytes=0-9,20-29",
+    "items=0-9",
+    "bytes=abc-",
+    "bytes=10",
+    "bytes",
+    "",
+])
+def test_unsatisfiable_ranges(value):
+    with pytest.raises(HTTPException) as error:
+        _parse_range(value, 1000)
+    assert error.value.status_code == 416
+    assert error.value.headers == {"Content-Range": "bytes */1000"}
+
+def test_empty_file_has_no_satisfiable_range():
+    with pytest.raises(HTTPException) as error:
+        _parse_range("bytes=0-", 0)
+    assert error.value.headers == {"Content-Range": "bytes */0"}
+
+@pytest.mark.parametrize("value, expected", [
+    (None, None),
+    ("600", 600000),
+    ("600.5", 600500),
+    ("10:05", 605000),
+    ("1:00:00", 3600000),
+    (" 0 ", 0),
+])
+def test_valid_timestamps(value, expected):
+    assert _parse_timestamp(value, "start") == expected
+
+@pytest.mark.parametrize("value", ["", "abc", "1:xx", "-1", "nan", "inf", "-inf", "NaN", "1:inf", "1e400"])
+def test_invalid_timestamps(value):
+    with pytest.raises(HTTPException) as error:
+        _parse_timestamp(value, "end")
+    assert error.value.status_code == 400
+    assert error.value.detail.startswith("Invalid end")
@@ -0,0 +1,118 @@
+from app.services.notion_service import _patch_type, block_hash, plan_block_changes
+import random
+
+def block(block_type: str, text: str, with_children: bool = False) -> dict:
+    body = {"rich_text": [{"type": "text", "text": {"content": text}}]}
+    if with_children:
+        body["children"] = [block("paragraph", f"{text} child")]
+    return {"object": "block", "type": block_type, block_type: body}
+
+def published(blocks):
+    return [[f"old-{i}", block_hash(b), _patch_type(b)] for i, b in enumerate(blocks)]
+
+def ops(plan):
+    return [op[0] for op in plan]
+
+def apply_plan(old, new_blocks, plan):
+    """
+    작업 목록을 Notion 페이지처럼 적용합니다.
+    연속된 insert 는 바로 앞에 남긴 블록 뒤에 (없으면 페이지 끝에) 한 번에 추가됩니다.
+    """
+    page = [(state[0], state[1]) for state in old]
+    anchor, pending, created = None, [], 0
+
+    def flush():
+        nonlocal anchor, pending, created
+        if not pending:
+            return
+        position = [block_id for block_id, _ in page].index(anchor) + 1 if anchor else len(page)
+        added = [(f"new-{created + k}", block_hash(new_blocks[index])) for k, index in enumerate(pending)]
+        created += len(added)
+        page[position:position] = added
+        anchor, pending = added[-1][0], []
+
+    for op in plan:
+        if op[0] == "insert":
+            pending.append(op[1])
+            continue
+        if op[0] == "delete":
+            page = [entry for entry in page if entry[0] != op[1][0]]
+            continue
+        flush()
+        if op[0] == "update":
+            position = [block_id for block_id, _ in page].index(op[1][0])
+            page[position] = (op[1][0], block_hash(new_blocks[op[2]]))
+        anchor = op[1][0]
+    flush()
+    return [digest for _, digest in page]
+
+def test_unchanged_page_is_kept():
+    blocks = [block("heading_1", "제목"), block("paragraph", "본문"), block("to_do", "할 일")]
+    plan = plan_block_changes(published(blocks), blocks)
+    assert ops(plan) == ["keep", "keep", "keep"]
+
+def test_changed_text_is_a_single_update():
+    old_blocks = [block("heading_1", "제목"), block("paragraph", "본문"), block("to_do", "할 일")]
+    new_blocks = [old_blocks[0], block("paragraph", "고친 본문"), old_blocks[2]]
+    plan = plan_block_changes(published(old_blocks), new_blocks)
+    assert ops(plan) == ["keep", "update", "keep"]
+    assert plan[1][1][0] == "old-1" and plan[1][2] == 1
+
+def test_changed_type_is_replaced():
+    old_blocks = [block("heading_1", "제목"), block("paragraph", "본문")]
+    new_blocks = [old_blocks[0], block("quote", "본문")]
+    plan = plan_block_changes(published(old_blocks), new_blocks)
+    assert ops(plan) == ["keep", "delete", "insert"]
+
+def test_block_with_children_is_replaced_not_updated():
+    old_blocks = [block("heading_1", "제목"), block("bulleted_list_item", "a", with_children=True)]
+    new_blocks = [old_blocks[0], block("bulleted_list_item", "b", with_children=True)]
+    plan = plan_block_changes(published(old_blocks), new_blocks)
+    assert ops(plan) == ["keep", "delete", "insert"]
+
+def test_appended_blocks_are_inserted_after_the_last_block():
+    old_blocks = [block("heading_1", "제목")]
+    new_blocks = old_blocks + [block("paragraph", "a"), block("paragraph", "b")]
+    plan = plan_block_changes(published(old_blocks), new_blocks)
+    assert ops(plan) == ["keep", "insert", "insert"]
+
+def test_insert_at_the_front_rewrites_the_first_block():
+    old_blocks = [block("paragraph", "a"), block("paragraph", "b")]
+    new_blocks = [block("paragraph", "new"), *old_blocks]
+    old = published(old_blocks)
+    plan = plan_block_changes(old, new_blocks)
+    # 맨 앞에는 추가할 수 없으므로 첫 블록을 새 내용으로 고치고 원래 내용은 그 뒤에 다시 추가
+    assert plan[0] == ("update", old[0], 0)
+    assert plan[1] == ("insert", 1)
+    assert apply_plan(old, new_blocks, plan) == [block_hash(b) for b in new_blocks]
+
+def test_incompatible_front_insert_rewrites_the_page():
+    old_blocks = [block("paragraph", "a"), block("paragraph", "b")]
+    new_blocks = [block("heading_1", "새 제목"), *old_blocks]
+    old = published(old_blocks)
+    plan = plan_block_changes(old, new_blocks)
+    assert plan == [("delete", old[0]), ("delete", old[1]), ("insert", 0), ("insert", 1), ("insert", 2)]
+
+def test_empty_page():
+    new_blocks = [block("paragraph", "a")]
+    assert plan_block_changes([], new_blocks) == [("insert", 0)]
+    old = published(new_blocks)
+    assert plan_block_changes(old, []) == [("delete", old[0])]
+
+def test_random_edits_produce_the_new_page():
+    rng = random.Random(7)
+    types = ["paragraph", "heading_1", "to_do", "bulleted_list_item"]
+
+    def random_block():
+        return block(rng.choice(types), str(rng.randint(0, 6)), rng.random() < 0.2)
+
+    for _ in range(500):
+        old_blocks = [random_block() for _ in range(rng.randint(0, 8))]
+        new_blocks = [b for b in old_blocks if rng.random() < 0.8]
+        for _ in range(rng.randint(0, 3)):
+            new_blocks.insert(rng.randint(0, len(new_blocks)), random_block())
+        if new_blocks and rng.random() < 0.3:
+            new_blocks[rng.randrange(len(new_blocks))] = random_block()
+        old = published(old_blocks)
+        plan = plan_block_changes(old, new_blocks)
+        assert apply_plan(old, new_blocks, plan) == [block_hash(b) for b in new_blocks], plan
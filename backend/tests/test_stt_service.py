@@ -0,0 +1,72 @@
+from app.services.stt_backends import TranscriptSegment
+from app.services.stt_service import stitch_segments
+
+def seg(start: float, text: str, length: float = 2.0) -> TranscriptSegment:
+    return TranscriptSegment(start, start + length, text)
+
+def texts(segments):
+    return [segment.text for segment in segments]
+
+def test_single_chunk_keeps_every_segment():
+    segments = [seg(0.0, "a"), seg(3.0, "b"), seg(9.0, "c")]
+    assert stitch_segments([(0.0, 10.0, segments)]) == segments
+
+def test_overlap_is_split_at_its_midpoint():
+    # 두 구간이 [598, 602] 에서 겹치므로 경계는 600
+    first = [seg(0.0, "a"), seg(595.0, "b"), seg(599.0, "c"), seg(600.5, "d from first")]
+    second = [seg(598.5, "c from second"), seg(600.5, "d"), seg(700.0, "e")]
+    stitched = stitch_segments([(0.0, 602.0, first), (598.0, 1200.0, second)])
+    assert texts(stitched) == ["a", "b", "c", "d", "e"]
+
+def test_segment_starting_exactly_at_the_seam_belongs_to_the_next_chunk():
+    first = [seg(590.0, "a"), seg(600.0, "seam from first")]
+    second = [seg(600.0, "seam"), seg(610.0, "b")]
+    stitched = stitch_segments([(0.0, 602.0, first), (598.0, 1200.0, second)])
+    assert texts(stitched) == ["a", "seam", "b"]
+
+def test_same_sentence_on_both_sides_of_the_seam_is_kept_once():
+    first = [seg(590.0, "a"), seg(599.0, " 다음 안건입니다. ")]
+    second = [seg(600.2, "다음 안건입니다."), seg(610.0, "b")]
+    stitched = stitch_segments([(0.0, 602.0, first), (598.0, 1200.0, second)])
+    assert texts(stitched) == ["a", " 다음 안건입니다. ", "b"]
+
+def test_only_the_first_segment_after_a_seam_is_deduplicated():
+    # 경계에서 떨어진 곳의 같은 문장(예: "네.") 은 실제로 두 번 말한 것이므로 유지
+    first = [seg(598.0, "네.")]
+    second = [seg(601.0, "안건"), seg(603.0, "네."), seg(605.0, "네.")]
+    stitched = stitch_segments([(0.0, 602.0, first), (598.0, 1200.0, second)])
+    assert texts(stitched) == ["네.", "안건", "네.", "네."]
+
+def test_three_chunks_with_an_empty_middle_chunk():
+    chunks = [
+        (0.0, 602.0, [seg(10.0, "a")]),
+        (598.0, 1202.0, []),
+        (1198.0, 1500.0, [seg(1199.0, "before seam"), seg(1201.0, "c")]),
+    ]
+    assert texts(stitch_segments(chunks)) == ["a", "c"]
+
+def test_stitched_segments_stay_in_time_order():
+    chunks = [
+        (0.0, 602.0, [seg(float(t), f"a{t}") for t in range(0, 602, 7)]),
+        (598.0, 1202.0, [seg(float(t), f"b{t}") for t in range(598, 1202, 7)]),
+        (1198.0, 1800.0, [seg(float(t), f"c{t}") for t in range(1198, 1800, 7)]),
+    ]
+    starts = [segment.start for segment in stitch_segments(chunks)]
+    assert starts == sorted(starts)
+    assert starts[0] == 0.0 and starts[-1] >= 1790.0
+
+def test_chunk_with_a_single_segment_is_kept_even_if_it_starts_in_the_overlap():
+    # 세그먼트 정보 없이 구간 전체를 하나로 돌려준 경우 시작 시각은 구간 시작 (겹치는 영역 안)
+    chunks = [
+        (0.0, 602.0, [TranscriptSegment(0.0, 602.0, "first")]),
+        (598.0, 1202.0, [TranscriptSegment(598.0, 1202.0, "second")]),
+        (1198.0, 1500.0, [TranscriptSegment(1198.0, 1500.0, "third")]),
+    ]
+    assert texts(stitch_segments(chunks)) == ["first", "second", "third"]
+
+def test_single_segment_after_the_next_seam_is_still_dropped():
+    chunks = [
+        (0.0, 602.0, [seg(601.0, "belongs to next")]),
+        (598.0, 1200.0, [seg(601.0, "belongs to next"), seg(700.0, "b")]),
+    ]
+    assert texts(stitch_segments(chunks)) == ["belongs to next", "b"]
@@ -5,6 +5,7 @@ import { Header } from './components/Header'
 import { UploadZone } from './components/UploadZone'
 import { ProcessingStatus } from './components/ProcessingStatus'
 import { ResultCard } from './components/ResultCard'
+import { SummaryPreview } from './components/SummaryPreview'
 
 interface Meeting {
   id: string
@@ -13,7 +14,10 @@ interface Meeting {
   file_path: string
   transcript: string | null
   summary: string | null
+  has_transcript?: boolean
+  has_summary?: boolean
   notion_page_url: string | null
+  publish_status: string | null
   created_at: string
 }
 
@@ -64,22 +68,45 @@ function App() {
     }
   }
 
+  // 요약이 끝나 COMPLETED 가 된 뒤에도 Notion 게시가 끝날 때까지 계속 조회
+  const isPublishing = meeting?.status === 'COMPLETED' &&
+    (meeting?.publish_status === 'PENDING' || meeting?.publish_status === 'PUBLISHING')
+
+  const settled = meeting?.status === 'FAILED' || (meeting?.status === 'COMPLETED' && !isPublishing)
+
   useEffect(() => {
-    let interval: number
+    if (!currentMeetingId || settled) {
+      return
+    }
 
-    if (currentMeetingId && meeting?.status !== 'COMPLETED' && meeting?.status !== 'FAILED') {
-      interval = setInterval(async () => {
+    // 서버가 상태 변경을 푸시하므로 주기적으로 조회하지 않음. 큰 본문은 요약이 생긴 뒤에만 가져옴
+    const source = new EventSource(`/api/v1/meetings/${currentMeetingId}/events`)
+    const handleEvent = async (event: MessageEvent) => {
+      const change = JSON.parse(event.data)
+      // 요약 단계가 (재)시작되면 이전 시도에서 받은 부분 요약을 비움
+      if (event.type === 'update' && change.stage === 'SUMMARIZE') {
+        change.summary = null
+      }
+      setMeeting((prev) => (prev ? { ...prev, ...change } : prev))
+      if (change.has_summary || change.notion_page_url || change.status === 'FAILED') {
         try {
           const response = await axios.get(`/api/v1/meetings/${currentMeetingId}`)
           setMeeting(response.data)
         } catch (err) {
           console.error(err)
         }
-      }, 2000)
+      }
     }
+    source.addEventListener('status', handleEvent)
+    source.addEventListener('update', handleEvent)
+    source.addEventListener('summary', (event: MessageEvent) => {
+      const { delta } = JSON.parse(event.data)
+      setMeeting((prev) => (prev ? { ...prev, summary: (prev.summary ?? '') + delta } : prev))
+    })
+    source.onerror = (err) => console.error(err)
 
-    return () => clearInterval(interval)
-  }, [currentMeetingId, meeting?.status])
+    return () => source.close()
+  }, [currentMeetingId, settled])
 
   return (
     <div className="min-h-screen py-16 px-4 sm:px-6 lg:px-8 bg-gradient-to-b from-ios-background to-white">
@@ -108,11 +135,16 @@ function App() {
             <>
               <ProcessingStatus 
                 status={meeting.status}
-                transcript={meeting.transcript}
-                summary={meeting.summary}
+                hasTranscript={!!meeting.transcript || !!meeting.has_transcript}
+                hasSummary={meeting.status === 'COMPLETED' || !!meeting.has_summary}
                 notionUrl={meeting.notion_page_url}
+                publishStatus={meeting.publish_status}
               />
 
+              {meeting.status === 'PROCESSING' && meeting.summary && (
+                <SummaryPreview summary={meeting.summary} />
+              )}
+
               {meeting.status === 'COMPLETED' && meeting.notion_page_url && (
                 <div className="animate-slide-up">
                   <ResultCard 
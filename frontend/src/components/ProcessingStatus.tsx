@@ -2,30 +2,31 @@ import { CheckCircle2, Circle, Loader2, ArrowRight } from 'lucide-react'
 
 interface ProcessingStatusProps {
   status: string
-  transcript: string | null
-  summary: string | null
+  hasTranscript: boolean
+  hasSummary: boolean
   notionUrl: string | null
+  publishStatus: string | null
 }
 
-export function ProcessingStatus({ status, transcript, summary, notionUrl }: ProcessingStatusProps) {
+export function ProcessingStatus({ status, hasTranscript, hasSummary, notionUrl, publishStatus }: ProcessingStatusProps) {
   const steps = [
     {
       id: 'transcript',
       label: '음성 텍스트 변환',
-      completed: !!transcript,
-      current: status === 'PROCESSING' && !transcript,
+      completed: hasTranscript,
+      current: status === 'PROCESSING' && !hasTranscript,
     },
     {
       id: 'summary',
       label: 'AI 요약 생성',
-      completed: !!summary,
-      current: status === 'PROCESSING' && !!transcript && !summary,
+      completed: hasSummary,
+      current: status === 'PROCESSING' && hasTranscript && !hasSummary,
     },
     {
       id: 'notion',
       label: 'Notion 페이지 작성',
       completed: !!notionUrl,
-      current: status === 'PROCESSING' && !!summary && !notionUrl,
+      current: hasSummary && !notionUrl && (publishStatus === 'PENDING' || publishStatus === 'PUBLISHING'),
     }
   ]
 
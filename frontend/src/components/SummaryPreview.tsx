@@ -0,0 +1,21 @@
+import { Sparkles } from 'lucide-react'
+
+interface SummaryPreviewProps {
+  summary: string
+}
+
+// 요약이 스트리밍되는 동안 받은 내용을 그대로 보여줌
+export function SummaryPreview({ summary }: SummaryPreviewProps) {
+  return (
+    <div className="card-ios p-8 animate-fade-in">
+      <div className="flex items-center mb-4 text-ios-blue">
+        <Sparkles className="w-5 h-5 mr-2" />
+        <h3 className="text-lg font-semibold text-gray-900">요약 작성 중</h3>
+      </div>
+      <p className="text-sm text-gray-700 leading-relaxed whitespace-pre-wrap break-words">
+        {summary}
+        <span className="inline-block w-2 h-4 ml-0.5 align-middle bg-ios-blue/60 animate-pulse" />
+      </p>
+    </div>
+  )
+}